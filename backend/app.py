@@ -1,30 +1,44 @@
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+try:
+    from flask_sock import Sock
+except ImportError:  # WebSocket streaming is optional
+    Sock = None
 import base64
-import cv2
-import numpy as np
 import os
 import json
 import time
-from ml_utils import predict_sign, initialize_model, extract_hand_landmarks, clear_gesture_history, train_dynamic_gesture_model
+import atexit
+import threading
+import cv2
+import numpy as np
+import ml_utils
+import metrics
+from ml_utils import (initialize_model, parse_landmarks, LANDMARK_PAYLOAD_BYTES, DYNAMIC_MODEL_PATH,
+                      NUM_LANDMARKS, LANDMARK_DIMS)
+from sessions import SessionRegistry
+from frame_pool import FramePool, PoolBusyError, StaleFrameError
+from batch_inference import decode_frames, read_video_frames, transcribe_frames
+from frame_decode import decode_frame, DEFAULT_MAX_WIDTH
+from sign_index import SignIndex, DictionaryListing
+from sign_store import SignStore
+from training_recorder import TrainingRecorder, RecorderBusyError, iter_shard, list_shards
+from training_jobs import TrainingJobManager
+from model_registry import ModelRegistry, KINDS as MODEL_KINDS, warm_up as warm_up_model
+from profiler import SamplingProfiler, ProfilerBusyError
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})  # Enable CORS for all domains on all /api routes
 
-# Ensure directories exist
-os.makedirs('static/images/signs', exist_ok=True)
-os.makedirs('static/models', exist_ok=True)
-os.makedirs('static/gesture_sequences', exist_ok=True)
-os.makedirs('static/training_data', exist_ok=True)
+# Directories the app writes to
+DATA_DIRECTORIES = ['static/images/signs', 'static/models', 'static/gesture_sequences', 'static/training_data']
 
-# Initialize model
-print("Initializing sign language recognition model...")
-initialize_model()
-print("Model initialized successfully!")
+# Versioned models: hot reload of changed model files and A/B splits between versions
+MODEL_WATCH_INTERVAL = float(os.environ.get('ISL_MODEL_WATCH_INTERVAL', 5))
 
-# Load sign JSON data if it exists, or create a default dictionary
+# Legacy JSON dictionary, imported into the sign store on first start
 SIGNS_JSON_PATH = 'static/signs_data.json'
 
 # Default dictionary of available signs with their image paths
@@ -52,114 +66,449 @@ DEFAULT_SIGNS_DICT = {
     "friend": "/static/images/signs/friend.svg"
 }
 
-# Load signs from JSON or use default
+# Durable sign store; signs_data.json is only read once, to migrate existing installs
+SIGNS_DB_PATH = os.environ.get('ISL_SIGNS_DB', 'static/signs.db')
+SIGN_STORE_COMPACT_INTERVAL = float(os.environ.get('ISL_SIGN_STORE_COMPACT_INTERVAL', 3600))
+MAX_DICTIONARY_PAGE = int(os.environ.get('ISL_MAX_DICTIONARY_PAGE', 1000))
+
+# Per-client recognizer sessions (MediaPipe tracker + gesture history each)
+MAX_SESSIONS = int(os.environ.get('ISL_MAX_SESSIONS', 64))
+SESSION_IDLE_TTL = float(os.environ.get('ISL_SESSION_IDLE_TTL', 300))
+# Frame gating preset for live streams: off, accurate, balanced or fast (see frame_gate.py)
+FRAME_GATING = os.environ.get('ISL_FRAME_GATING', 'balanced')
+
+# Worker pool running MediaPipe; each session is pinned to one worker thread
+POOL_SIZE = int(os.environ.get('ISL_POOL_SIZE', os.cpu_count() or 1))
+POOL_QUEUE_SIZE = int(os.environ.get('ISL_POOL_QUEUE_SIZE', 4))
+MAX_FRAME_AGE = float(os.environ.get('ISL_MAX_FRAME_AGE', 1.0))  # Seconds before a queued frame is stale
+
+# Frames are decoded at reduced resolution down to this width (0 = full resolution)
+DECODE_MAX_WIDTH = int(os.environ.get('ISL_DECODE_MAX_WIDTH', DEFAULT_MAX_WIDTH))
+
+# Upper bound on frames accepted by one batch request
+MAX_BATCH_FRAMES = int(os.environ.get('ISL_MAX_BATCH_FRAMES', 3000))
+
+# Background writer for recorded training frames (one shard file per session)
+TRAINING_DATA_DIR = 'static/training_data'
+RECORD_QUEUE_SIZE = int(os.environ.get('ISL_RECORD_QUEUE_SIZE', 1024))
+RECORD_LANDMARKS = os.environ.get('ISL_RECORD_LANDMARKS', '0') == '1'
+
+# Dynamic-model training runs in a child process; the result is hot-swapped into ml_utils.dynamic_model
+TRAINING_CPUS = int(os.environ.get('ISL_TRAINING_CPUS', max(1, (os.cpu_count() or 1) // 2)))
+
+# Opt-in sampling profiler behind /api/profile, for capturing hot paths under live load
+ENABLE_PROFILER = os.environ.get('ISL_ENABLE_PROFILER', '0') == '1'
+profiler = SamplingProfiler()
+
+# Static model backends whose native runtimes start threads, which do not survive a fork;
+# they are loaded again in each worker instead of being shared from the preloading parent
+FORK_UNSAFE_BACKENDS = ('onnx', 'tflite')
+
+# Session used for the warm-up frames, removed again before serving
+WARM_UP_SESSION_ID = "__warm_up__"
+
+# Per-process services, created by init_worker() in the process that serves requests.
+# Threads, SQLite connections and MediaPipe graphs must not be created before a fork.
+model_registry = None
+sign_store = None
+SIGNS_DICT = {}
+SIGN_INDEX = None            # Phrase index over SIGNS_DICT used by /api/text-to-sign
+DICTIONARY_LISTING = None    # Sorted, cached listing served by /api/isl-dictionary
+sessions = None
+frame_pool = None
+training_recorder = None
+training_jobs = None
+
+_preloaded_pid = None
+_worker_pid = None
+_init_lock = threading.Lock()
+# sign_store.version() the in-memory dictionary was loaded at; guarded by _signs_lock
+_signs_version = None
+_signs_lock = threading.Lock()
+
+def preload_models():
+    """Create the data directories and load the model files (idempotent)
+    
+    Safe to run in a parent process before forking workers: only plain
+    Python and NumPy objects are created, so the workers share the loaded
+    models' pages copy-on-write instead of each unpickling their own.
+    """
+    global _preloaded_pid
+    if _preloaded_pid is not None:
+        return
+    for directory in DATA_DIRECTORIES:
+        os.makedirs(directory, exist_ok=True)
+    print("Initializing sign language recognition model...")
+    initialize_model()
+    print("Model initialized successfully!")
+    _preloaded_pid = os.getpid()
+
+# Load signs from the store or use default
 def load_signs_data():
-    if os.path.exists(SIGNS_JSON_PATH):
-        try:
-            with open(SIGNS_JSON_PATH, 'r') as file:
-                return json.load(file)
-        except Exception as e:
-            print(f"Error loading signs data: {e}")
-            return DEFAULT_SIGNS_DICT
-    else:
-        # Save default signs to JSON file
-        with open(SIGNS_JSON_PATH, 'w') as file:
-            json.dump(DEFAULT_SIGNS_DICT, file, indent=2)
-        return DEFAULT_SIGNS_DICT
-
-# Initialize signs dictionary
-SIGNS_DICT = load_signs_data()
-
-# Store the current sign sequence
-current_sequence = []
-
-# Store gesture history for dynamic gesture recognition
-gesture_history = []
-gesture_timestamps = []
-MAX_HISTORY_LENGTH = 30  # Maximum number of frames to keep in history
-SEQUENCE_TIMEOUT = 2.0   # Time in seconds before considering a new gesture sequence
+    try:
+        return sign_store.load()
+    except Exception as e:
+        print(f"Error loading signs data: {e}")
+        return dict(DEFAULT_SIGNS_DICT)
+
+def refresh_signs():
+    """Reload the dictionary if another worker has changed the sign store since this one read it
+
+    Each worker keeps its own SIGNS_DICT, SIGN_INDEX and DICTIONARY_LISTING;
+    checking the store's version is one SQLite pragma, so routes that read
+    the dictionary call this first and every worker serves the same signs
+    (and ETags) once a write has committed.
+    """
+    global SIGNS_DICT, SIGN_INDEX, DICTIONARY_LISTING, _signs_version
+    if sign_store.version() == _signs_version:
+        return
+    with _signs_lock:
+        version = sign_store.version()
+        if version == _signs_version:
+            return
+        signs = load_signs_data()
+        SIGN_INDEX = SignIndex(signs)
+        DICTIONARY_LISTING = DictionaryListing(signs)
+        SIGNS_DICT = signs
+        _signs_version = version
+
+def init_worker():
+    """Start this process's services; runs once per process, before its first request"""
+    global _worker_pid, model_registry, sign_store
+    global sessions, frame_pool, training_recorder, training_jobs
+    with _init_lock:
+        if _worker_pid == os.getpid():
+            return
+        preload_models()
+        if _preloaded_pid != os.getpid() and getattr(ml_utils.model, 'name', None) in FORK_UNSAFE_BACKENDS:
+            initialize_model()
+        
+        model_registry = ModelRegistry('static/models', watch_interval=MODEL_WATCH_INTERVAL)
+        model_registry.adopt_current()
+        ml_utils.model_registry = model_registry
+        if MODEL_WATCH_INTERVAL > 0:
+            model_registry.start_watching()
+        
+        sign_store = SignStore(SIGNS_DB_PATH, legacy_json_path=SIGNS_JSON_PATH, defaults=DEFAULT_SIGNS_DICT)
+        if SIGN_STORE_COMPACT_INTERVAL > 0:
+            sign_store.start_compaction(SIGN_STORE_COMPACT_INTERVAL)
+        refresh_signs()
+        
+        sessions = SessionRegistry(
+            max_sessions=MAX_SESSIONS,
+            idle_ttl=SESSION_IDLE_TTL,
+            session_factory=lambda session_id: ml_utils.RecognizerSession(session_id, gating=FRAME_GATING)
+        )
+        frame_pool = FramePool(size=POOL_SIZE, queue_size=POOL_QUEUE_SIZE, max_frame_age=MAX_FRAME_AGE,
+                               observe_wait=lambda seconds: metrics.observe("queue_wait", seconds))
+        
+        training_recorder = TrainingRecorder(TRAINING_DATA_DIR, extract_landmarks=RECORD_LANDMARKS,
+                                             queue_size=RECORD_QUEUE_SIZE)
+        atexit.register(training_recorder.close)
+        training_jobs = TrainingJobManager(
+            cpu_budget=TRAINING_CPUS,
+            on_model_ready=lambda path: model_registry.promote_file("dynamic", path, as_path=DYNAMIC_MODEL_PATH)
+        )
+        
+        # Gauges read whenever /api/metrics is scraped
+        metrics.REGISTRY.gauge("frame_queue_depth", "Frames waiting for a MediaPipe worker", frame_pool.queue_depth)
+        metrics.REGISTRY.gauge("active_sessions", "Live recognizer sessions", lambda: len(sessions))
+        metrics.REGISTRY.gauge("record_queue_depth", "Training frames waiting to be written",
+                               training_recorder.queue_depth)
+        metrics.REGISTRY.gauge("hand_detection_rate", "Share of processed frames with a hand", hand_detection_rate)
+        _worker_pid = os.getpid()
+
+def hand_detection_rate():
+    frames = metrics.REGISTRY.counter("frames_total")
+    return metrics.REGISTRY.counter("frames_hand_detected_total") / frames if frames else None
+
+def warm_up():
+    """Run the models and one frame of each kind through the pipeline before serving
+    
+    Pays the one-time costs (MediaPipe graph and model file loading, NumPy
+    and OpenCV first-call setup, thread start-up) here instead of in the
+    first client's request, then resets the metrics so they only describe
+    real traffic. Returns the seconds it took.
+    """
+    start = time.perf_counter()
+    init_worker()
+    for kind in MODEL_KINDS:
+        version = model_registry.select(kind, WARM_UP_SESSION_ID)
+        if version is not None:
+            warm_up_model(kind, version.model)
+    blank = cv2.imencode('.jpg', np.zeros((480, 640, 3), dtype=np.uint8))[1].tobytes()
+    process_image(WARM_UP_SESSION_ID, decode_image_bytes(blank))
+    process_landmarks(WARM_UP_SESSION_ID, np.full(NUM_LANDMARKS * LANDMARK_DIMS, 0.5))
+    sessions.remove(WARM_UP_SESSION_ID)
+    metrics.REGISTRY.reset()
+    return time.perf_counter() - start
+
+def create_app():
+    """Application factory for WSGI servers
+    
+    Loads the models in the calling process (under gunicorn with
+    preload_app, once in the master before forking) and returns the app.
+    Each serving process starts its own services on its first request, or
+    earlier when the server calls init_worker()/warm_up() (see
+    gunicorn.conf.py).
+    """
+    preload_models()
+    return app
+
+@app.before_request
+def ensure_worker_initialized():
+    if _worker_pid != os.getpid():
+        init_worker()
+
+def decode_base64_payload(base64_string):
+    """Decode a base64 string, stripping a data:image/...;base64, prefix if present"""
+    with metrics.timer("base64_decode"):
+        if base64_string.startswith('data:image'):
+            base64_string = base64_string.split(',')[1]
+        return base64.b64decode(base64_string)
+
+def decode_image_bytes(img_data):
+    """Decode encoded image bytes (JPEG/PNG) into a BGR frame, or None"""
+    with metrics.timer("image_decode"):
+        return decode_frame(img_data, DECODE_MAX_WIDTH)
+
+def parse_top_k(value):
+    """Candidate count requested by a client; raises ValueError unless it is a non-negative integer"""
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        top_k = -1
+    if top_k < 0:
+        raise ValueError("top_k must be a non-negative integer")
+    return top_k
+
+def parse_fps(value):
+    """Frame rate supplied with a batch; raises ValueError unless it is a positive finite number"""
+    try:
+        fps = float(value)
+    except (TypeError, ValueError):
+        fps = 0.0
+    if not np.isfinite(fps) or fps <= 0:
+        raise ValueError("fps must be a positive number")
+    return fps
+
+def process_image(session_id, image, top_k=0):
+    """Run one decoded frame through the session's pinned pool worker"""
+    session = sessions.get(session_id)
+    return frame_pool.run(session.session_id, session.process_frame, image, top_k)
+
+def process_landmarks(session_id, landmarks, top_k=0):
+    """Run client-supplied landmarks (or None for "no hand") through the session
+    
+    No decoding or MediaPipe is involved, so this runs inline rather than on
+    the frame pool.
+    """
+    session = sessions.get(session_id)
+    return session.process_landmarks(landmarks, hand_detected=landmarks is not None, top_k=top_k)
+
+def prediction_response(result, changes_only=False):
+    """JSON prediction, or an empty 204 when the client only wants decoded changes and there are none"""
+    if changes_only and not result["decoded"]["changed"]:
+        return app.response_class(status=204)
+    return jsonify(result)
 
 @app.route('/api/sign-to-text', methods=['POST'])
+@metrics.timed("request")
 def sign_to_text():
     try:
         data = request.json
+        changes_only = bool(data.get('changes_only'))
+        try:
+            top_k = parse_top_k(data.get('top_k', 0))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if 'landmarks' in data:
+            # Landmarks computed on the client: 63 floats, 21x3 lists or base64 float32
+            try:
+                landmarks = parse_landmarks(data['landmarks']) if data['landmarks'] else None
+            except ValueError as e:
+                return jsonify({"error": f"Invalid landmarks: {str(e)}"}), 400
+            return prediction_response(process_landmarks(data.get('session_id'), landmarks, top_k), changes_only)
+
         if 'base64_image' not in data:
             return jsonify({"error": "No image data provided"}), 400
 
         # Get image data from base64 string
-        base64_string = data['base64_image']
-        if base64_string.startswith('data:image'):
-            # Remove the data:image/jpeg;base64, prefix if present
-            base64_string = base64_string.split(',')[1]
-        
-        # Decode the base64 string
-        img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        img_data = decode_base64_payload(data['base64_image'])
+        image = decode_image_bytes(img_data)
 
         if image is None:
             return jsonify({"error": "Failed to decode image"}), 400
 
-        # Extract hand landmarks for tracking
-        landmarks, hand_detected = extract_hand_landmarks(image)
-        
-        # Get current timestamp
-        current_time = time.time()
-        
-        # Update gesture history with timestamps
-        if hand_detected:
-            gesture_history.append(landmarks)
-            gesture_timestamps.append(current_time)
-            
-            # Keep history within size limit
-            while len(gesture_history) > MAX_HISTORY_LENGTH:
-                gesture_history.pop(0)
-                gesture_timestamps.pop(0)
-        
-        # Predict the sign using the ML model
-        predicted_sign, confidence = predict_sign(image)
-        
-        # Add debug info about landmarks
-        hand_info = {}
-        if hand_detected:
-            # Get some basic hand information for debugging
-            points = landmarks.reshape(-1, 3)
-            hand_info = {
-                "num_landmarks": len(points),
-                "thumb_tip": points[4].tolist() if len(points) > 4 else None,
-                "index_tip": points[8].tolist() if len(points) > 8 else None,
-                "history_length": len(gesture_history)
-            }
-        
-        # Check for gesture sequence based on recent history
-        gesture_sequence = None
-        if len(gesture_timestamps) >= 2:
-            # If we have a sufficient history and the gesture spans across at least 0.5 seconds
-            if gesture_timestamps[-1] - gesture_timestamps[0] > 0.5:
-                # Here we would analyze the sequence for dynamic gestures
-                # For now, just indicate that we detected a sequence
-                gesture_sequence = {
-                    "duration": gesture_timestamps[-1] - gesture_timestamps[0],
-                    "frame_count": len(gesture_history)
-                }
-        
-        return jsonify({
-            "sign": predicted_sign,
-            "confidence": confidence,
-            "hand_detected": hand_detected,
-            "hand_info": hand_info,
-            "gesture_sequence": gesture_sequence
-        })
+        return prediction_response(process_image(data.get('session_id'), image, top_k), changes_only)
+    
+    except (PoolBusyError, StaleFrameError) as e:
+        # Backpressure: tell the client to slow down instead of queueing frames
+        metrics.increment("frames_dropped_total")
+        return jsonify({"error": str(e)}), 429
     
     except Exception as e:
         print(f"Error in sign-to-text: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+@app.route('/api/sign-to-text/frame', methods=['POST'])
+@metrics.timed("request")
+def sign_to_text_frame():
+    """Sign-to-text for a raw JPEG request body (no base64/JSON wrapping)
+    
+    The session id is passed as a `session_id` query parameter or an
+    X-Session-Id header, so keep-alive clients can post frames back to back.
+    With `changes_only=1`, frames that do not change the decoded signs get
+    an empty 204 response.
+    """
+    try:
+        try:
+            top_k = parse_top_k(request.args.get('top_k', 0))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        img_data = request.get_data(cache=False)
+        if not img_data:
+            return jsonify({"error": "No image data provided"}), 400
+
+        image = decode_image_bytes(img_data)
+        if image is None:
+            return jsonify({"error": "Failed to decode image"}), 400
+
+        session_id = request.args.get('session_id') or request.headers.get('X-Session-Id')
+        result = process_image(session_id, image, top_k)
+        return prediction_response(result, request.args.get('changes_only') == '1')
+    
+    except (PoolBusyError, StaleFrameError) as e:
+        metrics.increment("frames_dropped_total")
+        return jsonify({"error": str(e)}), 429
+    
+    except Exception as e:
+        print(f"Error in sign-to-text frame: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/sign-to-text/batch', methods=['POST'])
+def sign_to_text_batch():
+    """Transcribe an ordered recording of one session in a single request
+    
+    Accepts either JSON {"frames": [base64 images], "timestamps": [...], "fps": 30}
+    or a multipart upload with repeated `frames` image files or one `video` file.
+    Returns per-frame results plus the emitted sign segments.
+    """
+    try:
+        timestamps = None
+        if request.files:
+            try:
+                fps = parse_fps(request.form.get('fps', 30))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if 'video' in request.files:
+                images, timestamps = read_video_frames(request.files['video'].read(), MAX_BATCH_FRAMES, DECODE_MAX_WIDTH)
+            else:
+                uploads = request.files.getlist('frames')
+                if len(uploads) > MAX_BATCH_FRAMES:
+                    return jsonify({"error": f"At most {MAX_BATCH_FRAMES} frames per batch"}), 413
+                images = decode_frames([upload.read() for upload in uploads], DECODE_MAX_WIDTH)
+        else:
+            data = request.json
+            if not data or not data.get('frames'):
+                return jsonify({"error": "No frames provided"}), 400
+            if len(data['frames']) > MAX_BATCH_FRAMES:
+                return jsonify({"error": f"At most {MAX_BATCH_FRAMES} frames per batch"}), 413
+            try:
+                fps = parse_fps(data.get('fps', 30))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            timestamps = data.get('timestamps')
+            images = decode_frames([decode_base64_payload(frame) for frame in data['frames']], DECODE_MAX_WIDTH)
+
+        if not images:
+            return jsonify({"error": "No frames could be read"}), 400
+        if timestamps is None or len(timestamps) != len(images):
+            timestamps = [i / fps for i in range(len(images))]
+
+        return jsonify(transcribe_frames(images, timestamps))
+
+    except Exception as e:
+        print(f"Error in sign-to-text batch: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+def handle_stream_message(session_id, message, changes_only=False):
+    """Handle one WebSocket message and return the JSON-serializable reply
+    
+    Binary messages are raw encoded frames, or exactly LANDMARK_PAYLOAD_BYTES
+    of little-endian float32 landmarks (21x3) computed on the client; an empty
+    binary message means no hand was detected. Text messages are JSON control
+    messages such as {"type": "clear"}. With `changes_only`, predictions are
+    replaced by compact {"type": "update"} messages carrying the decoded
+    signs, and frames that change nothing get no reply (None).
+    """
+    if isinstance(message, str):
+        control = json.loads(message)
+        if control.get('type') == 'clear':
+            session = sessions.peek(session_id)
+            if session is not None:
+                with session.lock:
+                    session.clear_gesture_history()
+            return {"type": "cleared"}
+        if control.get('type') == 'ping':
+            return {"type": "pong", "timestamp": time.time()}
+        return {"type": "error", "error": f"Unknown message type: {control.get('type')}"}
+    
+    if len(message) in (0, LANDMARK_PAYLOAD_BYTES):
+        landmarks = parse_landmarks(message) if message else None
+        return stream_reply(process_landmarks(session_id, landmarks), changes_only)
+    
+    image = decode_image_bytes(message)
+    if image is None:
+        return {"type": "error", "error": "Failed to decode image"}
+    
+    try:
+        result = process_image(session_id, image)
+    except (PoolBusyError, StaleFrameError) as e:
+        # Let the client know the frame was dropped so it can pace itself
+        metrics.increment("frames_dropped_total")
+        return {"type": "dropped", "error": str(e)}
+    return stream_reply(result, changes_only)
+
+def stream_reply(result, changes_only):
+    if not changes_only:
+        result["type"] = "prediction"
+        return result
+    decoded = result["decoded"]
+    if not decoded["changed"]:
+        return None
+    return {"type": "update", "sign": decoded["sign"], "confidence": decoded["confidence"],
+            "events": decoded["events"], "sentence": decoded["sentence"]}
+
+if Sock is not None:
+    sock = Sock(app)
+
+    @sock.route('/api/ws/sign-to-text')
+    def sign_to_text_stream(ws):
+        """Persistent sign-to-text stream: frames in, predictions out (or only changes with ?changes_only=1)"""
+        session_id = request.args.get('session_id')
+        changes_only = request.args.get('changes_only') == '1'
+        while True:
+            message = ws.receive()
+            if message is None:
+                break
+            try:
+                reply = handle_stream_message(session_id, message, changes_only)
+            except Exception as e:
+                print(f"Error in sign-to-text stream: {str(e)}")
+                reply = {"type": "error", "error": f"An error occurred: {str(e)}"}
+            if reply is not None:
+                ws.send(json.dumps(reply))
+
 @app.route('/api/clear-sequence', methods=['POST'])
 def clear_sequence():
     """Clear the current gesture sequence and history"""
     try:
-        clear_gesture_history()
+        data = request.get_json(silent=True) or {}
+        session = sessions.peek(data.get('session_id'))
+        if session is not None:
+            with session.lock:
+                session.clear_gesture_history()
         return jsonify({"status": "success", "message": "Gesture history cleared"})
     
     except Exception as e:
@@ -168,31 +517,45 @@ def clear_sequence():
 
 @app.route('/api/train-dynamic-model', methods=['POST'])
 def train_model():
-    """Train a new dynamic gesture recognition model"""
+    """Start training a new dynamic gesture recognition model in the background"""
     try:
-        data = request.json
-        training_data_path = data.get('training_data_path', 'static/training_data')
+        data = request.json or {}
+        training_data_path = data.get('training_data_path') or TRAINING_DATA_DIR
         
-        success = train_dynamic_gesture_model(training_data_path)
+        job_id = training_jobs.submit(training_data_path, DYNAMIC_MODEL_PATH)
         
-        if success:
-            return jsonify({
-                "status": "success", 
-                "message": "Dynamic gesture model trained successfully"
-            })
-        else:
-            return jsonify({
-                "status": "error", 
-                "message": "Failed to train dynamic gesture model"
-            }), 500
+        return jsonify({
+            "status": "queued",
+            "job_id": job_id,
+            "message": "Dynamic gesture model training started",
+            "status_url": f"/api/train-dynamic-model/{job_id}"
+        }), 202
     
     except Exception as e:
         print(f"Error training model: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+@app.route('/api/train-dynamic-model', methods=['GET'])
+def list_training_jobs():
+    """Recent training jobs, oldest first"""
+    return jsonify({"jobs": training_jobs.list()})
+
+@app.route('/api/train-dynamic-model/<job_id>', methods=['GET'])
+def training_job_status(job_id):
+    """Progress and, once finished, metrics of one training job"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job)
+
 @app.route('/api/record-training-data', methods=['POST'])
 def record_training_data():
-    """Record training data for a specific gesture"""
+    """
+    Record training data for a specific gesture. The frame is queued and
+    appended to the session's shard by a background writer. Clients may
+    also send `landmarks` (same formats as /api/sign-to-text) and a
+    `timestamp` in seconds.
+    """
     try:
         data = request.json
         if not all(k in data for k in ['base64_image', 'gesture_name']):
@@ -201,48 +564,112 @@ def record_training_data():
         gesture_name = data['gesture_name']
         session_id = data.get('session_id', str(int(time.time())))
         
-        # Create directory for this gesture if it doesn't exist
-        gesture_dir = os.path.join('static/training_data', gesture_name)
-        os.makedirs(gesture_dir, exist_ok=True)
-        
-        # Save the image with a timestamp filename
-        base64_string = data['base64_image']
-        if base64_string.startswith('data:image'):
-            base64_string = base64_string.split(',')[1]
-            
-        img_data = base64.b64decode(base64_string)
-        filename = f"{session_id}_{int(time.time() * 1000)}.jpg"
-        file_path = os.path.join(gesture_dir, filename)
+        img_data = decode_base64_payload(data['base64_image'])
+        landmarks = None
+        if data.get('landmarks') is not None:
+            try:
+                landmarks = parse_landmarks(data['landmarks'])
+            except ValueError as e:
+                return jsonify({"error": f"Invalid landmarks: {str(e)}"}), 400
         
-        with open(file_path, 'wb') as f:
-            f.write(img_data)
+        try:
+            shard = training_recorder.record(gesture_name, session_id, img_data,
+                                             timestamp=data.get('timestamp'), landmarks=landmarks)
+        except RecorderBusyError as e:
+            return jsonify({"error": str(e)}), 429
             
         return jsonify({
             "status": "success",
-            "message": f"Saved training image for gesture '{gesture_name}'",
-            "file_path": file_path
+            "message": f"Queued training image for gesture '{gesture_name}'",
+            "file_path": shard
         })
         
     except Exception as e:
         print(f"Error recording training data: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+@app.route('/api/training-data', methods=['GET'])
+def list_training_data():
+    """List recorded sessions per gesture with their frame counts"""
+    try:
+        gestures = {}
+        for gesture, session, path in list_shards(TRAINING_DATA_DIR):
+            frames = sum(1 for _ in iter_shard(path, load_images=False))
+            gestures.setdefault(gesture, []).append({
+                "session_id": session,
+                "frames": frames,
+                "bytes": os.path.getsize(path)
+            })
+        return jsonify({"gestures": gestures, "queued": training_recorder.queue_depth()})
+    
+    except Exception as e:
+        print(f"Error listing training data: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/text-to-sign', methods=['POST'])
+def text_to_sign():
+    """Translate text into a sequence of sign images"""
+    try:
+        data = request.json
+        if not data or 'text' not in data:
+            return jsonify({"error": "No text provided"}), 400
+        
+        refresh_signs()
+        result = SIGN_INDEX.translate(str(data['text']))
+        return jsonify(result)
+    
+    except Exception as e:
+        print(f"Error in text-to-sign: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
 @app.route('/api/isl-dictionary', methods=['GET'])
 def get_dictionary():
+    """
+    List available signs. Optional query parameters:
+    - prefix: only signs whose name starts with this string
+    - offset / limit: pagination over the (sorted) matches
+    Responses carry an ETag; a matching If-None-Match gets a 304.
+    """
     try:
-        # Return all available signs with their image paths
-        signs = []
-        for sign, path in SIGNS_DICT.items():
-            signs.append({
-                "name": sign,
-                "image_path": path
-            })
-        return jsonify({"signs": signs})
+        prefix = request.args.get('prefix', '').lower().strip()
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', type=int)
+        if offset < 0 or (limit is not None and limit < 0):
+            return jsonify({"error": "offset and limit must be non-negative integers"}), 400
+        if limit is not None:
+            limit = min(limit, MAX_DICTIONARY_PAGE)
+        paginated = bool(prefix) or offset > 0 or limit is not None
+        
+        refresh_signs()
+        listing = DICTIONARY_LISTING
+        query = f"{prefix}|{offset}|{limit}" if paginated else ""
+        etag = listing.etag(query)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        elif paginated:
+            response = jsonify(listing.page(offset, limit, prefix))
+        else:
+            # Reuse the serialized listing until the dictionary changes
+            body, _ = listing.full()
+            response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     
     except Exception as e:
         print(f"Error in get-dictionary: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+def register_signs(signs):
+    """Persist (name, image_path) pairs and update the in-memory indexes"""
+    refresh_signs()
+    with _signs_lock:
+        sign_store.put_many(signs)
+        for name, image_path in signs:
+            SIGNS_DICT[name] = image_path
+            SIGN_INDEX.add(name, image_path)
+        DICTIONARY_LISTING.add_many(signs)
+
 @app.route('/api/add-sign', methods=['POST'])
 def add_sign():
     try:
@@ -253,12 +680,8 @@ def add_sign():
         name = data['name'].lower().strip()
         image_path = data['image_path']
         
-        # Add sign to dictionary
-        SIGNS_DICT[name] = image_path
-        
-        # Save updated dictionary to JSON file
-        with open(SIGNS_JSON_PATH, 'w') as file:
-            json.dump(SIGNS_DICT, file, indent=2)
+        # Add sign to the store and dictionary
+        register_signs([(name, image_path)])
         
         return jsonify({"status": "success", "message": f"Sign '{name}' added successfully"})
     
@@ -266,6 +689,129 @@ def add_sign():
         print(f"Error adding sign: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+@app.route('/api/add-signs', methods=['POST'])
+def add_signs():
+    """
+    Bulk import. Accepts {"signs": [{"name": ..., "image_path": ...}, ...]}
+    or {"signs": {name: image_path, ...}}; all signs are written in one transaction.
+    """
+    try:
+        data = request.json
+        if not data or 'signs' not in data:
+            return jsonify({"error": "No signs provided"}), 400
+        
+        entries = data['signs']
+        if isinstance(entries, dict):
+            entries = [{"name": name, "image_path": path} for name, path in entries.items()]
+        
+        signs = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get('name') or not entry.get('image_path'):
+                return jsonify({"error": "Every sign needs a name and an image path"}), 400
+            signs.append((entry['name'].lower().strip(), entry['image_path']))
+        
+        register_signs(signs)
+        
+        return jsonify({"status": "success", "added": len(signs), "total": len(SIGNS_DICT)})
+    
+    except Exception as e:
+        print(f"Error adding signs: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/model-info', methods=['GET'])
+def model_info():
+    """Describe the loaded classifiers and their inference latency"""
+    static_model = ml_utils.model
+    return jsonify({
+        "static_model": static_model.latency_stats() if static_model is not None else {"backend": "rules"},
+        "dynamic_model": type(ml_utils.dynamic_model).__name__ if ml_utils.dynamic_model is not None else None,
+        "versions": model_registry.describe()
+    })
+
+@app.route('/api/models/reload', methods=['POST'])
+def reload_models():
+    """Load changed model files now instead of waiting for the watcher"""
+    try:
+        changed = model_registry.reload()
+        return jsonify({"status": "success", "changed": changed, "versions": model_registry.describe()})
+    
+    except Exception as e:
+        print(f"Error reloading models: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/models/ab', methods=['POST'])
+def configure_ab_split():
+    """
+    Configure an A/B split for "static" or "dynamic" models:
+    - {"kind": ..., "model": <file in static/models>, "fraction": 0.1} starts a split
+    - {"kind": ..., "action": "promote"} makes the candidate the primary
+    - {"kind": ..., "action": "clear"} sends all traffic back to the primary
+    """
+    try:
+        data = request.json or {}
+        kind = data.get('kind')
+        if kind not in MODEL_KINDS:
+            return jsonify({"error": f"kind must be one of {', '.join(MODEL_KINDS)}"}), 400
+        
+        action = data.get('action', 'split')
+        if action == 'promote':
+            model_registry.promote_candidate(kind)
+        elif action == 'clear':
+            model_registry.clear_candidate(kind)
+        elif action == 'split':
+            if 'model' not in data:
+                return jsonify({"error": "No candidate model provided"}), 400
+            model_registry.set_candidate(kind, data['model'], float(data.get('fraction', 0.1)))
+        else:
+            return jsonify({"error": f"Unknown action '{action}'"}), 400
+        
+        return jsonify({"status": "success", "versions": model_registry.describe()})
+    
+    except (ValueError, OSError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error configuring A/B split: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Per-stage latency histograms (p50/p95/p99 over recent frames), counters
+    and gauges in the Prometheus text format; ?format=json returns a summary
+    in milliseconds instead.
+    """
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.REGISTRY.snapshot())
+    return app.response_class(metrics.REGISTRY.prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profile', methods=['POST'])
+def capture_profile():
+    """
+    Sample the server's Python stacks for `seconds` (default 10) and return
+    them in collapsed-stack format for flame graphs. Optional `interval`
+    (seconds between samples) and `thread` (thread name prefix, e.g.
+    "frame-worker"). Only available with ISL_ENABLE_PROFILER=1.
+    """
+    if not ENABLE_PROFILER:
+        return jsonify({"error": "Profiling is disabled (set ISL_ENABLE_PROFILER=1)"}), 404
+    try:
+        data = request.get_json(silent=True) or {}
+        seconds = float(data.get('seconds', request.args.get('seconds', 10)))
+        interval = float(data.get('interval', request.args.get('interval', 0.005)))
+        thread_prefix = data.get('thread', request.args.get('thread'))
+        stacks, samples = profiler.capture(seconds, interval, thread_prefix)
+        response = app.response_class(stacks, mimetype='text/plain')
+        response.headers['X-Profile-Samples'] = str(samples)
+        return response
+    
+    except ProfilerBusyError as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error capturing profile: {str(e)}")
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
@@ -278,4 +824,6 @@ def health_check():
     })
 
 if __name__ == '__main__':
+    # Development server; for production use gunicorn -c gunicorn.conf.py wsgi:application
+    create_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,121 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from frame_decode import decode_frame
+from ml_utils import (RecognizerSession, classify_static_batch, select_model, DECODER_CANDIDATES,
+                      NUM_LANDMARKS, LANDMARK_DIMS)
+
+# Shared pool for decoding uploaded frames; cv2.imdecode releases the GIL
+_decode_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="frame-decode")
+
+
+def decode_frames(encoded_frames, max_width=0):
+    """Decode a list of encoded images in parallel, preserving order"""
+    return list(_decode_executor.map(lambda data: decode_frame(data, max_width), encoded_frames))
+
+
+def read_video_frames(video_bytes, max_frames, max_width=0):
+    """Decode an uploaded video into (frames, timestamps in seconds)
+
+    Frames wider than `max_width` (if set) are downscaled as they are read.
+    """
+    # OpenCV can only open videos from a path
+    with tempfile.NamedTemporaryFile(suffix='.video', delete=False) as f:
+        f.write(video_bytes)
+        path = f.name
+    try:
+        capture = cv2.VideoCapture(path)
+        frames, timestamps = [], []
+        while len(frames) < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            timestamps.append(capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            if max_width and frame.shape[1] > max_width:
+                height = max(1, round(frame.shape[0] * max_width / frame.shape[1]))
+                frame = cv2.resize(frame, (max_width, height), interpolation=cv2.INTER_AREA)
+            frames.append(frame)
+        capture.release()
+        return frames, timestamps
+    finally:
+        os.remove(path)
+
+
+def decode_segments(events, timestamps, min_frames=3):
+    """Turn a recording's SignDecoder end events into sign segments with frame indices"""
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    segments = []
+    for event in events:
+        if event["type"] != "end":
+            continue
+        start_frame = int(np.searchsorted(timestamps, event["start_time"]))
+        end_frame = int(np.searchsorted(timestamps, event["end_time"], side='right')) - 1
+        count = end_frame - start_frame + 1
+        if count < min_frames:
+            continue
+        segments.append({
+            "sign": event["sign"],
+            "start_time": float(event["start_time"]),
+            "end_time": float(event["end_time"]),
+            "start_frame": start_frame,
+            "end_frame": end_frame,
+            "frame_count": count,
+            "confidence": event["confidence"]
+        })
+    return segments
+
+
+def transcribe_frames(images, timestamps, session_id="batch", min_segment_frames=3):
+    """Recognize an ordered recording of one session
+
+    Landmarks are extracted in order with a dedicated tracker so temporal
+    tracking behaves as it would live, and static classification runs once
+    on the stacked landmark matrix of every frame with a hand. Each frame
+    then goes through the session's live pipeline on the recording's clock
+    (dynamic model, top candidates, SignDecoder), so a recording is
+    segmented as it would be when streamed at the same timestamps.
+    """
+    session = RecognizerSession(session_id)
+    try:
+        landmarks = np.zeros((len(images), NUM_LANDMARKS * LANDMARK_DIMS))
+        detected = np.zeros(len(images), dtype=bool)
+        for i, image in enumerate(images):
+            if image is None:
+                continue
+            landmarks[i], detected[i] = session.extract_hand_landmarks(image)
+    finally:
+        session.close()
+
+    static_candidates = [None] * len(images)
+    if detected.any():
+        static_model, _ = select_model("static", session_id)
+        rows = classify_static_batch(landmarks[detected], DECODER_CANDIDATES, static_model)
+        for i, candidates in zip(np.flatnonzero(detected), rows):
+            static_candidates[i] = candidates
+
+    frames, events = [], []
+    for i in range(len(images)):
+        candidates, decoded = session.decode_recorded_frame(landmarks[i], bool(detected[i]), float(timestamps[i]),
+                                                            static_candidates[i])
+        events.extend(decoded["events"])
+        frames.append({
+            "index": i,
+            "timestamp": float(timestamps[i]),
+            "sign": candidates[0]["sign"] if images[i] is not None else None,
+            "confidence": float(candidates[0]["confidence"]),
+            "hand_detected": bool(detected[i]),
+            "error": "Failed to decode image" if images[i] is None else None
+        })
+    if len(images):
+        events.extend(session.decoder.flush(float(timestamps[-1])))
+
+    return {
+        "frames": frames,
+        "segments": decode_segments(events, timestamps, min_frames=min_segment_frames),
+        "frame_count": len(images),
+        "hand_frames": int(detected.sum())
+    }
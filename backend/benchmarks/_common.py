@@ -0,0 +1,67 @@
+"""Shared helpers for the backend benchmark scripts
+
+Benchmarks are run from the backend directory, e.g.
+    python benchmarks/bench_single_pass.py --frames path/to/jpegs
+"""
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def synthetic_frames(count=30, width=640, height=480, seed=0):
+    """Generate JPEG-encoded synthetic frames (no camera required)"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        image = np.full((height, width, 3), 40, dtype=np.uint8)
+        # Draw a moving blob so consecutive frames differ like a real stream
+        cx = int(width * (0.3 + 0.4 * i / max(count - 1, 1)))
+        cy = height // 2
+        cv2.circle(image, (cx, cy), height // 6, (180, 150, 120), -1)
+        noise = rng.integers(0, 12, size=image.shape, dtype=np.uint8)
+        image = cv2.add(image, noise)
+        ok, buf = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if ok:
+            frames.append(buf.tobytes())
+    return frames
+
+
+def load_frames(frames_dir=None, count=30, width=640, height=480):
+    """Load JPEG bytes from a directory, or fall back to synthetic frames"""
+    if frames_dir:
+        paths = sorted(glob.glob(os.path.join(frames_dir, '*.jpg')) +
+                       glob.glob(os.path.join(frames_dir, '*.jpeg')))
+        if not paths:
+            raise SystemExit(f"No JPEG files found in {frames_dir}")
+        frames = []
+        for path in paths[:count]:
+            with open(path, 'rb') as f:
+                frames.append(f.read())
+        return frames
+    return synthetic_frames(count, width, height)
+
+
+def decode(jpeg_bytes):
+    """Decode JPEG bytes the same way the API does"""
+    return cv2.imdecode(np.frombuffer(jpeg_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+
+def measure_fps(fn, items, repeat=3):
+    """Run fn over items `repeat` times and return the best frames per second"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            best = max(best, len(items) / elapsed)
+    return best
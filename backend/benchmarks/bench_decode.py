@@ -0,0 +1,89 @@
+"""Decode + RGB conversion cost per frame, full resolution vs the fast path
+
+For 480p, 720p and 1080p JPEGs, compares cv2.imdecode at full size plus a
+freshly allocated cvtColor (the original pipeline) with frame_decode's
+reduced-resolution decode, resize and reusable RGB buffer. With --frames,
+real frames are also run through MediaPipe both ways to report how far
+the normalized landmarks move.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from _common import load_frames
+
+import ml_utils
+from frame_decode import DEFAULT_MAX_WIDTH, decode_frame, to_rgb
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def textured_jpeg(width, height, seed=0):
+    """A JPEG with camera-like detail (smooth gradients plus noise)"""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8)
+    image = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    image = cv2.add(image, rng.integers(0, 16, image.shape, dtype=np.uint8))
+    return cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes()
+
+
+def full_path(data):
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def fast_path(data, max_width):
+    return to_rgb(decode_frame(data, max_width))
+
+
+def time_per_frame(fn, data, repeat):
+    fn(data)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def landmark_drift(frames, max_width):
+    """Mean absolute landmark difference between full-size and fast-path frames"""
+    full_tracker = ml_utils.mp_hands.Hands(static_image_mode=True, max_num_hands=1)
+    fast_tracker = ml_utils.mp_hands.Hands(static_image_mode=True, max_num_hands=1)
+    differences, agree = [], 0
+    for data in frames:
+        a, found_a = ml_utils.extract_hand_landmarks(cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR),
+                                                     full_tracker)
+        b, found_b = ml_utils.extract_hand_landmarks(decode_frame(data, max_width), fast_tracker)
+        agree += found_a == found_b
+        if found_a and found_b:
+            differences.append(np.abs(a - b).mean())
+    full_tracker.close()
+    fast_tracker.close()
+    return (float(np.mean(differences)) if differences else None), agree / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-width', type=int, default=DEFAULT_MAX_WIDTH, help='Fast path target width')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--frames', help='Directory of real JPEG frames for the landmark comparison')
+    parser.add_argument('--count', type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'input':<7} {'full ms':>8} {'fast ms':>8} {'speedup':>8}  fast output")
+    for name, (width, height) in RESOLUTIONS.items():
+        data = textured_jpeg(width, height)
+        full = time_per_frame(full_path, data, args.repeat)
+        fast = time_per_frame(lambda d: fast_path(d, args.max_width), data, args.repeat)
+        shape = decode_frame(data, args.max_width).shape
+        print(f"{name:<7} {full:>8.2f} {fast:>8.2f} {full / fast:>7.1f}x  {shape[1]}x{shape[0]}")
+
+    if args.frames:
+        drift, agreement = landmark_drift(load_frames(args.frames, args.count), args.max_width)
+        print(f"Hand detection agreement: {agreement:.0%}")
+        print(f"Mean landmark drift:      {drift if drift is not None else 'n/a'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Dynamic gesture matcher latency and accuracy as the vocabulary grows
+
+Builds a DTWGestureMatcher from synthetic gestures (a hand shape moving
+along a random trajectory, performed at varying speeds and frame counts)
+and reports milliseconds per prediction and top-1 accuracy for each
+vocabulary size. Out-of-vocabulary queries (random landmarks, the worst
+case for LB_Keogh pruning) are timed separately, together with the share
+that would still pass the dynamic confidence gate.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _common  # noqa: F401  (puts the backend on sys.path)
+from dynamic_gestures import DTWGestureMatcher
+from ml_utils import DYNAMIC_MIN_CONFIDENCE
+
+
+def synthetic_gesture(label, rng, noise=0.01):
+    """One noisy performance of gesture `label` as (frames, timestamps)"""
+    shape_rng = np.random.default_rng(label)
+    hand = shape_rng.random((21, 3)) * 0.15
+    waypoints = shape_rng.random((6, 3)) * 0.5 + 0.25
+    count = int(rng.integers(15, 31))
+    timestamps = np.sort(rng.random(count)) * rng.uniform(0.8, 1.6)
+    # Non-uniform speed: warp the phase along the trajectory
+    phase = np.linspace(0, 1, count) ** rng.uniform(0.7, 1.4) * (len(waypoints) - 1)
+    wrist = np.stack([np.interp(phase, np.arange(len(waypoints)), waypoints[:, k]) for k in range(3)], axis=1)
+    frames = hand[None] + wrist[:, None] + rng.normal(0, noise, (count, 21, 3))
+    return frames.reshape(count, -1), timestamps
+
+
+def random_sequence(rng):
+    """Landmarks with no gesture in them, as (frames, timestamps)"""
+    count = int(rng.integers(15, 31))
+    return rng.random((count, 63)), np.sort(rng.random(count)) * rng.uniform(0.8, 1.6)
+
+
+def time_queries(matcher, queries):
+    """Per-query latency in ms and the (label, confidence) predictions"""
+    latencies, predictions = [], []
+    for frames, timestamps in queries:
+        start = time.perf_counter()
+        predictions.append(matcher.predict_sequence(frames, timestamps))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, predictions
+
+
+def run(vocabulary, samples_per_label, queries, rng):
+    sequences, labels = [], []
+    for label in range(vocabulary):
+        for _ in range(samples_per_label):
+            sequences.append(synthetic_gesture(label, rng))
+            labels.append(f"gesture_{label}")
+    matcher = DTWGestureMatcher.from_sequences(sequences, labels)
+
+    targets = rng.integers(0, vocabulary, queries)
+    tests = [(synthetic_gesture(label, rng), f"gesture_{label}") for label in targets]
+    matcher.predict_sequence(*tests[0][0])  # warm-up
+
+    latencies, predictions = time_queries(matcher, [query for query, _ in tests])
+    correct = sum(predicted == expected for (predicted, _), (_, expected) in zip(predictions, tests))
+    noise_latencies, noise_predictions = time_queries(matcher, [random_sequence(rng) for _ in range(queries)])
+    accepted = sum(label != "unknown" and confidence >= DYNAMIC_MIN_CONFIDENCE
+                   for label, confidence in noise_predictions)
+    return {
+        "templates": len(matcher.templates),
+        "p50": np.median(latencies),
+        "p95": np.percentile(latencies, 95),
+        "accuracy": correct / len(tests),
+        "noise_p50": np.median(noise_latencies),
+        "noise_p95": np.percentile(noise_latencies, 95),
+        "noise_accepted": accepted / queries
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10,50,100,200,500', help='Comma-separated vocabulary sizes')
+    parser.add_argument('--samples', type=int, default=4, help='Training samples per label')
+    parser.add_argument('--queries', type=int, default=50, help='Test queries per size')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'labels':>7} {'templates':>10} {'p50 ms':>8} {'p95 ms':>8} {'accuracy':>9} "
+          f"{'noise p50':>10} {'noise p95':>10} {'accepted':>9}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        r = run(size, args.samples, args.queries, rng)
+        print(f"{size:>7} {r['templates']:>10} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['accuracy']:>9.0%} "
+              f"{r['noise_p50']:>10.2f} {r['noise_p95']:>10.2f} {r['noise_accepted']:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
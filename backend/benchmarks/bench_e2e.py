@@ -0,0 +1,366 @@
+"""End-to-end benchmark of the sign-to-text pipeline, with JSON results
+
+Drives the real app.py request handlers offline, through the Flask test
+client or (with --server) a local HTTP server, using synthetic or recorded
+JPEG frames and a landmark fixture, so no camera or network is needed.
+Measures:
+  latency     single-client round trips: base64 JSON, raw JPEG and client landmarks
+  stages      per-stage cost (from /api/metrics) during each latency run
+  throughput  concurrent clients, each streaming its own session
+  memory      resident memory added per recognizer session
+  startup     model preload and per-worker warm-up time
+
+Results are written as JSON; compare two runs (e.g. two commits) with
+    python benchmarks/bench_e2e.py --output before.json
+    python benchmarks/bench_e2e.py --output after.json
+    python benchmarks/bench_e2e.py --compare before.json after.json
+A landmark fixture can be extracted once from a recording with
+    python benchmarks/bench_e2e.py --frames path/to/jpegs --make-fixture hand.npy
+"""
+import argparse
+import base64
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from _common import BACKEND_DIR, decode, load_frames
+
+import metrics
+import ml_utils
+
+# Relative change beyond which --compare flags a metric as a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def synthetic_landmarks(count, seed=0):
+    """(count, 63) float32 landmarks of one hand shape drifting across the frame"""
+    rng = np.random.default_rng(seed)
+    hand = rng.random((21, 3)) * 0.15
+    phase = np.linspace(0, 1, count)
+    wrist = np.stack([0.3 + 0.4 * phase, 0.5 + 0.1 * np.sin(phase * 2 * np.pi), np.zeros(count)], axis=1)
+    frames = hand[None] + wrist[:, None] + rng.normal(0, 0.005, (count, 21, 3))
+    return frames.reshape(count, -1).astype(np.float32)
+
+
+def make_fixture(frames, path):
+    """Extract landmarks from recorded frames once and save them as .npy"""
+    session = ml_utils.RecognizerSession('fixture')
+    try:
+        detected = []
+        for frame in frames:
+            landmarks, hand = session.extract_hand_landmarks(decode(frame))
+            if hand:
+                detected.append(landmarks)
+    finally:
+        session.close()
+    if not detected:
+        raise SystemExit("No hand found in any frame; nothing to save")
+    np.save(path, np.array(detected, dtype=np.float32))
+    print(f"Saved {len(detected)} of {len(frames)} frames' landmarks to {path}")
+
+
+def resident_memory():
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def percentiles(latencies):
+    latencies = np.asarray(latencies) * 1000
+    if not len(latencies):
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_ms": float(latencies.mean())
+    }
+
+
+class TestClientTransport:
+    """Requests through Flask's test client: the full handler, no sockets"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self._local = threading.local()
+
+    def post(self, path, body, content_type):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.flask_app.test_client()
+        response = client.post(path, data=body, content_type=content_type)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class ServerTransport:
+    """Requests over HTTP to the app served by a local threaded werkzeug server"""
+
+    def __init__(self, flask_app, port):
+        from werkzeug.serving import make_server
+        self.server = make_server('127.0.0.1', port, flask_app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{port}"
+
+    def post(self, path, body, content_type):
+        req = urllib.request.Request(self.base + path, data=body, headers={"Content-Type": content_type})
+        try:
+            with urllib.request.urlopen(req) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def close(self):
+        self.server.shutdown()
+
+
+def json_request(frame, session_id):
+    body = json.dumps({
+        "base64_image": "data:image/jpeg;base64," + base64.b64encode(frame).decode('ascii'),
+        "session_id": session_id
+    })
+    return '/api/sign-to-text', body.encode('utf-8'), 'application/json'
+
+
+def raw_request(frame, session_id):
+    return f'/api/sign-to-text/frame?session_id={session_id}', frame, 'image/jpeg'
+
+
+def landmark_request(landmarks, session_id):
+    body = json.dumps({
+        "landmarks": base64.b64encode(np.asarray(landmarks, dtype='<f4').tobytes()).decode('ascii'),
+        "session_id": session_id
+    })
+    return '/api/sign-to-text', body.encode('utf-8'), 'application/json'
+
+
+def run_stream(transport, make_request, items, session_id, warmup=0):
+    """Send items in order for one session; returns (latencies, statuses) after warm-up"""
+    latencies, statuses = [], []
+    for i, item in enumerate(items):
+        path, body, content_type = make_request(item, session_id)
+        start = time.perf_counter()
+        status = transport.post(path, body, content_type)
+        if i >= warmup:
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+    return latencies, statuses
+
+
+def bench_latency(transport, frames, landmarks, warmup):
+    """Single-client latency and per-stage cost for each request format"""
+    latency, stages = {}, {}
+    for name, make_request, items in (
+        ("base64_json", json_request, frames),
+        ("raw_jpeg", raw_request, frames),
+        ("landmarks", landmark_request, landmarks),
+    ):
+        metrics.REGISTRY.reset()
+        start = time.perf_counter()
+        latencies, statuses = run_stream(transport, make_request, items, f"bench-{name}", warmup)
+        elapsed = time.perf_counter() - start
+        latency[name] = dict(percentiles(latencies), fps=len(items) / elapsed,
+                             errors=sum(status != 200 for status in statuses))
+        stages[name] = metrics.REGISTRY.snapshot()["stages"]
+    return latency, stages
+
+
+def bench_throughput(transport, frames, client_counts, warmup):
+    """Aggregate frames per second with N clients streaming concurrently"""
+    results = []
+    for clients in client_counts:
+        outcomes = [None] * clients
+
+        def client(index):
+            outcomes[index] = run_stream(transport, raw_request, frames, f"bench-client-{clients}-{index}", warmup)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        latencies = [latency for result in outcomes for latency in result[0]]
+        statuses = [status for result in outcomes for status in result[1]]
+        ok = sum(status == 200 for status in statuses)
+        results.append(dict(
+            percentiles([l for l, s in zip(latencies, statuses) if s == 200]),
+            clients=clients,
+            fps=ok / elapsed,
+            rejected=sum(status == 429 for status in statuses),
+            errors=sum(status not in (200, 429) for status in statuses)
+        ))
+    return results
+
+
+def bench_memory(backend_app, frame, count):
+    """Resident memory per live session (MediaPipe tracker, history, gate)"""
+    count = min(count, backend_app.sessions.max_sessions)
+    image = decode(frame)
+    ids = [f"bench-memory-{i}" for i in range(count)]
+    gc.collect()
+    before = resident_memory()
+    for session_id in ids:
+        backend_app.process_image(session_id, image)
+    gc.collect()
+    after = resident_memory()
+    for session_id in ids:
+        backend_app.sessions.remove(session_id)
+    return {
+        "sessions": count,
+        "rss_before_mb": before / 2 ** 20,
+        "rss_after_mb": after / 2 ** 20,
+        "rss_per_session_mb": (after - before) / count / 2 ** 20
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(backend_app, args):
+    return {
+        "timestamp": time.time(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "pool_size": backend_app.POOL_SIZE,
+            "frame_gating": backend_app.FRAME_GATING,
+            "decode_max_width": backend_app.DECODE_MAX_WIDTH,
+            "static_model": ml_utils.model.name if ml_utils.model is not None else "rules",
+            "dynamic_model": ml_utils.dynamic_model is not None
+        },
+        "args": vars(args)
+    }
+
+
+def flatten(results, prefix=""):
+    """{"latency.raw_jpeg.p50_ms": value, ...} for every numeric leaf"""
+    flat = {}
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        # Throughput rows are keyed by their client count
+        items = ((f"clients={row.get('clients', i)}", row) for i, row in enumerate(results))
+    else:
+        return {prefix: results} if isinstance(results, (int, float)) and not isinstance(results, bool) else {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(before_path, after_path, threshold):
+    """Print metric changes between two result files; returns the number of regressions"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    old, new = flatten(before["results"]), flatten(after["results"])
+    regressions = 0
+    print(f"{'metric':<58} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        change = (b - a) / a if a else 0.0
+        # Latency and memory should go down, throughput up
+        worse = change > threshold if key.endswith(('_ms', '_mb', '_s')) else (
+            change < -threshold if key.endswith('fps') else False)
+        regressions += worse
+        flag = "  REGRESSION" if worse else ""
+        print(f"{key:<58} {a:>10.3f} {b:>10.3f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', help='Directory of JPEG frames (default: synthetic)')
+    parser.add_argument('--landmarks', help='.npy landmark fixture of shape (N, 63) (default: synthetic)')
+    parser.add_argument('--count', type=int, default=120, help='Frames per stream')
+    parser.add_argument('--warmup', type=int, default=10, help='Leading frames per stream left out of the statistics')
+    parser.add_argument('--clients', default='1,2,4,8', help='Comma-separated concurrent client counts')
+    parser.add_argument('--memory-sessions', type=int, default=16, help='Sessions created for the memory measurement')
+    parser.add_argument('--server', action='store_true', help='Go through a local HTTP server instead of the test client')
+    parser.add_argument('--port', type=int, default=5098)
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files and exit')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative change reported as a regression by --compare')
+    parser.add_argument('--make-fixture', metavar='PATH', help='Save landmarks extracted from --frames and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    frames = load_frames(args.frames, args.count)
+    if args.make_fixture:
+        make_fixture(frames, args.make_fixture)
+        return
+    landmarks = np.load(args.landmarks) if args.landmarks else synthetic_landmarks(args.count)
+    client_counts = [int(n) for n in args.clients.split(',') if n.strip()]
+
+    start = time.perf_counter()
+    import app as backend_app
+    backend_app.create_app()
+    startup = {"preload_s": time.perf_counter() - start, "warm_up_s": backend_app.warm_up()}
+    transport = ServerTransport(backend_app.app, args.port) if args.server else TestClientTransport(backend_app.app)
+    try:
+        latency, stages = bench_latency(transport, frames, landmarks, args.warmup)
+        throughput = bench_throughput(transport, frames, client_counts, args.warmup)
+    finally:
+        transport.close()
+    memory = bench_memory(backend_app, frames[0], args.memory_sessions)
+
+    report = {
+        "meta": run_metadata(backend_app, args),
+        "results": {"startup": startup, "latency": latency, "stages": stages, "throughput": throughput,
+                    "memory": memory}
+    }
+
+    print(f"Startup: {startup['preload_s']:.2f}s import and model load, {startup['warm_up_s']:.2f}s worker warm-up\n")
+    print(f"{'request':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'fps':>8}")
+    for name, row in latency.items():
+        print(f"{name:<12} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['fps']:>8.1f}")
+    print(f"\n{'stage (raw_jpeg)':<16} {'count':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for stage, row in stages["raw_jpeg"].items():
+        print(f"{stage:<16} {row['count']:>6} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f}")
+    print(f"\n{'clients':>7} {'fps':>8} {'p50 ms':>8} {'p95 ms':>8} {'429s':>6}")
+    for row in throughput:
+        p50 = row['p50_ms'] if row['p50_ms'] is not None else float('nan')
+        p95 = row['p95_ms'] if row['p95_ms'] is not None else float('nan')
+        print(f"{row['clients']:>7} {row['fps']:>8.1f} {p50:>8.2f} {p95:>8.2f} {row['rejected']:>6}")
+    print(f"\nMemory per session: {memory['rss_per_session_mb']:.2f} MB ({memory['sessions']} sessions)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""MediaPipe work per stream with each frame gating preset
+
+Replays one recording through a session per preset and reports the share
+of frames that reached MediaPipe, time per frame, and how far the gated
+landmarks drift from the ungated ones. The synthetic fallback mimics a
+signing session (idle background, a held pose, then movement); synthetic
+frames contain no real hand, so use --frames with a webcam recording for
+meaningful landmark drift figures.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from _common import decode, load_frames
+
+import ml_utils
+from frame_gate import GATING_PRESETS
+
+
+def synthetic_session(count, width=640, height=480, seed=0):
+    """Decoded frames: a third idle, a third holding still, a third moving"""
+    rng = np.random.default_rng(seed)
+    background = np.full((height, width, 3), 60, dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        image = background.copy()
+        phase = 3 * i // count
+        if phase == 1:
+            cv2.circle(image, (width // 2, height // 2), height // 6, (180, 150, 120), -1)
+        elif phase == 2:
+            progress = (i - 2 * count // 3) / max(count // 3, 1)
+            cx = int(width * (0.3 + 0.4 * progress))
+            cv2.circle(image, (cx, height // 2), height // 6, (180, 150, 120), -1)
+        # Sensor noise, so consecutive frames are never bit-identical
+        frames.append(cv2.add(image, rng.integers(0, 8, size=image.shape, dtype=np.uint8)))
+    return frames
+
+
+def replay(images, preset):
+    session = ml_utils.RecognizerSession(f'gating-{preset}', gating=preset)
+    try:
+        results = []
+        start = time.perf_counter()
+        for image in images:
+            results.append(session.extract_hand_landmarks(image))
+        elapsed = time.perf_counter() - start
+        stats = session.gate.stats() if session.gate is not None else {"inference_rate": 1.0}
+        return results, elapsed, stats
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', help='Directory of JPEG frames from one recording (default: synthetic)')
+    parser.add_argument('--count', type=int, default=300, help='Number of frames to use')
+    args = parser.parse_args()
+
+    if args.frames:
+        images = [decode(frame) for frame in load_frames(args.frames, args.count)]
+    else:
+        images = synthetic_session(args.count)
+
+    reference, reference_time, _ = replay(images, 'off')
+    print(f"Frames: {len(images)}")
+    print(f"{'preset':<10} {'inference':>10} {'ms/frame':>9} {'speedup':>8} {'drift':>9} {'agree':>7}")
+    print(f"{'off':<10} {1.0:>10.0%} {reference_time / len(images) * 1000:>9.2f} {1.0:>7.1f}x {0.0:>9.4f} {1.0:>7.0%}")
+    for preset in GATING_PRESETS:
+        results, elapsed, stats = replay(images, preset)
+        both = [(a, b) for (a, da), (b, db) in zip(reference, results) if da and db]
+        drift = np.mean([np.abs(a - b).mean() for a, b in both]) if both else 0.0
+        agree = np.mean([da == db for (_, da), (_, db) in zip(reference, results)])
+        print(f"{preset:<10} {stats['inference_rate']:>10.0%} {elapsed / len(images) * 1000:>9.2f} "
+              f"{reference_time / elapsed:>7.1f}x {drift:>9.4f} {agree:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Throughput of the MediaPipe frame pool as the number of workers grows
+
+Drives several recognizer sessions concurrently through FramePool for each
+pool size from 1 up to the core count and reports frames per second and the
+scaling efficiency relative to a single worker.
+"""
+import argparse
+import os
+import time
+
+from _common import decode, load_frames
+
+import ml_utils
+from frame_pool import FramePool
+
+
+def run(pool_size, sessions, images):
+    pool = FramePool(size=pool_size, queue_size=len(images) * len(sessions), max_frame_age=0)
+    try:
+        start = time.perf_counter()
+        futures = []
+        # Interleave sessions like concurrent clients sending frames
+        for image in images:
+            for session in sessions:
+                futures.append(pool.submit(session.session_id, session.process_frame, image))
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return len(futures) / elapsed
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', help='Directory of JPEG frames (default: synthetic)')
+    parser.add_argument('--count', type=int, default=30, help='Frames per session')
+    parser.add_argument('--sessions', type=int, default=cores * 2, help='Concurrent sessions')
+    parser.add_argument('--max-workers', type=int, default=cores, help='Largest pool size to test')
+    args = parser.parse_args()
+
+    ml_utils.initialize_model()
+    images = [decode(frame) for frame in load_frames(args.frames, args.count)]
+    sessions = [ml_utils.RecognizerSession(f"bench-{i}") for i in range(args.sessions)]
+
+    sizes = sorted({1, 2, 4, 8, 16, 32, args.max_workers} & set(range(1, args.max_workers + 1)))
+    baseline = None
+    print(f"{'workers':>8} {'fps':>10} {'speedup':>8} {'efficiency':>10}")
+    for size in sizes:
+        fps = run(size, sessions, images)
+        baseline = baseline or fps
+        speedup = fps / baseline
+        print(f"{size:>8} {fps:>10.1f} {speedup:>7.2f}x {speedup / size:>9.0%}")
+
+    for session in sessions:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Per-frame vs batched hand-shape features and rule-based classification
+
+Scores a recording of N hands three ways: the original per-frame dict
+implementation (reproduced below for reference), the current per-frame
+API, and one call to the batched API. Also checks all three agree.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _common  # noqa: F401  (puts the backend on sys.path)
+import ml_utils
+
+
+def legacy_features(landmarks):
+    """The original per-frame implementation: five norms and four angle_between calls"""
+    points = landmarks.reshape(-1, 3)
+    wrist = points[0]
+    tips = [points[4], points[8], points[12], points[16], points[20]]
+    features = {}
+    for name, tip in zip(ml_utils.SHAPE_FEATURE_NAMES[:5], tips):
+        features[name] = np.linalg.norm(tip - wrist)
+    for name, (a, b) in zip(ml_utils.SHAPE_FEATURE_NAMES[5:], zip(tips[:-1], tips[1:])):
+        features[name] = ml_utils.angle_between(a - wrist, b - wrist)
+    return features
+
+
+def legacy_rules(f):
+    d = [f["thumb_dist"], f["index_dist"], f["middle_dist"], f["ring_dist"], f["pinky_dist"]]
+    if all(v > 0.2 for v in d):
+        return "hello", 0.7
+    if d[1] > 0.2 and d[2] > 0.2 and d[0] < 0.15 and d[3] < 0.15 and d[4] < 0.15:
+        return "yes", 0.65
+    if d[0] > 0.2 and all(v < 0.15 for v in d[1:]):
+        return "good", 0.7
+    if all(v < 0.15 for v in d):
+        return "no", 0.6
+    return "unknown", 0.3
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=20000, help='Number of hands to score')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Wrist near the middle, fingertips at a mix of folded and extended distances
+    hands = rng.normal(0.5, 0.02, (args.frames, 21, 3))
+    reach = rng.choice([0.05, 0.3], size=(args.frames, 5, 1))
+    hands[:, ml_utils.FINGERTIP_INDICES, :2] += reach * rng.uniform(-1, 1, (args.frames, 5, 2))
+    flat = hands.reshape(args.frames, -1)
+
+    legacy, legacy_time = timed(lambda: [legacy_rules(legacy_features(h)) for h in flat])
+    single, single_time = timed(lambda: [
+        ml_utils.rule_based_classification(ml_utils.get_hand_shape_features(h)) for h in flat])
+
+    def batched():
+        features = ml_utils.hand_shape_features_batch(hands)
+        return ml_utils.rule_based_classification_batch(features)
+
+    (labels, confidences), batch_time = timed(batched)
+
+    assert [label for label, _ in legacy] == list(labels), "batched labels differ from legacy"
+    assert [label for label, _ in single] == list(labels), "per-frame labels differ from batched"
+    reference = np.array([[f[name] for name in ml_utils.SHAPE_FEATURE_NAMES] for f in map(legacy_features, flat[:500])])
+    assert np.allclose(reference, ml_utils.hand_shape_features_batch(hands[:500])), "features differ from legacy"
+
+    print(f"Hands scored:          {args.frames}")
+    print(f"Legacy per-frame:      {legacy_time * 1000:9.1f} ms")
+    print(f"Current per-frame API: {single_time * 1000:9.1f} ms")
+    print(f"Batched (N={args.frames}):   {batch_time * 1000:9.1f} ms")
+    print(f"Speedup vs legacy:     {legacy_time / batch_time:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
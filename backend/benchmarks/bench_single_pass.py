@@ -0,0 +1,51 @@
+"""Compare the legacy two-pass sign-to-text pipeline against the single pass
+
+Before: extract_hand_landmarks(image) followed by predict_sign(image), which
+ran MediaPipe a second time on the same frame.
+After: extract_hand_landmarks(image) once, then predict_sign_from_landmarks.
+"""
+import argparse
+
+from _common import decode, load_frames, measure_fps
+
+import ml_utils
+
+
+session = None
+
+
+def two_pass(image):
+    session.extract_hand_landmarks(image)
+    return session.predict_sign(image)
+
+
+def single_pass(image):
+    landmarks, hand_detected = session.extract_hand_landmarks(image)
+    return session.predict_sign_from_landmarks(landmarks, hand_detected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', help='Directory of JPEG frames (default: synthetic)')
+    parser.add_argument('--count', type=int, default=60, help='Number of frames to use')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions (best is reported)')
+    args = parser.parse_args()
+
+    global session
+    ml_utils.initialize_model()
+    session = ml_utils.RecognizerSession('benchmark')
+    images = [decode(frame) for frame in load_frames(args.frames, args.count)]
+
+    before = measure_fps(two_pass, images, args.repeat)
+    session.clear_gesture_history()
+    after = measure_fps(single_pass, images, args.repeat)
+
+    print(f"Frames:       {len(images)}")
+    print(f"Two-pass:     {before:8.1f} fps")
+    print(f"Single-pass:  {after:8.1f} fps")
+    if before > 0:
+        print(f"Speedup:      {after / before:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
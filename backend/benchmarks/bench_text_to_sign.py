@@ -0,0 +1,82 @@
+"""Text-to-sign translation latency against a large dictionary
+
+Builds a SignIndex over a synthetic dictionary of single words and
+multi-word phrases, then translates a long paragraph mixing exact,
+inflected, partially matching and unknown words.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _common  # noqa: F401  (puts the backend on sys.path)
+from sign_index import SignIndex
+
+LETTERS = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+
+
+def synthetic_dictionary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(LETTERS, rng.integers(3, 9))))
+    words = sorted(words)
+    signs = {word: f"/static/images/signs/{word}.jpg" for word in words}
+    # A tenth of the entries are two- or three-word phrases
+    for _ in range(size // 10):
+        phrase = " ".join(rng.choice(words, rng.integers(2, 4)))
+        signs[phrase] = f"/static/images/signs/{phrase.replace(' ', '_')}.jpg"
+    return signs, words
+
+
+def synthetic_paragraph(words, length, rng):
+    tokens = []
+    for word in rng.choice(words, length):
+        kind = rng.integers(4)
+        if kind == 1:
+            word += rng.choice(["s", "ing", "ed"])
+        elif kind == 2:
+            word += "xyz"
+        elif kind == 3:
+            word = "qq" + word
+        tokens.append(word)
+    return " ".join(tokens) + "."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--signs', type=int, default=10000, help='Single-word dictionary entries')
+    parser.add_argument('--words', type=int, default=500, help='Words in the translated paragraph')
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    signs, words = synthetic_dictionary(args.signs, rng)
+    paragraph = synthetic_paragraph(words, args.words, rng)
+
+    start = time.perf_counter()
+    index = SignIndex(signs)
+    build_time = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        result = index.translate(paragraph)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+
+    counts = {}
+    for sign in result["signs"]:
+        counts[sign["match_type"]] = counts.get(sign["match_type"], 0) + 1
+
+    print(f"Dictionary entries:  {len(index)}")
+    print(f"Index build:         {build_time * 1000:8.1f} ms")
+    print(f"Paragraph words:     {args.words}")
+    print(f"Translate p50:       {np.percentile(timings, 50):8.3f} ms")
+    print(f"Translate p95:       {np.percentile(timings, 95):8.3f} ms")
+    # Translation is linear in the input, so per-word cost is the figure to compare
+    print(f"Per word (p50):      {np.percentile(timings, 50) / args.words * 1000:8.2f} us")
+    print(f"Matches:             {counts}, unmatched {len(result['unmatched_words'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Compare sign-to-text transports: base64 JSON POST, raw JPEG POST, WebSocket
+
+Starts the real Flask app on a local port and replays the same frames over
+each transport, reporting payload size, per-frame round-trip latency and
+sustained frames per second for one client.
+"""
+import argparse
+import base64
+import json
+import statistics
+import threading
+import time
+import urllib.request
+
+from _common import load_frames
+
+from werkzeug.serving import make_server
+
+import app as backend_app
+
+
+def post(url, body, content_type):
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    with urllib.request.urlopen(req) as response:
+        return response.read()
+
+
+def time_frames(send, frames):
+    latencies = []
+    start = time.perf_counter()
+    for frame in frames:
+        t0 = time.perf_counter()
+        send(frame)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    return statistics.median(latencies), len(frames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', help='Directory of JPEG frames (default: synthetic)')
+    parser.add_argument('--count', type=int, default=60, help='Number of frames to send')
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames, args.count)
+    backend_app.create_app()
+    backend_app.warm_up()
+    server = make_server('127.0.0.1', args.port, backend_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{args.port}/api"
+
+    def send_json(frame):
+        body = json.dumps({
+            "base64_image": "data:image/jpeg;base64," + base64.b64encode(frame).decode('ascii'),
+            "session_id": "bench-json"
+        }).encode('utf-8')
+        post(f"{base}/sign-to-text", body, "application/json")
+
+    def send_raw(frame):
+        post(f"{base}/sign-to-text/frame?session_id=bench-raw", frame, "image/jpeg")
+
+    results = []
+    json_size = statistics.mean(
+        len(json.dumps({"base64_image": "data:image/jpeg;base64," + base64.b64encode(f).decode('ascii')}))
+        for f in frames
+    )
+    raw_size = statistics.mean(len(f) for f in frames)
+    results.append(("base64 JSON POST", json_size) + time_frames(send_json, frames))
+    results.append(("raw JPEG POST", raw_size) + time_frames(send_raw, frames))
+
+    try:
+        import simple_websocket
+        ws = simple_websocket.Client.connect(
+            f"ws://127.0.0.1:{args.port}/api/ws/sign-to-text?session_id=bench-ws")
+
+        def send_ws(frame):
+            ws.send(frame)
+            ws.receive()
+
+        results.append(("WebSocket binary", raw_size) + time_frames(send_ws, frames))
+        ws.close()
+    except ImportError:
+        print("flask-sock/simple-websocket not installed; skipping WebSocket transport")
+
+    server.shutdown()
+
+    print(f"{'transport':<18} {'payload (B)':>12} {'p50 ms':>8} {'fps':>8}")
+    for name, size, p50, fps in results:
+        print(f"{name:<18} {size:>12.0f} {p50:>8.2f} {fps:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
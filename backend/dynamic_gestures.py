@@ -0,0 +1,345 @@
+import numpy as np
+
+# Number of frames every gesture sequence is resampled to before matching
+RESAMPLE_LENGTH = 32
+# Sakoe-Chiba band half-width as a fraction of the sequence length
+DEFAULT_BAND_FRACTION = 0.1
+# Templates scored in the first vectorized DTW pass; later passes double in size
+DTW_FIRST_BATCH = 16
+# Dimensions kept by the PCA projection applied to every frame before matching
+DEFAULT_COMPONENTS = 16
+# Leading principal axes used for the LB_Keogh screen of a projected matcher
+BOUND_COMPONENTS = 6
+# reject_distance is this percentile of within-class distances times REJECT_MARGIN
+REJECT_PERCENTILE = 95
+REJECT_MARGIN = 1.5
+
+WRIST = 0
+MIDDLE_MCP = 9
+
+
+def resample_sequence(frames, timestamps, length=RESAMPLE_LENGTH):
+    """Linearly resample a time-stamped landmark sequence to `length` frames
+
+    frames is (T, 63) or (T, 21, 3); timestamps is (T,). Frames are placed
+    on a uniform time grid so gestures performed at different speeds or
+    captured at different frame rates line up.
+    """
+    frames = np.asarray(frames, dtype=np.float32).reshape(len(frames), -1)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(frames) == 1:
+        return np.repeat(frames, length, axis=0)
+
+    # Guard against duplicate timestamps, which would make the grid ambiguous
+    timestamps = timestamps - timestamps[0]
+    if timestamps[-1] <= 0:
+        timestamps = np.arange(len(frames), dtype=np.float64)
+    grid = np.linspace(0.0, timestamps[-1], length)
+
+    upper = np.searchsorted(timestamps, grid, side='right').clip(1, len(frames) - 1)
+    lower = upper - 1
+    span = timestamps[upper] - timestamps[lower]
+    weight = np.divide(grid - timestamps[lower], span, out=np.zeros_like(grid), where=span > 0)
+    weight = weight.clip(0.0, 1.0).astype(np.float32)[:, None]
+    return frames[lower] * (1.0 - weight) + frames[upper] * weight
+
+
+def normalize_sequence(sequence):
+    """Make a (L, 63) sequence invariant to hand position and size
+
+    Translates by the mean wrist position over the sequence (so the wrist
+    trajectory is kept) and scales by the median wrist-to-middle-knuckle
+    distance, i.e. the apparent hand size.
+    """
+    points = np.asarray(sequence, dtype=np.float32).reshape(len(sequence), -1, 3)
+    origin = points[:, WRIST].mean(axis=0)
+    sizes = np.linalg.norm(points[:, MIDDLE_MCP, :2] - points[:, WRIST, :2], axis=1)
+    # np.median without its generic overhead, which dominated at these lengths
+    middle = len(sizes) // 2
+    if len(sizes) % 2:
+        scale = np.partition(sizes, middle)[middle]
+    else:
+        scale = np.partition(sizes, (middle - 1, middle))[middle - 1:middle + 1].mean()
+    if not np.isfinite(scale) or scale < 1e-6:
+        scale = 1.0
+    return ((points - origin) / scale).reshape(len(sequence), -1)
+
+
+def prepare_sequence(frames, timestamps, length=RESAMPLE_LENGTH):
+    """Resample and normalize a raw landmark history into matcher input"""
+    return normalize_sequence(resample_sequence(frames, timestamps, length))
+
+
+def _pairwise_frame_distances(query, templates):
+    """Euclidean distance between every query frame and every template frame
+
+    query is (L, D), templates is (B, L, D); returns (B, L, L).
+    """
+    cross = templates @ query.T  # (B, L, L): template frame j vs query frame i
+    sq = (np.einsum('ld,ld->l', query, query)[None, None, :] +
+          np.einsum('bld,bld->bl', templates, templates)[:, :, None] - 2.0 * cross)
+    return np.sqrt(np.maximum(sq, 0.0)).transpose(0, 2, 1)
+
+
+def dtw_distances(query, templates, radius):
+    """Banded DTW distance from one query to a batch of templates
+
+    All templates are advanced together and each row of the band is solved
+    in closed form: with C the running sum of the row's costs, cell j is
+    C[j] + min over k <= j of (best of the previous row at k - C[k-1]), a
+    prefix minimum. The Python-level loop therefore runs once per row, not
+    once per cell or per template.
+    """
+    length = query.shape[0]
+    cost = _pairwise_frame_distances(query, templates)
+    batch = templates.shape[0]
+    acc = np.full((batch, length + 1, length + 1), np.inf, dtype=np.float32)
+    acc[:, 0, 0] = 0.0
+    for i in range(1, length + 1):
+        lo = max(1, i - radius)
+        hi = min(length, i + radius)
+        prev_row = acc[:, i - 1]
+        # Diagonal and vertical moves only depend on the previous row
+        best_prev = np.minimum(prev_row[:, lo - 1:hi], prev_row[:, lo:hi + 1])
+        row_cost = cost[:, i - 1, lo - 1:hi]
+        # Horizontal moves chain along the row: resolve them with a prefix minimum
+        running = np.cumsum(row_cost, axis=1)
+        acc[:, i, lo:hi + 1] = running + np.minimum.accumulate(best_prev - (running - row_cost), axis=1)
+    return acc[:, length, length] / (2 * length)
+
+
+def lb_keogh(query, templates, radius):
+    """LB_Keogh lower bound of the banded DTW distance for every template
+
+    Builds the upper/lower envelope of the query once, then measures how far
+    each template frame falls outside it. Returns (K,) bounds on the same
+    scale as dtw_distances.
+    """
+    length = query.shape[0]
+    windows = np.lib.stride_tricks.sliding_window_view(
+        np.pad(query, ((radius, radius), (0, 0)), mode='edge'), 2 * radius + 1, axis=0)
+    upper = windows.max(axis=-1)
+    lower = windows.min(axis=-1)
+    excess = np.maximum(templates - upper, 0.0) + np.maximum(lower - templates, 0.0)
+    frame_bounds = np.sqrt(np.einsum('kld,kld->kl', excess, excess))
+    # Every DTW path visits each template frame at least once with weight >= 1
+    return frame_bounds.sum(axis=1) / (2 * length)
+
+
+def calibrate_reject_distance(distances, percentile=REJECT_PERCENTILE, margin=REJECT_MARGIN):
+    """Rejection threshold from within-class DTW distances, or None if there are none"""
+    distances = np.asarray(distances, dtype=np.float64)
+    distances = distances[np.isfinite(distances)]
+    if not len(distances):
+        return None
+    return float(np.percentile(distances, percentile) * margin)
+
+
+def _principal_axes(frames, components):
+    """(mean, (D, components) projection) of the top principal axes of (N, D) frames"""
+    mean = frames.mean(axis=0)
+    _, _, vt = np.linalg.svd(frames - mean, full_matrices=False)
+    return mean.astype(np.float32), np.ascontiguousarray(vt[:components].T, dtype=np.float32)
+
+
+class DTWGestureMatcher:
+    """Nearest-template dynamic gesture classifier using banded DTW
+
+    Holds one or more normalized, fixed-length templates per label, stored
+    in a PCA-projected frame space (`mean`, `projection`) so matching works
+    on a handful of dimensions instead of 63. A query is screened with
+    LB_Keogh and templates are then scored in order of their lower bound;
+    scoring stops as soon as no remaining template can beat the best match
+    found so far. With a PCA projection the screen only looks at the
+    leading BOUND_COMPONENTS axes: dropping dimensions can only shrink
+    frame distances, so it is still a lower bound, and the high-variance
+    axes carry nearly all of its pruning power at a fraction of the cost.
+
+    Queries farther than `reject_distance` from every template are
+    "unknown". from_sequences() calibrates it from within-class distances
+    of the training data; older pickles without a threshold calibrate it
+    from the templates themselves when loaded, and those without a
+    projection get one fitted to their templates.
+    """
+
+    def __init__(self, templates, labels, length=RESAMPLE_LENGTH, band_fraction=DEFAULT_BAND_FRACTION,
+                 reject_distance=None, mean=None, projection=None):
+        self.templates = np.ascontiguousarray(templates, dtype=np.float32)
+        self.labels = np.asarray(labels)
+        self.length = length
+        self.radius = max(1, int(round(length * band_fraction)))
+        self.reject_distance = reject_distance
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        self.projection = None if projection is None else np.asarray(projection, dtype=np.float32)
+        if self.templates.ndim != 3 or self.templates.shape[1] != length:
+            raise ValueError(f"Templates must have shape (K, {length}, D)")
+        if len(self.labels) != len(self.templates):
+            raise ValueError("Need exactly one label per template")
+        self._bound_templates = self._screen(self.templates)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reject_distance = getattr(self, 'reject_distance', None)
+        self.mean = getattr(self, 'mean', None)
+        self.projection = getattr(self, 'projection', None)
+        if 'projection' not in state and self.templates.shape[-1] > DEFAULT_COMPONENTS:
+            # Pickles from before the PCA projection hold raw templates:
+            # derive the axes from the templates and move them into that space
+            flat = self.templates.reshape(-1, self.templates.shape[-1])
+            self.mean, self.projection = _principal_axes(flat, DEFAULT_COMPONENTS)
+            self.templates = np.ascontiguousarray((self.templates - self.mean) @ self.projection)
+        self._bound_templates = self._screen(self.templates)
+        if self.reject_distance is None:
+            self.reject_distance = self._template_reject_distance()
+
+    def _template_reject_distance(self):
+        """Calibrate from distances between templates of the same label"""
+        distances = []
+        for label in np.unique(self.labels):
+            members = self.templates[self.labels == label]
+            for i in range(len(members) - 1):
+                distances.extend(dtw_distances(members[i], members[i + 1:], self.radius))
+        return calibrate_reject_distance(distances)
+
+    @classmethod
+    def from_sequences(cls, sequences, labels, templates_per_label=3, components=DEFAULT_COMPONENTS, **kwargs):
+        """Build a matcher from (frames, timestamps) training sequences
+
+        Each label keeps up to `templates_per_label` exemplars, chosen as the
+        sequences closest to the label's mean so outliers are skipped. Frames
+        are projected onto the top `components` principal axes of the
+        training frames (None keeps the raw coordinates).
+        """
+        length = kwargs.get('length', RESAMPLE_LENGTH)
+        prepared = np.stack([prepare_sequence(frames, timestamps, length) for frames, timestamps in sequences])
+
+        mean = projection = None
+        if components and components < prepared.shape[-1]:
+            mean, projection = _principal_axes(prepared.reshape(-1, prepared.shape[-1]), components)
+            prepared = (prepared - mean) @ projection
+
+        labels = np.asarray(labels)
+        templates, template_labels = [], []
+        for label in np.unique(labels):
+            members = prepared[labels == label]
+            spread = np.linalg.norm((members - members.mean(axis=0)).reshape(len(members), -1), axis=1)
+            for index in np.argsort(spread)[:templates_per_label]:
+                templates.append(members[index])
+                template_labels.append(label)
+        matcher = cls(np.stack(templates), template_labels, mean=mean, projection=projection, **kwargs)
+        if 'reject_distance' not in kwargs:
+            # Each training sequence against its own label's templates; a
+            # sequence that became a template matches itself at 0 and is skipped
+            distances = [matcher._label_distance(sequence, label) for sequence, label in zip(prepared, labels)]
+            distances = [distance for distance in distances if distance > 0]
+            matcher.reject_distance = calibrate_reject_distance(distances) or matcher._template_reject_distance()
+        return matcher
+
+    @property
+    def classes_(self):
+        return np.unique(self.labels)
+
+    def predict_sequence(self, frames, timestamps):
+        """Classify a raw landmark history; returns (label, confidence)"""
+        return self.predict_prepared(prepare_sequence(frames, timestamps, self.length))
+
+    def _screen(self, sequences):
+        """The leading principal axes of projected sequences, for the LB_Keogh screen"""
+        if self.projection is None:
+            return sequences
+        return np.ascontiguousarray(sequences[..., :BOUND_COMPONENTS])
+
+    def _project(self, query):
+        query = np.asarray(query, dtype=np.float32)
+        if self.projection is not None:
+            query = (query - self.mean) @ self.projection
+        return query
+
+    def _label_distance(self, projected, label):
+        """Smallest DTW distance from a projected sequence to a template of `label`"""
+        members = self.templates[self.labels == label]
+        if not len(members):
+            return np.inf
+        return float(dtw_distances(projected, members, self.radius).min())
+
+    def label_distance(self, frames, timestamps, label):
+        """DTW distance from a raw landmark history to the closest template of `label`"""
+        return self._label_distance(self._project(prepare_sequence(frames, timestamps, self.length)), label)
+
+    def predict_prepared(self, query):
+        """Classify an already resampled and normalized (L, 63) sequence
+
+        Confidence is the normalized margin 1 - distance / min(runner-up,
+        reject_distance): 0 on the decision boundary (a tie with another
+        label, or at the rejection threshold), 1 for a perfect match.
+        """
+        query = self._project(query)
+        reject = self.reject_distance if self.reject_distance is not None else np.inf
+        bounds = lb_keogh(self._screen(query), self._bound_templates, self.radius)
+        order = np.argsort(bounds)
+
+        best = {}  # label -> best DTW distance seen
+        best_distance = np.inf
+        start, batch_size = 0, DTW_FIRST_BATCH
+        while start < len(order):
+            batch = order[start:start + batch_size]
+            # Bounds are sorted, so once the smallest remaining bound is no
+            # better than the best match (or beyond the rejection threshold),
+            # nothing left can win
+            batch = batch[bounds[batch] < min(best_distance, reject)]
+            if len(batch) == 0:
+                break
+            start += len(batch)
+            batch_size *= 2
+            distances = dtw_distances(query, self.templates[batch], self.radius)
+            for index, distance in zip(batch, distances):
+                label = self.labels[index]
+                if distance < best.get(label, np.inf):
+                    best[label] = float(distance)
+            best_distance = min(best_distance, float(distances.min()))
+
+        if not best:
+            return "unknown", 0.0
+        ranked = sorted(best.items(), key=lambda item: item[1])
+        label, distance = ranked[0]
+        if distance > reject:
+            return "unknown", 0.0
+
+        # Runner-up: the closest other label scored, or the lower bound of
+        # the closest unscored template of another label (a conservative estimate).
+        # Other-label templates whose bound undercuts it are scored first, so
+        # the margin is not set by a loose bound
+        runner_up = ranked[1][1] if len(ranked) > 1 else np.inf
+        unscored = order[start:]
+        others = unscored[self.labels[unscored] != label]
+        contenders = others[:DTW_FIRST_BATCH]
+        contenders = contenders[bounds[contenders] < min(runner_up, reject)]
+        if len(contenders):
+            runner_up = min(runner_up, float(dtw_distances(query, self.templates[contenders], self.radius).min()))
+            others = others[len(contenders):]
+        if len(others):
+            runner_up = min(runner_up, float(bounds[others[0]]))
+        margin = min(runner_up, reject)
+        if not np.isfinite(margin):
+            return label, 1.0
+        if margin <= 0:
+            return label, 0.0
+        return label, float(np.clip(1.0 - distance / margin, 0.0, 1.0))
+
+
+def predict_dynamic(model, frames, timestamps):
+    """Run any supported dynamic model on a landmark history
+
+    Supports DTWGestureMatcher-style objects (predict_sequence) and sklearn
+    classifiers trained on flattened prepared sequences (predict_proba).
+    Returns (label, confidence), or (None, 0) for unsupported models.
+    """
+    if hasattr(model, 'predict_sequence'):
+        return model.predict_sequence(frames, timestamps)
+    if hasattr(model, 'predict_proba'):
+        length = getattr(model, 'sequence_length_', RESAMPLE_LENGTH)
+        X = prepare_sequence(frames, timestamps, length).reshape(1, -1)
+        probabilities = model.predict_proba(X)[0]
+        best = int(np.argmax(probabilities))
+        return model.classes_[best], float(probabilities[best])
+    return None, 0
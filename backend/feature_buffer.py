@@ -0,0 +1,75 @@
+import numpy as np
+
+NUM_COORDS = 63  # 21 landmarks x (x, y, z)
+
+
+class LandmarkFeatureBuffer:
+    """Fixed-capacity ring buffer of landmarks with per-frame shape features
+
+    Storage is preallocated once and every slot is written twice (at i and
+    i + capacity), so the most recent frames are always one contiguous
+    slice: landmarks(), timestamps() and features() return views, never
+    copies. Each frame's hand-shape features (`shape_features`) are
+    computed once on append and reused by static classification.
+    """
+
+    def __init__(self, capacity=30, shape_features=None, num_shape_features=0):
+        self.capacity = capacity
+        self.shape_features = shape_features
+        self.num_features = num_shape_features
+
+        self._landmarks = np.zeros((2 * capacity, NUM_COORDS), dtype=np.float64)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._features = np.zeros((2 * capacity, self.num_features), dtype=np.float64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, landmarks, timestamp):
+        """Add one frame and return its feature row"""
+        slot = self._next
+        upper = slot + self.capacity
+
+        row = self._features[slot]
+        if self.shape_features is not None:
+            row[:] = self.shape_features(landmarks)
+
+        self._landmarks[slot] = landmarks
+        self._landmarks[upper] = landmarks
+        self._timestamps[slot] = timestamp
+        self._timestamps[upper] = timestamp
+        self._features[upper] = row
+
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return row
+
+    def _window(self, storage):
+        end = self._next + self.capacity
+        return storage[end - self._count:end]
+
+    def landmarks(self):
+        """(n, 63) view of the raw landmarks in the window, oldest first"""
+        return self._window(self._landmarks)
+
+    def timestamps(self):
+        """(n,) view of the frame timestamps, oldest first"""
+        return self._window(self._timestamps)
+
+    def features(self):
+        """(n, F) view of the per-frame features, oldest first"""
+        return self._window(self._features)
+
+    def duration(self):
+        """Seconds between the oldest and newest frame in the window"""
+        if self._count < 2:
+            return 0.0
+        end = self._next + self.capacity
+        return self._timestamps[end - 1] - self._timestamps[end - self._count]
+
+    def clear(self):
+        """Empty the window without reallocating"""
+        self._next = 0
+        self._count = 0
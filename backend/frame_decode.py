@@ -0,0 +1,84 @@
+import threading
+
+import cv2
+import numpy as np
+
+# Reduced-resolution JPEG decoding: the decoder skips DCT work instead of resizing afterwards
+REDUCED_DECODE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+# Start-of-frame markers carrying the image size (baseline, progressive, lossless, ...)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Width frames are reduced to before landmark extraction; MediaPipe's own
+# detector input is far smaller, so this costs no accuracy
+DEFAULT_MAX_WIDTH = 640
+
+_buffers = threading.local()
+
+
+def jpeg_size(data):
+    """(width, height) from a JPEG header without decoding, or None for other formats"""
+    data = memoryview(data)
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # markers without a length
+            i += 2
+            continue
+        if marker in SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
+
+
+def decode_frame(data, max_width=0):
+    """Decode an encoded image to BGR, at most `max_width` pixels wide
+
+    JPEGs at least twice as wide as `max_width` are decoded at 1/2, 1/4 or
+    1/8 resolution directly; whatever is still too wide is then resized
+    with area interpolation. Landmarks are normalized to the image size,
+    so a downscaled frame yields the same coordinates as the original.
+    max_width=0 decodes at full resolution. Returns None if undecodable.
+    """
+    buffer = np.frombuffer(data, np.uint8)
+    if not max_width:
+        return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+    flags = cv2.IMREAD_COLOR
+    size = jpeg_size(data)
+    if size is not None:
+        for factor in (8, 4, 2):
+            if size[0] // factor >= max_width:
+                flags = REDUCED_DECODE_FLAGS[factor]
+                break
+    image = cv2.imdecode(buffer, flags)
+    if image is None or image.shape[1] <= max_width:
+        return image
+    height = max(1, round(image.shape[0] * max_width / image.shape[1]))
+    return cv2.resize(image, (max_width, height), interpolation=cv2.INTER_AREA)
+
+
+def to_rgb(image):
+    """BGR -> RGB into a buffer owned by the calling thread
+
+    The buffer is reused for every frame of the same size on this thread,
+    so the result is only valid until the thread's next call; consumers
+    such as MediaPipe copy it before returning.
+    """
+    cache = getattr(_buffers, 'rgb', None)
+    if cache is None or cache.shape != image.shape:
+        cache = np.empty(image.shape, dtype=np.uint8)
+        _buffers.rgb = cache
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=cache)
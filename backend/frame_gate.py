@@ -0,0 +1,153 @@
+import cv2
+import numpy as np
+
+# Accuracy/latency trade-off presets for FrameGate (ISL_FRAME_GATING)
+#   motion_threshold  mean absolute thumbnail difference (0-255) that counts as motion
+#   max_reuse         consecutive still frames allowed to reuse the last landmarks
+#   absent_stride     without a hand, run inference on every Nth still frame
+#   roi               track inside a crop around the last hand instead of the full frame
+GATING_PRESETS = {
+    "accurate": {"motion_threshold": 1.0, "max_reuse": 1, "absent_stride": 2, "roi": True},
+    "balanced": {"motion_threshold": 2.0, "max_reuse": 3, "absent_stride": 4, "roi": True},
+    "fast": {"motion_threshold": 4.0, "max_reuse": 6, "absent_stride": 8, "roi": True},
+}
+
+THUMBNAIL_SIZE = (32, 24)
+# The crop extends this many hand sizes beyond the hand on every side
+ROI_MARGIN = 0.75
+# Recompute the crop once the hand leaves this inner fraction of it
+ROI_INNER = 0.7
+ROI_MIN_SIZE = 96
+# Crops larger than this fraction of the frame are not worth it
+ROI_MAX_AREA = 0.6
+
+
+def make_gate(preset):
+    """FrameGate for a preset name, or None for "off" / unknown presets"""
+    settings = GATING_PRESETS.get(preset)
+    return FrameGate(**settings) if settings is not None else None
+
+
+class FrameGate:
+    """Decides per frame whether hand-landmark inference is needed
+
+    A 32x24 grayscale thumbnail of every frame is compared with the one of
+    the last frame that was actually processed. While the scene is still,
+    the previous landmarks are reused (at most `max_reuse` times in a row,
+    so a slowly moving hand is still refreshed). When no hand was found,
+    still frames are only re-checked every `absent_stride` frames, so an
+    idle stream costs a fraction of the inference.
+
+    With `roi` enabled, inference runs on a square crop around the last
+    hand and landmarks are mapped back to full-frame normalized coordinates.
+    The crop stays put while the hand remains well inside it and is
+    re-centered when it drifts out. Crops go to their own inference function
+    (a static-image detector), so the video-mode tracker behind `infer` only
+    ever sees full frames in one coordinate frame. If the crop loses the
+    hand, the same frame is searched at full size with `infer`.
+    """
+
+    def __init__(self, motion_threshold=2.0, max_reuse=3, absent_stride=4, roi=True):
+        self.motion_threshold = motion_threshold
+        self.max_reuse = max_reuse
+        self.absent_stride = absent_stride
+        self.roi = roi
+        self._reference = None  # thumbnail of the last processed frame
+        self._landmarks = None
+        self._detected = False
+        self._skipped = 0
+        self._crop = None  # (x0, y0, x1, y1) in pixels
+        self.frames = 0
+        self.inferences = 0
+        self.roi_inferences = 0
+
+    def reset(self):
+        self._reference = None
+        self._landmarks = None
+        self._detected = False
+        self._skipped = 0
+        self._crop = None
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "roi_inferences": self.roi_inferences,
+            "inference_rate": self.inferences / self.frames if self.frames else 0.0
+        }
+
+    def extract(self, image, infer, infer_crop=None):
+        """Landmarks for `image`, calling infer(frame) / infer_crop(crop) -> (landmarks, detected) only when needed
+
+        infer_crop defaults to infer.
+        """
+        self.frames += 1
+        thumbnail = cv2.resize(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), THUMBNAIL_SIZE,
+                               interpolation=cv2.INTER_AREA)
+        if self._should_skip(thumbnail):
+            self._skipped += 1
+            return self._landmarks.copy(), self._detected
+
+        landmarks, detected = self._infer(image, infer, infer_crop or infer)
+        self._reference = thumbnail
+        self._landmarks = landmarks
+        self._detected = detected
+        self._skipped = 0
+        return landmarks.copy(), detected
+
+    def _should_skip(self, thumbnail):
+        if self._reference is None:
+            return False
+        motion = cv2.absdiff(thumbnail, self._reference).mean()
+        if motion >= self.motion_threshold:
+            return False
+        if self._detected:
+            return self._skipped < self.max_reuse
+        return self._skipped + 1 < self.absent_stride
+
+    def _infer(self, image, infer, infer_crop):
+        height, width = image.shape[:2]
+        self.inferences += 1
+        if self.roi and self._crop is not None:
+            x0, y0, x1, y1 = self._crop
+            landmarks, detected = infer_crop(image[y0:y1, x0:x1])
+            if detected:
+                self.roi_inferences += 1
+                points = landmarks.reshape(-1, 3)
+                scale = (x1 - x0) / width
+                points[:, 0] = (points[:, 0] * (x1 - x0) + x0) / width
+                points[:, 1] = (points[:, 1] * (y1 - y0) + y0) / height
+                # MediaPipe z is on the scale of the image width
+                points[:, 2] *= scale
+                self._update_crop(points, width, height)
+                return landmarks, detected
+            self.inferences += 1
+
+        landmarks, detected = infer(image)
+        if detected and self.roi:
+            self._update_crop(landmarks.reshape(-1, 3), width, height)
+        else:
+            self._crop = None
+        return landmarks, detected
+
+    def _update_crop(self, points, width, height):
+        """Keep the crop while the hand stays inside its inner region, else re-center it"""
+        xs = points[:, 0] * width
+        ys = points[:, 1] * height
+        if self._crop is not None:
+            x0, y0, x1, y1 = self._crop
+            inset_x = (x1 - x0) * (1 - ROI_INNER) / 2
+            inset_y = (y1 - y0) * (1 - ROI_INNER) / 2
+            if (xs.min() >= x0 + inset_x and xs.max() <= x1 - inset_x and
+                    ys.min() >= y0 + inset_y and ys.max() <= y1 - inset_y):
+                return
+
+        size = max(xs.max() - xs.min(), ys.max() - ys.min())
+        side = max(ROI_MIN_SIZE, size * (1 + 2 * ROI_MARGIN))
+        if side * side > ROI_MAX_AREA * width * height:
+            self._crop = None
+            return
+        cx, cy = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+        x0 = int(np.clip(cx - side / 2, 0, max(0, width - side)))
+        y0 = int(np.clip(cy - side / 2, 0, max(0, height - side)))
+        self._crop = (x0, y0, min(width, int(x0 + side)), min(height, int(y0 + side)))
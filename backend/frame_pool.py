@@ -0,0 +1,98 @@
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+
+class PoolBusyError(Exception):
+    """Raised when a worker queue is full and the frame cannot be accepted"""
+
+
+class StaleFrameError(Exception):
+    """Raised when a frame waited in the queue longer than the allowed age"""
+
+
+class FramePool:
+    """Fixed pool of worker threads for MediaPipe frame processing
+
+    Every session is pinned to one worker (stable hash of its id), so a
+    session's tracker is only ever driven from a single thread and stays
+    warm, while different sessions run in parallel on different cores
+    (MediaPipe and OpenCV release the GIL during inference). Each worker has
+    a bounded queue: `submit` raises PoolBusyError instead of queueing
+    without limit, and frames older than `max_frame_age` seconds are dropped
+    with StaleFrameError rather than processed late. `observe_wait`, if
+    given, is called with the seconds each job spent queued.
+    """
+
+    def __init__(self, size=None, queue_size=4, max_frame_age=1.0, observe_wait=None):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self.max_frame_age = max_frame_age
+        self.observe_wait = observe_wait
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(self.size)]
+        self._threads = []
+        self._stopped = False
+        for index, work_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._worker,
+                args=(work_queue,),
+                name=f"frame-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def worker_for(self, session_id):
+        """Index of the worker that owns `session_id`"""
+        return zlib.crc32(str(session_id).encode('utf-8')) % self.size
+
+    def submit(self, session_id, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) on the session's worker and return a Future"""
+        if self._stopped:
+            raise RuntimeError("Frame pool has been shut down")
+        future = Future()
+        job = (time.monotonic(), future, fn, args, kwargs)
+        try:
+            self._queues[self.worker_for(session_id)].put_nowait(job)
+        except queue.Full:
+            raise PoolBusyError(f"Worker queue full for session '{session_id}'")
+        return future
+
+    def run(self, session_id, fn, *args, timeout=None, **kwargs):
+        """Submit and wait for the result"""
+        return self.submit(session_id, fn, *args, **kwargs).result(timeout=timeout)
+
+    def queue_depth(self):
+        """Total number of frames waiting across all workers"""
+        return sum(work_queue.qsize() for work_queue in self._queues)
+
+    def shutdown(self, wait=True):
+        """Stop all workers after they finish their current job"""
+        self._stopped = True
+        for work_queue in self._queues:
+            work_queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _worker(self, work_queue):
+        while True:
+            job = work_queue.get()
+            if job is None:
+                return
+            enqueued_at, future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            waited = time.monotonic() - enqueued_at
+            if self.observe_wait is not None:
+                self.observe_wait(waited)
+            if self.max_frame_age and waited > self.max_frame_age:
+                future.set_exception(StaleFrameError("Frame dropped: waited too long in queue"))
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
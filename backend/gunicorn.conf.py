@@ -0,0 +1,44 @@
+"""Gunicorn settings for production serving (run from the backend directory)
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+The app is imported and the models loaded once in the master (preload_app)
+and shared copy-on-write by the forked workers. Each worker then starts
+its own threads, SQLite connection and MediaPipe trackers and runs a
+warm-up frame before it accepts connections.
+
+Recognizer sessions, training jobs and the training recorder live in the
+worker that created them. With more than one worker, stream over the
+WebSocket endpoint or route each session_id to a fixed worker; a single
+worker already spreads MediaPipe work over ISL_POOL_SIZE threads.
+
+The sign dictionary (SIGNS_DICT, SIGN_INDEX, DICTIONARY_LISTING) is also
+per-worker state. It is persisted in the shared SQLite sign store, and a
+worker reloads it before serving a dictionary route whenever another
+worker has committed a change, so all workers converge on the same
+signs and ETags.
+"""
+import gc
+import os
+
+bind = os.environ.get('ISL_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('ISL_WORKERS', 1))
+# Threads per worker for request handling (and long-lived WebSocket connections)
+worker_class = 'gthread'
+threads = int(os.environ.get('ISL_THREADS', 16))
+timeout = int(os.environ.get('ISL_WORKER_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers do not write to (and un-share) those pages
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    import app as backend_app
+    elapsed = backend_app.warm_up()
+    worker.log.info("Worker %s ready in %.2fs", os.getpid(), elapsed)
@@ -0,0 +1,291 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from frame_decode import decode_frame, DEFAULT_MAX_WIDTH
+from ml_utils import RecognizerSession, NUM_LANDMARKS, LANDMARK_DIMS
+from training_recorder import SHARD_EXTENSION, iter_shard, list_shards
+
+CACHE_DIR_NAME = '.landmark_cache'
+INDEX_FILENAME = 'index.json'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# Sequences are split wherever frames with a hand are further apart than this
+SEQUENCE_GAP = 0.5
+
+
+def list_sources(training_root):
+    """Every recorded session under `training_root` with a change fingerprint
+
+    Sessions are either shard files written by TrainingRecorder or, for
+    data recorded before shards existed, the `<session>_<ms>.jpg` images in
+    a gesture directory. The fingerprint (sizes and mtimes) changes whenever
+    a session gains frames.
+    """
+    sources = []
+    for gesture, session, path in list_shards(training_root):
+        stat = os.stat(path)
+        sources.append({
+            "key": f"{gesture}/{session}{SHARD_EXTENSION}",
+            "gesture": gesture,
+            "kind": "shard",
+            "paths": [path],
+            "fingerprint": [stat.st_size, stat.st_mtime_ns]
+        })
+
+    for gesture in sorted(os.listdir(training_root)) if os.path.isdir(training_root) else []:
+        gesture_dir = os.path.join(training_root, gesture)
+        if gesture.startswith('.') or not os.path.isdir(gesture_dir):
+            continue
+        sessions = {}
+        for filename in os.listdir(gesture_dir):
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() in IMAGE_EXTENSIONS and '_' in stem:
+                session, millis = stem.rsplit('_', 1)
+                if millis.isdigit():
+                    sessions.setdefault(session, []).append((int(millis), os.path.join(gesture_dir, filename)))
+        for session, frames in sorted(sessions.items()):
+            frames.sort()
+            stats = [os.stat(path) for _, path in frames]
+            sources.append({
+                "key": f"{gesture}/{session}/*.jpg",
+                "gesture": gesture,
+                "kind": "images",
+                "paths": [path for _, path in frames],
+                "fingerprint": [len(frames), sum(s.st_size for s in stats), max(s.st_mtime_ns for s in stats)]
+            })
+    return sources
+
+
+def _extract_source(source):
+    """Landmarks of one session: (timestamps (n,), landmarks (n, 63)) for frames with a hand
+
+    Runs in a worker process. Landmarks stored at record time are used as
+    is; other frames are decoded and tracked with a fresh tracker, in order.
+    """
+    tracker = None
+    timestamps, landmarks = [], []
+
+    def track(image_bytes):
+        nonlocal tracker
+        if tracker is None:
+            tracker = RecognizerSession(f"dataset:{source['key']}")
+        image = decode_frame(image_bytes, DEFAULT_MAX_WIDTH)
+        if image is None:
+            return None, False
+        return tracker.extract_hand_landmarks(image)
+
+    try:
+        if source["kind"] == "shard":
+            for timestamp, stored, hand, image_bytes in iter_shard(source["paths"][0]):
+                frame, detected = (stored, hand) if stored is not None else track(image_bytes)
+                if detected:
+                    timestamps.append(timestamp)
+                    landmarks.append(frame)
+        else:
+            for path in source["paths"]:
+                with open(path, 'rb') as f:
+                    frame, detected = track(f.read())
+                if detected:
+                    millis = os.path.splitext(path)[0].rsplit('_', 1)[1]
+                    timestamps.append(int(millis) / 1000.0)
+                    landmarks.append(frame)
+    finally:
+        if tracker is not None:
+            tracker.close()
+
+    return (np.array(timestamps, dtype=np.float64),
+            np.array(landmarks, dtype=np.float32).reshape(len(landmarks), NUM_LANDMARKS * LANDMARK_DIMS))
+
+
+def _needs_images(source):
+    """False for shards where every frame already carries landmarks"""
+    if source["kind"] != "shard":
+        return True
+    return any(landmarks is None for _, landmarks, _, _ in iter_shard(source["paths"][0], load_images=False))
+
+
+class LandmarkDataset:
+    """Read-only view of the cached landmark arrays
+
+    landmarks is a float32 (frames, 21, 3) memmap and timestamps a float64
+    (frames,) memmap; `sequences` lists each session's offset, length and
+    gesture label. Nothing is copied until a slice is actually used.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        with open(os.path.join(cache_dir, INDEX_FILENAME), 'r') as f:
+            self.index = json.load(f)
+        generation = self.index["generation"]
+        self.landmarks = np.load(os.path.join(cache_dir, f"landmarks-{generation}.npy"), mmap_mode='r')
+        self.timestamps = np.load(os.path.join(cache_dir, f"timestamps-{generation}.npy"), mmap_mode='r')
+        self.sequences = self.index["sequences"]
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def split_sessions(self, validation_fraction=0.2):
+        """(train, validation) session indices, holding out whole sessions per gesture
+
+        Every gesture with two or more sessions holds out at least one (and
+        always keeps at least one for training); gestures with a single
+        session are only used for training. The split is deterministic so
+        metrics of successive trainings are comparable.
+        """
+        by_label = {}
+        for i, entry in enumerate(self.sequences):
+            by_label.setdefault(entry["gesture"], []).append(i)
+        train, validation = [], []
+        for indices in by_label.values():
+            held_out = 0
+            if len(indices) > 1 and validation_fraction > 0:
+                held_out = min(len(indices) - 1, max(1, round(len(indices) * validation_fraction)))
+            validation.extend(indices[len(indices) - held_out:])
+            train.extend(indices[:len(indices) - held_out])
+        return sorted(train), sorted(validation)
+
+    @property
+    def labels(self):
+        return [entry["gesture"] for entry in self.sequences]
+
+    def session(self, i):
+        """(landmarks (n, 21, 3), timestamps (n,), label) of one session, as memmap views"""
+        entry = self.sequences[i]
+        window = slice(entry["offset"], entry["offset"] + entry["length"])
+        return self.landmarks[window], self.timestamps[window], entry["gesture"]
+
+    def training_sequences(self, window=30, min_length=10, gap=SEQUENCE_GAP, sessions=None):
+        """Split sessions into gesture-sized (frames (n, 63), timestamps, label) samples
+
+        A session is cut wherever the hand was missing for more than `gap`
+        seconds, and long runs are cut into `window`-frame pieces with 50%
+        overlap (the last piece always ends at the run's end), matching what
+        the live recognizer sees. Runs shorter than
+        `min_length` frames are skipped. `sessions` restricts the samples to
+        those session indices.
+        """
+        samples = []
+        for i in range(len(self.sequences)) if sessions is None else sessions:
+            landmarks, timestamps, label = self.session(i)
+            if len(timestamps) < min_length:
+                continue
+            breaks = np.flatnonzero(np.diff(timestamps) > gap) + 1
+            bounds = np.concatenate([[0], breaks, [len(timestamps)]])
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                if end - start < min_length:
+                    continue
+                step = max(1, window // 2)
+                firsts = list(range(start, max(start + 1, end - window + 1), step))
+                if firsts[-1] + window < end:
+                    # The stride left frames uncovered: add one more window ending at the run's end
+                    firsts.append(end - window)
+                for first in firsts:
+                    last = min(first + window, end)
+                    samples.append((landmarks[first:last].reshape(last - first, -1), timestamps[first:last], label))
+        return samples
+
+
+def _load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILENAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_landmark_dataset(training_root, cache_dir=None, workers=None, progress=None):
+    """Bring the landmark cache up to date and open it
+
+    Only sessions that are new or whose fingerprint changed are extracted,
+    in parallel across `workers` processes (defaults to every core);
+    cached sessions are copied from the previous arrays. The new arrays are
+    written under a fresh generation and the index is replaced last, so a
+    crash mid-build leaves the previous cache intact. `progress`, if given,
+    is called with (sessions done, sessions to extract).
+
+    Returns (LandmarkDataset, stats).
+    """
+    if not os.path.isdir(training_root):
+        raise FileNotFoundError(f"Training data directory not found: {training_root}")
+    cache_dir = cache_dir or os.path.join(training_root, CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    sources = list_sources(training_root)
+
+    previous = _load_index(cache_dir)
+    old = None
+    cached = {}
+    if previous is not None:
+        try:
+            old = LandmarkDataset(cache_dir)
+            cached = {entry["key"]: entry for entry in old.sequences}
+        except (OSError, ValueError, KeyError):
+            old = None
+
+    reused = {s["key"] for s in sources
+              if s["key"] in cached and cached[s["key"]]["fingerprint"] == s["fingerprint"]}
+    stale = [s for s in sources if s["key"] not in reused]
+
+    # Sessions whose landmarks were all stored at record time need no tracker
+    extracted = {}
+    needs_tracker = []
+    for source in stale:
+        if _needs_images(source):
+            needs_tracker.append(source)
+        else:
+            extracted[source["key"]] = _extract_source(source)
+    if needs_tracker:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            for source, result in zip(needs_tracker, executor.map(_extract_source, needs_tracker)):
+                extracted[source["key"]] = result
+                if progress is not None:
+                    progress(len(extracted), len(stale))
+
+    if not stale and old is not None and len(reused) == len(old.sequences):
+        return old, {"sessions": len(sources), "reused": len(reused), "extracted": 0}
+
+    total = sum(cached[s["key"]]["length"] if s["key"] in reused else len(extracted[s["key"]][0]) for s in sources)
+    generation = time.time_ns()
+    landmarks_path = os.path.join(cache_dir, f"landmarks-{generation}.npy")
+    timestamps_path = os.path.join(cache_dir, f"timestamps-{generation}.npy")
+    landmarks = np.lib.format.open_memmap(landmarks_path, mode='w+', dtype=np.float32,
+                                          shape=(total, NUM_LANDMARKS, LANDMARK_DIMS))
+    timestamps = np.lib.format.open_memmap(timestamps_path, mode='w+', dtype=np.float64, shape=(total,))
+
+    sequences = []
+    offset = 0
+    for source in sources:
+        if source["key"] in reused:
+            entry = cached[source["key"]]
+            window = slice(entry["offset"], entry["offset"] + entry["length"])
+            frames, times = old.landmarks[window], old.timestamps[window]
+        else:
+            times, frames = extracted[source["key"]]
+            frames = frames.reshape(-1, NUM_LANDMARKS, LANDMARK_DIMS)
+        landmarks[offset:offset + len(times)] = frames
+        timestamps[offset:offset + len(times)] = times
+        sequences.append({
+            "key": source["key"],
+            "gesture": source["gesture"],
+            "fingerprint": source["fingerprint"],
+            "offset": offset,
+            "length": len(times)
+        })
+        offset += len(times)
+    landmarks.flush()
+    timestamps.flush()
+    del landmarks, timestamps
+
+    index_path = os.path.join(cache_dir, INDEX_FILENAME)
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump({"generation": generation, "frames": total, "sequences": sequences}, f)
+    os.replace(index_path + '.tmp', index_path)
+
+    # Older generations are no longer referenced
+    for filename in os.listdir(cache_dir):
+        if filename.endswith('.npy') and str(generation) not in filename:
+            os.remove(os.path.join(cache_dir, filename))
+
+    return LandmarkDataset(cache_dir), {"sessions": len(sources), "reused": len(reused), "extracted": len(stale)}
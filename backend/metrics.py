@@ -0,0 +1,212 @@
+import bisect
+import functools
+import threading
+import time
+
+import numpy as np
+
+# Upper bounds (seconds) of the cumulative latency buckets exported to Prometheus
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Most recent samples per stage used for the rolling p50/p95/p99
+LATENCY_WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "isl_"
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a ring of the most recent samples
+
+    observe() is a bucket lookup and a ring write under a lock; the
+    percentiles are only computed when somebody reads them.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, window=LATENCY_WINDOW):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._ring = [0.0] * window
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._ring[self._next] = seconds
+            self._next = (self._next + 1) % len(self._ring)
+            self.count += 1
+            self.total += seconds
+
+    def snapshot(self):
+        """count, sum, cumulative (le, count) buckets and rolling quantiles (seconds)"""
+        with self._lock:
+            counts = list(self._counts)
+            recent = np.array(self._ring[:min(self.count, len(self._ring))])
+            count, total = self.count, self.total
+        cumulative = np.cumsum(counts).tolist()
+        return {
+            "count": count,
+            "sum": total,
+            "buckets": list(zip(self.buckets + (float('inf'),), cumulative)),
+            "quantiles": {q: float(np.quantile(recent, q)) if len(recent) else None for q in QUANTILES}
+        }
+
+
+class StageTimer:
+    """Context manager recording the time spent in its block under `stage`"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Per-stage latency histograms, counters and callback gauges
+
+    Stages and counters are created on first use, so instrumented modules
+    need no registration step. Gauges are functions evaluated at scrape
+    time (queue depths, session counts, ...).
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, window=LATENCY_WINDOW):
+        self.buckets = buckets
+        self.window = window
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(stage, LatencyHistogram(self.buckets, self.window))
+        return histogram
+
+    def timer(self, stage):
+        return StageTimer(self.histogram(stage))
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counter(self, name):
+        return self._counters.get(name, 0)
+
+    def reset(self):
+        """Drop all latency samples and counters; registered gauges are kept"""
+        with self._lock:
+            self._stages = {}
+            self._counters = {}
+
+    def gauge(self, name, description, fn):
+        """Register fn() -> number, read on every snapshot"""
+        self._gauges[name] = (description, fn)
+
+    def snapshot(self):
+        """JSON-serializable view: per-stage latency in ms, counters and gauges"""
+        with self._lock:
+            histograms = sorted(self._stages.items())
+        stages = {}
+        for stage, histogram in histograms:
+            data = histogram.snapshot()
+            stages[stage] = {
+                "count": data["count"],
+                "mean_ms": data["sum"] / data["count"] * 1000 if data["count"] else None
+            }
+            for q, value in data["quantiles"].items():
+                stages[stage][f"p{round(q * 100)}_ms"] = value * 1000 if value is not None else None
+        with self._lock:
+            counters = dict(self._counters)
+        return {"stages": stages, "counters": counters, "gauges": self._read_gauges()}
+
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC_PREFIX}stage_latency_seconds Time spent in each processing stage",
+            f"# TYPE {METRIC_PREFIX}stage_latency_seconds histogram"
+        ]
+        with self._lock:
+            histograms = sorted(self._stages.items())
+        rolling = []
+        for stage, histogram in histograms:
+            data = histogram.snapshot()
+            for bound, count in data["buckets"]:
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{METRIC_PREFIX}stage_latency_seconds_bucket{{stage="{stage}",le="{le}"}} {count}')
+            lines.append(f'{METRIC_PREFIX}stage_latency_seconds_sum{{stage="{stage}"}} {data["sum"]!r}')
+            lines.append(f'{METRIC_PREFIX}stage_latency_seconds_count{{stage="{stage}"}} {data["count"]}')
+            for q, value in data["quantiles"].items():
+                if value is not None:
+                    rolling.append(f'{METRIC_PREFIX}stage_latency_recent_seconds{{stage="{stage}",quantile="{q}"}} {value!r}')
+        if rolling:
+            lines.append(f"# HELP {METRIC_PREFIX}stage_latency_recent_seconds "
+                         f"Latency quantiles over the last {self.window} samples of each stage")
+            lines.append(f"# TYPE {METRIC_PREFIX}stage_latency_recent_seconds gauge")
+            lines.extend(rolling)
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+        for name, value in counters:
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+            lines.append(f"{METRIC_PREFIX}{name} {value}")
+
+        values = self._read_gauges()
+        for name, (description, _) in sorted(self._gauges.items()):
+            if values[name] is None:
+                continue
+            lines.append(f"# HELP {METRIC_PREFIX}{name} {description}")
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} gauge")
+            lines.append(f"{METRIC_PREFIX}{name} {values[name]!r}")
+        return "\n".join(lines) + "\n"
+
+    def _read_gauges(self):
+        values = {}
+        for name, (_, fn) in list(self._gauges.items()):
+            try:
+                values[name] = fn()
+            except Exception as e:
+                print(f"Error reading gauge {name}: {e}")
+                values[name] = None
+        return values
+
+
+# Process-wide registry used by the instrumented modules
+REGISTRY = MetricsRegistry()
+
+
+def timer(stage):
+    """Time a block: `with metrics.timer("mediapipe"): ...`"""
+    return REGISTRY.timer(stage)
+
+
+def observe(stage, seconds):
+    REGISTRY.observe(stage, seconds)
+
+
+def increment(name, amount=1):
+    REGISTRY.increment(name, amount)
+
+
+def timed(stage):
+    """Decorator timing every call of the wrapped function under `stage`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with REGISTRY.timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,77 +1,115 @@
 
-import cv2
 import numpy as np
 import mediapipe as mp
 import os
 import pickle
-import json
 import time
-from collections import deque
+import base64
+import threading
+import metrics
+from dynamic_gestures import predict_dynamic
+from feature_buffer import LandmarkFeatureBuffer
+from frame_gate import make_gate
+from frame_decode import to_rgb
+from sign_decoder import SignDecoder
+from model_backends import load_backend, top_k_predictions
 
 # MediaPipe solutions
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
-hands = None
 
 # Model variables
-model = None
+model = None  # A model_backends.ModelBackend once a trained static model is loaded
+# Static model files tried in order; ISL_STATIC_MODEL overrides the search
+STATIC_MODEL_PATHS = [
+    'static/models/isl_model.pkl',
+    'static/models/isl_model.onnx',
+    'static/models/isl_model.tflite'
+]
 labels = ["hello", "thank you", "please", "yes", "no", "good", "bad", "help", "sorry", "name"]
 
+# Set to a model_registry.ModelRegistry to serve versioned models with A/B routing
+model_registry = None
+
 # Dynamic gesture recognition
 dynamic_model = None
-gesture_history = deque(maxlen=30)  # Store last 30 frames for dynamic gesture recognition
-gesture_timestamps = deque(maxlen=30)  # Corresponding timestamps
-last_prediction_time = 0
+DYNAMIC_MODEL_PATH = 'static/models/dynamic_gesture_model.pkl'
+MAX_HISTORY_LENGTH = 30  # Store last 30 frames for dynamic gesture recognition
 MIN_SEQUENCE_LENGTH = 10  # Minimum number of frames for a valid dynamic gesture
 PREDICTION_COOLDOWN = 0.5  # Seconds between predictions to avoid overloading
+DYNAMIC_MIN_CONFIDENCE = 0.3  # A dynamic prediction below this leaves the frame to the static model
+DECODER_CANDIDATES = 5  # Candidates per frame fed to the session's SignDecoder
+
+# Hand landmark layout shared by MediaPipe and client-supplied payloads
+NUM_LANDMARKS = 21
+LANDMARK_DIMS = 3
+LANDMARK_PAYLOAD_BYTES = NUM_LANDMARKS * LANDMARK_DIMS * 4  # float32
 
 # Dynamic gesture labels (can be expanded)
 dynamic_labels = ["hello", "thank you", "please", "yes", "no"]
 
-def initialize_model():
-    """Initialize the MediaPipe hands model and load the classification models"""
-    global hands, model, dynamic_model
-    
-    # Initialize MediaPipe Hands
-    hands = mp_hands.Hands(
-        static_image_mode=False,
+def create_hands_tracker(static_image_mode=False):
+    """Create a MediaPipe Hands tracker (one per recognizer session)
+    
+    Video mode tracks the hand from frame to frame; static-image mode runs
+    detection on every image, for inputs that are not one continuous view.
+    """
+    return mp_hands.Hands(
+        static_image_mode=static_image_mode,
         max_num_hands=1,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5
     )
+
+def initialize_model():
+    """Load the classification models shared by all recognizer sessions"""
+    global model
     
     # Try to load trained static gesture model if it exists
-    model_path = 'static/models/isl_model.pkl'
-    if os.path.exists(model_path):
+    candidates = [os.environ['ISL_STATIC_MODEL']] if os.environ.get('ISL_STATIC_MODEL') else STATIC_MODEL_PATHS
+    model_path = next((path for path in candidates if os.path.exists(path)), None)
+    if model_path is not None:
         try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
-            print("Loaded trained static gesture model from", model_path)
+            model = load_backend(model_path)
+            print(f"Loaded trained static gesture model from {model_path} ({model.name} backend)")
         except Exception as e:
             print(f"Error loading static model: {e}")
             print("Using rule-based approach as fallback")
     else:
-        print("No trained static model found at", model_path)
+        print("No trained static model found at", ", ".join(candidates))
         print("Using rule-based approach")
     
     # Try to load dynamic gesture model if it exists
-    dynamic_model_path = 'static/models/dynamic_gesture_model.pkl'
-    if os.path.exists(dynamic_model_path):
+    if os.path.exists(DYNAMIC_MODEL_PATH):
         try:
-            with open(dynamic_model_path, 'rb') as f:
-                dynamic_model = pickle.load(f)
-            print("Loaded trained dynamic gesture model from", dynamic_model_path)
+            load_dynamic_model(DYNAMIC_MODEL_PATH)
+            print("Loaded trained dynamic gesture model from", DYNAMIC_MODEL_PATH)
         except Exception as e:
             print(f"Error loading dynamic model: {e}")
             print("Using rule-based approach for dynamic gestures")
 
-def extract_hand_landmarks(image):
-    """Extract hand landmarks from image using MediaPipe"""
-    # Convert the BGR image to RGB
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+def load_dynamic_model(model_path=DYNAMIC_MODEL_PATH):
+    """Load a dynamic gesture model and make it the live one
+    
+    The pickle is fully loaded before the module-level reference is
+    replaced, and sessions read that reference once per prediction, so a
+    swap never exposes a partially loaded model.
+    """
+    global dynamic_model
+    with open(model_path, 'rb') as f:
+        loaded = pickle.load(f)
+    dynamic_model = loaded
+    return loaded
+
+def extract_hand_landmarks(image, hands):
+    """Extract hand landmarks from image using the given MediaPipe tracker"""
+    # Convert the BGR image to RGB in this thread's reusable buffer
+    with metrics.timer("rgb_convert"):
+        image_rgb = to_rgb(image)
     
     # Process the image and extract hand landmarks
-    results = hands.process(image_rgb)
+    with metrics.timer("mediapipe"):
+        results = hands.process(image_rgb)
     
     landmarks = []
     if results.multi_hand_landmarks:
@@ -86,52 +124,76 @@ def extract_hand_landmarks(image):
     
     return np.zeros(21 * 3), False  # Return zeros if no hand detected
 
-def update_gesture_history(landmarks):
-    """Update the gesture history with new landmarks and timestamp"""
-    current_time = time.time()
-    gesture_history.append(landmarks)
-    gesture_timestamps.append(current_time)
+def parse_landmarks(payload):
+    """Convert a client landmark payload into a flat (63,) float array
+    
+    Accepts a list of 63 numbers, a 21x3 nested list, raw float32 bytes or a
+    base64 string of those bytes. Raises ValueError for anything else.
+    """
+    if isinstance(payload, str):
+        payload = base64.b64decode(payload)
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        if len(payload) != LANDMARK_PAYLOAD_BYTES:
+            raise ValueError(f"Expected {LANDMARK_PAYLOAD_BYTES} bytes of float32 landmarks, got {len(payload)}")
+        landmarks = np.frombuffer(payload, dtype='<f4')
+    else:
+        landmarks = np.asarray(payload, dtype=np.float32)
+    
+    if landmarks.size != NUM_LANDMARKS * LANDMARK_DIMS:
+        raise ValueError(f"Expected {NUM_LANDMARKS}x{LANDMARK_DIMS} landmarks, got {landmarks.size} values")
+    if not np.all(np.isfinite(landmarks)):
+        raise ValueError("Landmarks must be finite numbers")
+    
+    # Match the dtype extract_hand_landmarks produces
+    return landmarks.reshape(-1).astype(np.float64)
+
+# Order of the columns returned by hand_shape_features_batch
+SHAPE_FEATURE_NAMES = [
+    "thumb_dist", "index_dist", "middle_dist", "ring_dist", "pinky_dist",
+    "thumb_index_angle", "index_middle_angle", "middle_ring_angle", "ring_pinky_angle"
+]
+
+# Landmark indices used by the shape features
+WRIST_INDEX = 0
+FINGERTIP_INDICES = slice(4, 21, 4)  # thumb, index, middle, ring, pinky tips (4, 8, 12, 16, 20)
+
+def hand_shape_features_batch(landmarks):
+    """Shape features for a batch of hands
+    
+    Takes (N, 21, 3) or (N, 63) landmarks and returns an (N, 9) matrix with
+    columns ordered like SHAPE_FEATURE_NAMES: fingertip-to-wrist distances,
+    then angles in degrees (x, y only) between neighbouring fingertips as
+    seen from the wrist.
+    """
+    points = np.asarray(landmarks, dtype=np.float64).reshape(-1, NUM_LANDMARKS, LANDMARK_DIMS)
+    
+    # Fingertip vectors relative to the wrist: (N, 5, 3)
+    vectors = points[:, FINGERTIP_INDICES] - points[:, [WRIST_INDEX]]
+    squared = vectors * vectors
+    planar_sq = squared[:, :, 0] + squared[:, :, 1]
+    distances = np.sqrt(planar_sq + squared[:, :, 2])
+    
+    # Angles between neighbouring fingertips, using only x,y coordinates
+    x, y = vectors[:, :, 0], vectors[:, :, 1]
+    dot = x[:, :-1] * x[:, 1:] + y[:, :-1] * y[:, 1:]
+    magnitudes = np.sqrt(planar_sq[:, :-1] * planar_sq[:, 1:])
+    # A zero-length vector has no direction; report 0 degrees like angle_between
+    valid = magnitudes != 0
+    cos_angle = np.where(valid, dot / np.where(valid, magnitudes, 1.0), 1.0)
+    angles = np.degrees(np.arccos(np.minimum(np.maximum(cos_angle, -1.0), 1.0)))
+    
+    return np.concatenate([distances, angles], axis=1)
+
+def shape_feature_vector(landmarks):
+    """Hand shape features of one hand as an array ordered like SHAPE_FEATURE_NAMES"""
+    return hand_shape_features_batch(landmarks)[0]
 
 def get_hand_shape_features(landmarks):
     """Extract basic shape features from landmarks"""
     if len(landmarks) < 63:  # 21 landmarks x 3 coordinates
         return {}
     
-    # Reshape landmarks to get individual points
-    points = landmarks.reshape(-1, 3)
-    
-    # Calculate distances between fingertips and wrist
-    wrist = points[0]
-    thumb_tip = points[4]
-    index_tip = points[8]
-    middle_tip = points[12]
-    ring_tip = points[16]
-    pinky_tip = points[20]
-    
-    # Calculate Euclidean distances
-    thumb_dist = np.linalg.norm(thumb_tip - wrist)
-    index_dist = np.linalg.norm(index_tip - wrist)
-    middle_dist = np.linalg.norm(middle_tip - wrist)
-    ring_dist = np.linalg.norm(ring_tip - wrist)
-    pinky_dist = np.linalg.norm(pinky_tip - wrist)
-    
-    # Calculate angles between fingers
-    thumb_index_angle = angle_between(thumb_tip - wrist, index_tip - wrist)
-    index_middle_angle = angle_between(index_tip - wrist, middle_tip - wrist)
-    middle_ring_angle = angle_between(middle_tip - wrist, ring_tip - wrist)
-    ring_pinky_angle = angle_between(ring_tip - wrist, pinky_tip - wrist)
-    
-    return {
-        "thumb_dist": thumb_dist,
-        "index_dist": index_dist,
-        "middle_dist": middle_dist,
-        "ring_dist": ring_dist,
-        "pinky_dist": pinky_dist,
-        "thumb_index_angle": thumb_index_angle,
-        "index_middle_angle": index_middle_angle,
-        "middle_ring_angle": middle_ring_angle,
-        "ring_pinky_angle": ring_pinky_angle
-    }
+    return dict(zip(SHAPE_FEATURE_NAMES, shape_feature_vector(landmarks).tolist()))
 
 def angle_between(v1, v2):
     """Calculate angle between two vectors"""
@@ -152,161 +214,463 @@ def angle_between(v1, v2):
     angle = np.arccos(cos_angle)
     return np.degrees(angle)
 
+# Rule-based labels, checked in order; the first matching rule wins and the
+# last entry is the fallback when no rule matches
+RULE_LABELS = np.array(["hello", "yes", "good", "no", "unknown"], dtype=object)
+RULE_CONFIDENCES = np.array([0.7, 0.65, 0.7, 0.6, 0.3])
+
+# Finger bits (thumb, index, middle, ring, pinky) used to encode hand poses
+FINGER_BITS = 1 << np.arange(5)
+
+def _build_rule_table():
+    """Rule index for every (extended fingers, folded fingers) bitmask pair"""
+    thumb, index, middle, ring, pinky = FINGER_BITS
+    everything = int(FINGER_BITS.sum())
+    table = np.full((everything + 1, everything + 1), len(RULE_LABELS) - 1, dtype=np.intp)
+    for extended in range(everything + 1):
+        for folded in range(everything + 1):
+            rules = [
+                # All fingers extended (like in "hello" or "five")
+                extended == everything,
+                # Only index and middle fingers extended (like in "victory" or "peace")
+                extended & (index | middle) == (index | middle) and folded & (thumb | ring | pinky) == (thumb | ring | pinky),
+                # Only thumb extended (like in "good" or thumbs up)
+                extended & thumb and folded & (everything ^ thumb) == (everything ^ thumb),
+                # Fist (like in "no")
+                folded == everything,
+            ]
+            for rule, matched in enumerate(rules):
+                if matched:
+                    table[extended, folded] = rule
+                    break
+    return table
+
+RULE_TABLE = _build_rule_table()
+
+def rule_based_classification_batch(features):
+    """Rule-based labels for an (N, 9) shape feature matrix
+    
+    Returns (labels, confidences) arrays of length N. Each hand is reduced
+    to bitmasks of extended and folded fingers and looked up in RULE_TABLE.
+    These are simplified examples - real signs have more complex patterns.
+    """
+    distances = np.asarray(features, dtype=np.float64).reshape(-1, len(SHAPE_FEATURE_NAMES))[:, :5]
+    extended = (distances > 0.2) @ FINGER_BITS
+    folded = (distances < 0.15) @ FINGER_BITS
+    rule = RULE_TABLE[extended, folded]
+    return RULE_LABELS[rule], RULE_CONFIDENCES[rule]
+
 def rule_based_classification(features):
-    """Simple rule-based classification for common signs"""
-    # These are simplified examples - real signs have more complex patterns
-    
-    # Check if all fingers are extended (like in "hello" or "five")
-    if (features["thumb_dist"] > 0.2 and 
-        features["index_dist"] > 0.2 and 
-        features["middle_dist"] > 0.2 and 
-        features["ring_dist"] > 0.2 and 
-        features["pinky_dist"] > 0.2):
-        return "hello", 0.7
-    
-    # Check if only index and middle fingers are extended (like in "victory" or "peace")
-    if (features["index_dist"] > 0.2 and 
-        features["middle_dist"] > 0.2 and 
-        features["thumb_dist"] < 0.15 and 
-        features["ring_dist"] < 0.15 and 
-        features["pinky_dist"] < 0.15):
-        return "yes", 0.65
-    
-    # Check if only thumb is extended (like in "good" or thumbs up)
-    if (features["thumb_dist"] > 0.2 and 
-        features["index_dist"] < 0.15 and 
-        features["middle_dist"] < 0.15 and 
-        features["ring_dist"] < 0.15 and 
-        features["pinky_dist"] < 0.15):
-        return "good", 0.7
-    
-    # Check if fist is made (like in "no")
-    if (features["thumb_dist"] < 0.15 and 
-        features["index_dist"] < 0.15 and 
-        features["middle_dist"] < 0.15 and 
-        features["ring_dist"] < 0.15 and 
-        features["pinky_dist"] < 0.15):
-        return "no", 0.6
-    
-    # Default fallback
-    return "unknown", 0.3
+    """Simple rule-based classification for common signs
+    
+    Accepts the get_hand_shape_features dict or a shape feature vector.
+    """
+    if isinstance(features, dict):
+        features = [features[name] for name in SHAPE_FEATURE_NAMES]
+    labels, confidences = rule_based_classification_batch(features)
+    return labels[0], float(confidences[0])
 
-def predict_dynamic_gesture():
-    """Predict dynamic gesture from gesture history"""
-    global last_prediction_time
-    
-    # Check if we have enough frames for prediction
-    if len(gesture_history) < MIN_SEQUENCE_LENGTH:
-        return None, 0
-    
-    current_time = time.time()
-    
-    # Check if we should make a prediction (based on cooldown)
-    if current_time - last_prediction_time < PREDICTION_COOLDOWN:
-        return None, 0
-    
-    # Check if sequence spans at least 0.5 seconds
-    if gesture_timestamps[-1] - gesture_timestamps[0] < 0.5:
-        return None, 0
-    
-    last_prediction_time = current_time
-    
-    # If we have a trained model, use it
-    if dynamic_model is not None:
-        try:
-            # Prepare gesture sequence for prediction
-            # (This would require preprocessing the gesture_history to match the model's input format)
-            # For example, resampling the sequence to a fixed length and normalizing
-            
-            # For this example, we'll use a placeholder
-            # In a real implementation, this would be model.predict() on the processed sequence
-            prediction = "hello"  # Placeholder
-            confidence = 0.75     # Placeholder
-            
-            return prediction, confidence
-        except Exception as e:
-            print(f"Error in dynamic model prediction: {e}")
-    
-    # If no model or prediction failed, use rule-based approach
-    # In a real implementation, this would analyze the motion patterns in gesture_history
-    # For now, we'll return a mock result based on sequence length
-    
-    # Simple mock logic for demonstration
-    sequence_length = len(gesture_history)
-    if sequence_length > 25:
-        return "thank you", 0.7
-    elif sequence_length > 20:
-        return "hello", 0.6
-    elif sequence_length > 15:
-        return "please", 0.6
-    else:
-        return "unknown", 0.4
+def select_model(kind, session_id):
+    """(model, registry version) serving `session_id` for kind "static" or "dynamic"
+    
+    Without a registry this is the module-level model and version is None.
+    """
+    if model_registry is not None:
+        version = model_registry.select(kind, session_id)
+        if version is not None:
+            return version.model, version
+    return (model if kind == "static" else dynamic_model), None
 
-def predict_sign(image):
-    """Predict sign from image"""
-    global gesture_history, gesture_timestamps
-    
-    # Extract hand landmarks
-    landmarks, hand_detected = extract_hand_landmarks(image)
-    
-    if not hand_detected:
-        return "No hand detected", 0.0
-    
-    # Update gesture history for dynamic recognition
-    update_gesture_history(landmarks)
-    
-    # Extract features
-    features = get_hand_shape_features(landmarks)
-    
-    # Check for dynamic gesture predictions periodically
-    dynamic_sign, dynamic_confidence = predict_dynamic_gesture()
-    if dynamic_sign and dynamic_confidence > 0.5:
-        return dynamic_sign, dynamic_confidence
-    
+def classify_static_candidates(landmarks, features=None, top_k=1, static_model=None):
+    """Most likely static signs for one hand shape, best first
+    
+    Runs the trained model once and derives the label, confidence and any
+    runner-up candidates from its probability vector. Without a model the
+    rule-based label is the only candidate. `features` may be a precomputed
+    shape feature vector (or dict) for the frame; `static_model` overrides
+    the module-level model.
+    """
+    static_model = model if static_model is None else static_model
     # If we have a trained model for static gestures, use it
-    if model is not None:
+    if static_model is not None:
         try:
-            # Prepare features for model prediction
-            X = np.array([landmarks])  # Use raw landmarks for ML model
-            
-            # Get prediction
-            prediction = model.predict(X)[0]
-            probabilities = model.predict_proba(X)[0]
-            confidence = probabilities.max()
-            
-            return prediction, float(confidence)
+            # Use raw landmarks for ML model
+            X = np.asarray(landmarks, dtype=np.float32).reshape(1, -1)
+            probabilities = static_model.predict_proba(X)[0]
+            return top_k_predictions(probabilities, static_model.classes_, top_k)
         except Exception as e:
             print(f"Error in model prediction: {e}")
             print("Falling back to rule-based classification")
     
     # Use rule-based approach as fallback
-    return rule_based_classification(features)
+    if features is None:
+        features = shape_feature_vector(landmarks)
+    label, confidence = rule_based_classification(features)
+    return [{"sign": label, "confidence": confidence}]
 
-def clear_gesture_history():
-    """Clear the gesture history"""
-    global gesture_history, gesture_timestamps
-    gesture_history.clear()
-    gesture_timestamps.clear()
+def classify_static_batch(landmarks, top_k=1, static_model=None):
+    """Most likely static signs for every row of an (N, 63) landmark matrix
+    
+    Returns one candidate list per row, each as classify_static_candidates
+    would return it for that frame. The trained model is evaluated once on
+    the stacked matrix, which is much cheaper per sample than N single-row
+    calls; rows are fed as float32 like the per-frame path, so both see the
+    same inputs.
+    """
+    static_model = model if static_model is None else static_model
+    landmarks = np.asarray(landmarks).reshape(-1, NUM_LANDMARKS * LANDMARK_DIMS)
+    if static_model is not None:
+        try:
+            probabilities = static_model.predict_proba(landmarks.astype(np.float32))  # one inference for the batch
+            return [top_k_predictions(row, static_model.classes_, top_k) for row in probabilities]
+        except Exception as e:
+            print(f"Error in batch model prediction: {e}")
+            print("Falling back to rule-based classification")
+    
+    labels, confidences = rule_based_classification_batch(hand_shape_features_batch(landmarks))
+    return [[{"sign": label, "confidence": float(confidence)}] for label, confidence in zip(labels, confidences)]
 
-def train_dynamic_gesture_model(training_data_path):
-    """Train a model for dynamic gesture recognition"""
-    # This function would be called with training data to build a dynamic gesture model
-    # The implementation depends on the structure of your training data
+class RecognizerSession:
+    """Recognition state for a single client stream
+    
+    Each session owns its MediaPipe tracker, its landmark history and its
+    dynamic-prediction cooldown clock, so concurrent webcam clients never
+    share temporal state. Use `lock` to serialize frames of the same session.
+    """
+    
+    def __init__(self, session_id, gating="off"):
+        self.session_id = session_id
+        self._hands = None
+        self._crop_hands = None
+        # Optional frame gate (see frame_gate.GATING_PRESETS) that skips or crops MediaPipe work
+        self.gate = make_gate(gating)
+        # Landmark history with per-frame features computed once on append
+        self.history = LandmarkFeatureBuffer(
+            MAX_HISTORY_LENGTH,
+            shape_features=shape_feature_vector,
+            num_shape_features=len(SHAPE_FEATURE_NAMES)
+        )
+        self.last_prediction_time = float('-inf')
+        # Smoothed, segmented sign stream built from the per-frame predictions
+        self.decoder = SignDecoder()
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+        self.lock = threading.Lock()
+    
+    def touch(self):
+        """Mark the session as active now"""
+        self.last_seen = time.time()
+    
+    @property
+    def hands(self):
+        """MediaPipe tracker, created on first use so landmark-only clients never pay for one"""
+        if self._hands is None:
+            self._hands = create_hands_tracker()
+        return self._hands
+    
+    @property
+    def crop_hands(self):
+        """Static-image tracker for the frame gate's crops, created on first use
+        
+        Crops move whenever the gate re-centers them, so they go through their
+        own detector and the video-mode tracker only ever sees full frames.
+        """
+        if self._crop_hands is None:
+            self._crop_hands = create_hands_tracker(static_image_mode=True)
+        return self._crop_hands
+    
+    def extract_hand_landmarks(self, image):
+        """Extract hand landmarks with this session's tracker
+        
+        With a frame gate, still frames reuse the previous landmarks and
+        inference may only run on a crop around the hand; landmarks are
+        always in full-frame normalized coordinates.
+        """
+        with metrics.timer("landmarks"):
+            if self.gate is None:
+                return extract_hand_landmarks(image, self.hands)
+            return self.gate.extract(image, lambda frame: extract_hand_landmarks(frame, self.hands),
+                                     lambda crop: extract_hand_landmarks(crop, self.crop_hands))
+    
+    @property
+    def gesture_history(self):
+        """Landmarks in the history window, oldest first (a view, not a copy)"""
+        return self.history.landmarks()
+    
+    @property
+    def gesture_timestamps(self):
+        """Timestamps matching gesture_history"""
+        return self.history.timestamps()
+    
+    def update_gesture_history(self, landmarks, timestamp=None):
+        """Update the gesture history with new landmarks and timestamp (default: now)
+        
+        Returns the frame's shape features (see LandmarkFeatureBuffer).
+        """
+        return self.history.append(landmarks, time.time() if timestamp is None else timestamp)
+    
+    def gesture_sequence_info(self):
+        """Describe the current gesture sequence, or None if it is too short"""
+        if len(self.history) < 2:
+            return None
+        duration = self.history.duration()
+        # Only report sequences that span at least 0.5 seconds
+        if duration <= 0.5:
+            return None
+        return {
+            "duration": duration,
+            "frame_count": len(self.gesture_history)
+        }
+    
+    def predict_dynamic_gesture(self, now=None):
+        """Predict dynamic gesture from gesture history; `now` is the current frame's time"""
+        # Check if we have enough frames for prediction
+        if len(self.history) < MIN_SEQUENCE_LENGTH:
+            return None, 0
+        
+        current_time = time.time() if now is None else now
+        
+        # Check if we should make a prediction (based on cooldown)
+        if current_time - self.last_prediction_time < PREDICTION_COOLDOWN:
+            return None, 0
+        
+        # Check if sequence spans at least 0.5 seconds
+        if self.history.duration() < 0.5:
+            return None, 0
+        
+        self.last_prediction_time = current_time
+        
+        # Without a trained sequence model there is no dynamic prediction;
+        # the caller falls back to static classification
+        current_model, version = select_model("dynamic", self.session_id)
+        if current_model is None:
+            return None, 0
+        
+        try:
+            # The model resamples the time-stamped history to a fixed length and normalizes it
+            start = time.perf_counter()
+            sign, confidence = predict_dynamic(current_model, self.history.landmarks(), self.history.timestamps())
+            elapsed = time.perf_counter() - start
+            metrics.observe("dynamic_model", elapsed)
+            if version is not None:
+                version.observe(elapsed, confidence)
+            return sign, confidence
+        except Exception as e:
+            print(f"Error in dynamic model prediction: {e}")
+            return None, 0
     
-    # In a real implementation, you would:
-    # 1. Load training sequences
-    # 2. Preprocess sequences (normalize, resample, etc.)
-    # 3. Train a sequence model (e.g., LSTM, 1D-CNN)
-    # 4. Save the model to disk
+    def predict_sign(self, image):
+        """Predict sign from image"""
+        # Extract hand landmarks
+        landmarks, hand_detected = self.extract_hand_landmarks(image)
+        
+        return self.predict_sign_from_landmarks(landmarks, hand_detected)
     
+    def predict_sign_from_landmarks(self, landmarks, hand_detected):
+        """Predict sign from landmarks already extracted for the current frame
+        
+        Callers that need the landmarks themselves (e.g. for debug info) should
+        run extract_hand_landmarks once and pass the result here, so MediaPipe
+        only sees each frame a single time.
+        """
+        candidates = self._predict_candidates(landmarks, hand_detected, top_k=1)
+        return candidates[0]["sign"], candidates[0]["confidence"]
+    
+    def _predict_candidates(self, landmarks, hand_detected, top_k, timestamp=None, static_candidates=None):
+        """Candidates for one frame; `static_candidates` are precomputed static results (batch path)"""
+        if not hand_detected:
+            return [{"sign": "No hand detected", "confidence": 0.0}]
+        
+        # Update gesture history for dynamic recognition; the buffer computes
+        # this frame's shape features once and we reuse them below
+        with metrics.timer("features"):
+            features = self.update_gesture_history(landmarks, timestamp)
+        
+        # Check for dynamic gesture predictions periodically
+        dynamic_sign, dynamic_confidence = self.predict_dynamic_gesture(timestamp)
+        if dynamic_sign and dynamic_confidence >= DYNAMIC_MIN_CONFIDENCE:
+            return [{"sign": dynamic_sign, "confidence": dynamic_confidence}]
+        if static_candidates is not None:
+            return static_candidates[:top_k]
+        
+        static_model, version = select_model("static", self.session_id)
+        start = time.perf_counter()
+        candidates = classify_static_candidates(landmarks, features, top_k, static_model)
+        elapsed = time.perf_counter() - start
+        metrics.observe("static_model", elapsed)
+        if version is not None:
+            version.observe(elapsed, candidates[0]["confidence"])
+        return candidates
+    
+    def process_frame(self, image, top_k=0):
+        """Run the full single-pass pipeline on one decoded BGR frame
+        
+        Holds the session lock for the whole frame so MediaPipe tracking and
+        the gesture history always advance together.
+        """
+        with self.lock:
+            # Extract hand landmarks once; prediction and history reuse them
+            landmarks, hand_detected = self.extract_hand_landmarks(image)
+            return self._describe_prediction(landmarks, hand_detected, top_k)
+    
+    def process_landmarks(self, landmarks, hand_detected=True, top_k=0):
+        """Run the pipeline on landmarks computed elsewhere (e.g. in the browser)
+        
+        Skips image decoding and MediaPipe entirely; the landmarks go straight
+        into the gesture history and classification.
+        """
+        with self.lock:
+            if landmarks is None:
+                landmarks, hand_detected = np.zeros(NUM_LANDMARKS * LANDMARK_DIMS), False
+            return self._describe_prediction(landmarks, hand_detected, top_k)
+    
+    def _describe_prediction(self, landmarks, hand_detected, top_k=0):
+        with metrics.timer("predict"):
+            candidates = self._predict_candidates(landmarks, hand_detected, max(top_k, DECODER_CANDIDATES))
+        with metrics.timer("decode_signs"):
+            decoded = self.decoder.update(candidates if hand_detected else None, time.time())
+        metrics.increment("frames_total")
+        if hand_detected:
+            metrics.increment("frames_hand_detected_total")
+        predicted_sign, confidence = candidates[0]["sign"], candidates[0]["confidence"]
+        
+        # Add debug info about landmarks
+        hand_info = {}
+        if hand_detected:
+            # Get some basic hand information for debugging
+            points = landmarks.reshape(-1, 3)
+            hand_info = {
+                "num_landmarks": len(points),
+                "thumb_tip": points[4].tolist() if len(points) > 4 else None,
+                "index_tip": points[8].tolist() if len(points) > 8 else None,
+                "history_length": len(self.history)
+            }
+        
+        result = {
+            "sign": predicted_sign,
+            "confidence": confidence,
+            "hand_detected": hand_detected,
+            "hand_info": hand_info,
+            # Check for gesture sequence based on recent history
+            "gesture_sequence": self.gesture_sequence_info(),
+            # Debounced sign, start/end events from this frame and the running sentence
+            "decoded": decoded
+        }
+        if top_k > 0:
+            result["candidates"] = candidates[:top_k]
+        return result
+    
+    def decode_recorded_frame(self, landmarks, hand_detected, timestamp, static_candidates):
+        """Feed one frame of a recording through the live pipeline
+        
+        Same candidates and decoder update as _describe_prediction, but on
+        the recording's clock and with the frame's static candidates already
+        computed by classify_static_batch. Returns (candidates, decoded).
+        """
+        candidates = self._predict_candidates(landmarks, hand_detected, DECODER_CANDIDATES,
+                                              timestamp, static_candidates)
+        decoded = self.decoder.update(candidates if hand_detected else None, timestamp)
+        return candidates, decoded
+    
+    def clear_gesture_history(self):
+        """Clear the gesture history and the decoded sentence"""
+        self.history.clear()
+        self.decoder.reset()
+    
+    def close(self):
+        """Release the MediaPipe trackers; a later frame lazily creates new ones"""
+        try:
+            # Wait for any in-flight frame before tearing the trackers down
+            with self.lock:
+                trackers = (self._hands, self._crop_hands)
+                self._hands = self._crop_hands = None
+                for hands in trackers:
+                    if hands is not None:
+                        hands.close()
+        except Exception as e:
+            print(f"Error closing session {self.session_id}: {e}")
+
+def train_dynamic_gesture_model(training_data_path, model_path=DYNAMIC_MODEL_PATH, workers=None, progress=None,
+                                validation_fraction=0.2):
+    """Train a DTW template model for dynamic gesture recognition
+    
+    Landmarks are extracted from the recorded sessions once and cached
+    (see landmark_dataset); re-training only processes new or changed
+    sessions. Accuracy is measured on held-out sessions before the final
+    model is fitted on all of them, and the held-out distances to each
+    sample's own gesture set the model's rejection threshold. `progress`, if given, is called with
+    (stage, done, total). Returns a summary dict, or False when there is
+    not enough data.
+    """
+    # Imported here: landmark_dataset itself depends on this module
+    from landmark_dataset import build_landmark_dataset
+    from dynamic_gestures import DTWGestureMatcher, calibrate_reject_distance
+    
+    report = progress or (lambda stage, done, total: None)
     print(f"Training dynamic gesture model with data from {training_data_path}")
-    print("This is a placeholder - implement actual training with real data")
-    
-    # For demonstration, we'll create a dummy model
-    dummy_model = {"type": "dynamic_gesture_classifier"}
-    
-    # Save dummy model
-    with open('static/models/dynamic_gesture_model.pkl', 'wb') as f:
-        pickle.dump(dummy_model, f)
-    
-    return True
+    start = time.time()
+    dataset, cache_stats = build_landmark_dataset(
+        training_data_path, workers=workers,
+        progress=lambda done, total: report("extracting", done, total)
+    )
+    window = {"window": MAX_HISTORY_LENGTH, "min_length": MIN_SEQUENCE_LENGTH}
+    samples = dataset.training_sequences(**window)
+    labels_seen = sorted({label for _, _, label in samples})
+    if len(labels_seen) < 2:
+        print("Need recorded sequences of at least two gestures to train")
+        return False
+    
+    def fit(fit_samples):
+        return DTWGestureMatcher.from_sequences(
+            [(frames, timestamps) for frames, timestamps, _ in fit_samples],
+            [label for _, _, label in fit_samples]
+        )
+    
+    validation_accuracy = None
+    reject_distance = None
+    train_sessions, validation_sessions = dataset.split_sessions(validation_fraction)
+    validation_samples = dataset.training_sequences(sessions=validation_sessions, **window)
+    train_samples = dataset.training_sequences(sessions=train_sessions, **window)
+    if validation_samples and train_samples:
+        report("validating", 0, len(validation_samples))
+        holdout_model = fit(train_samples)
+        correct = 0
+        distances = []
+        for i, (frames, timestamps, label) in enumerate(validation_samples):
+            predicted, _ = holdout_model.predict_sequence(frames, timestamps)
+            correct += int(predicted == label)
+            distances.append(holdout_model.label_distance(frames, timestamps, label))
+            report("validating", i + 1, len(validation_samples))
+        validation_accuracy = correct / len(validation_samples)
+        reject_distance = calibrate_reject_distance(distances)
+    
+    report("fitting", 0, 1)
+    matcher = fit(samples)
+    # Unseen performances of a known gesture should not be rejected; without a
+    # validation split the in-sample calibration from from_sequences is kept
+    if reject_distance is not None:
+        matcher.reject_distance = reject_distance
+    
+    # Write to a temporary file first so a reader never sees a partial pickle
+    report("saving", 0, 1)
+    os.makedirs(os.path.dirname(model_path) or '.', exist_ok=True)
+    temp_path = f"{model_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(matcher, f)
+    os.replace(temp_path, model_path)
+    
+    summary = {
+        "model_path": model_path,
+        "labels": labels_seen,
+        "samples": len(samples),
+        "templates": len(matcher.templates),
+        "sessions": cache_stats["sessions"],
+        "sessions_extracted": cache_stats["extracted"],
+        "frames": int(len(dataset.landmarks)),
+        "validation_samples": len(validation_samples),
+        "validation_accuracy": validation_accuracy,
+        "reject_distance": matcher.reject_distance,
+        "training_time": time.time() - start
+    }
+    print(f"Trained dynamic gesture model: {summary}")
+    return summary
@@ -0,0 +1,153 @@
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+
+class ModelBackend:
+    """Common interface for static gesture classifiers
+
+    Subclasses implement _predict_proba(X) for an (N, 63) float32 matrix and
+    return (N, C) class probabilities ordered like `classes_`. Every call is
+    timed so each backend reports its own inference latency.
+    """
+
+    name = "base"
+
+    def __init__(self, classes, source=None):
+        self.classes_ = np.asarray(classes)
+        self.source = source
+        self._stats_lock = threading.Lock()
+        self.inference_count = 0
+        self.sample_count = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+
+    def predict_proba(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        start = time.perf_counter()
+        probabilities = self._predict_proba(X)
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.inference_count += 1
+            self.sample_count += len(X)
+            self.total_latency += elapsed
+            self.last_latency = elapsed
+        return probabilities
+
+    def _predict_proba(self, X):
+        raise NotImplementedError
+
+    def latency_stats(self):
+        """Per-inference latency summary for this backend"""
+        with self._stats_lock:
+            count = self.inference_count
+            return {
+                "backend": self.name,
+                "source": self.source,
+                "num_classes": len(self.classes_),
+                "inferences": count,
+                "samples": self.sample_count,
+                "mean_latency_ms": self.total_latency / count * 1000 if count else 0.0,
+                "last_latency_ms": self.last_latency * 1000
+            }
+
+
+class SklearnBackend(ModelBackend):
+    """Pickled scikit-learn classifier (anything with predict_proba)"""
+
+    name = "sklearn"
+
+    def __init__(self, estimator, source=None):
+        super().__init__(estimator.classes_, source)
+        self.estimator = estimator
+
+    def _predict_proba(self, X):
+        return self.estimator.predict_proba(X)
+
+
+class OnnxBackend(ModelBackend):
+    """ONNX Runtime session, e.g. a classifier exported with skl2onnx"""
+
+    name = "onnx"
+
+    def __init__(self, path, classes):
+        import onnxruntime as ort
+        super().__init__(classes, path)
+        self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        outputs = [output.name for output in self.session.get_outputs()]
+        # skl2onnx emits (label, probabilities); prefer the probability output
+        probability_outputs = [name for name in outputs if 'prob' in name.lower()]
+        self.output_name = probability_outputs[0] if probability_outputs else outputs[-1]
+
+    def _predict_proba(self, X):
+        result = self.session.run([self.output_name], {self.input_name: X})[0]
+        if isinstance(result, list):
+            # ZipMap output: one {class: probability} dict per row
+            return np.array([[row[c] for c in self.classes_] for row in result], dtype=np.float32)
+        return np.asarray(result)
+
+
+class TFLiteBackend(ModelBackend):
+    """TensorFlow Lite interpreter with a softmax output"""
+
+    name = "tflite"
+
+    def __init__(self, path, classes):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite.python.interpreter import Interpreter
+        super().__init__(classes, path)
+        self.interpreter = Interpreter(model_path=path)
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        self._batch_size = None
+        # The interpreter holds mutable tensors; serialize invocations
+        self._lock = threading.Lock()
+
+    def _predict_proba(self, X):
+        with self._lock:
+            if self._batch_size != len(X):
+                self.interpreter.resize_tensor_input(self.input_index, list(X.shape))
+                self.interpreter.allocate_tensors()
+                self._batch_size = len(X)
+            self.interpreter.set_tensor(self.input_index, X)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self.output_index).copy()
+
+
+def read_class_labels(model_path):
+    """Class labels for formats that do not embed them: <model>.labels.json"""
+    labels_path = os.path.splitext(model_path)[0] + '.labels.json'
+    with open(labels_path, 'r') as f:
+        return json.load(f)
+
+
+def load_backend(model_path):
+    """Load a static gesture model, choosing the backend from the file extension"""
+    extension = os.path.splitext(model_path)[1].lower()
+    if extension == '.pkl':
+        with open(model_path, 'rb') as f:
+            estimator = pickle.load(f)
+        if isinstance(estimator, ModelBackend):
+            return estimator
+        return SklearnBackend(estimator, model_path)
+    if extension == '.onnx':
+        return OnnxBackend(model_path, read_class_labels(model_path))
+    if extension == '.tflite':
+        return TFLiteBackend(model_path, read_class_labels(model_path))
+    raise ValueError(f"Unsupported model format: {model_path}")
+
+
+def top_k_predictions(probabilities, classes, k):
+    """The k most likely classes of one probability vector, best first"""
+    k = max(1, min(k, len(probabilities)))
+    best = np.argpartition(probabilities, -k)[-k:]
+    best = best[np.argsort(probabilities[best])[::-1]]
+    return [{"sign": classes[i].item() if hasattr(classes[i], 'item') else classes[i],
+             "confidence": float(probabilities[i])} for i in best]
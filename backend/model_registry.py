@@ -0,0 +1,254 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+import ml_utils
+from dynamic_gestures import predict_dynamic
+from model_backends import load_backend
+
+STATIC = "static"
+DYNAMIC = "dynamic"
+KINDS = (STATIC, DYNAMIC)
+# Latency samples kept per version for percentiles
+LATENCY_WINDOW = 1000
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class ModelVersion:
+    """One loaded model file plus the traffic metrics it has served"""
+
+    def __init__(self, kind, path, model, digest):
+        self.kind = kind
+        self.path = path
+        self.model = model
+        self.digest = digest
+        self.version = f"{os.path.basename(path)}@{digest[:8]}"
+        self.loaded_at = time.time()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.predictions = 0
+        self.total_confidence = 0.0
+
+    def observe(self, latency, confidence):
+        with self._lock:
+            self.predictions += 1
+            self.total_confidence += confidence
+            self._latencies.append(latency)
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            count = self.predictions
+            return {
+                "version": self.version,
+                "path": self.path,
+                "model_type": getattr(self.model, 'name', type(self.model).__name__),
+                "loaded_at": self.loaded_at,
+                "predictions": count,
+                "mean_confidence": self.total_confidence / count if count else None,
+                "p50_latency_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p95_latency_ms": float(np.percentile(latencies, 95)) if len(latencies) else None
+            }
+
+
+def warm_up(kind, model):
+    """Run one inference on synthetic input; raises if the model is unusable
+
+    Also pays any lazy initialization cost (allocations, JIT, thread pools)
+    before the model sees live traffic.
+    """
+    rng = np.random.default_rng(0)
+    if kind == STATIC:
+        X = rng.random((2, ml_utils.NUM_LANDMARKS * ml_utils.LANDMARK_DIMS), dtype=np.float32)
+        probabilities = np.asarray(model.predict_proba(X))
+        if probabilities.shape != (2, len(model.classes_)) or not np.all(np.isfinite(probabilities)):
+            raise ValueError(f"Static model returned probabilities of shape {probabilities.shape}")
+    else:
+        frames = rng.random((ml_utils.MAX_HISTORY_LENGTH, ml_utils.NUM_LANDMARKS * ml_utils.LANDMARK_DIMS))
+        timestamps = np.linspace(0.0, 1.0, len(frames))
+        label, confidence = predict_dynamic(model, frames, timestamps)
+        if label is None or not np.isfinite(confidence):
+            raise ValueError("Dynamic model produced no prediction")
+
+
+class ModelRegistry:
+    """Versioned static and dynamic models with hot reload and A/B routing
+
+    For each kind there is a primary version and optionally a candidate
+    that receives a fixed fraction of sessions (chosen by a stable hash of
+    the session id, so a session always talks to the same version). New
+    files are loaded, warmed up and validated off the request path; only
+    then is the route swapped, by replacing a single tuple reference, so a
+    request sees either the old or the new model, never a partial one. The
+    primary is mirrored into ml_utils.model / ml_utils.dynamic_model for
+    code paths that do not route per session (batch transcription).
+
+    A watcher thread polls the canonical model files every `watch_interval`
+    seconds; reload() does the same on demand.
+    """
+
+    def __init__(self, models_dir, watch_interval=5.0):
+        self.models_dir = models_dir
+        self.watch_interval = watch_interval
+        self._routes = {kind: (None, None, 0.0) for kind in KINDS}  # (primary, candidate, fraction)
+        self._fingerprints = {}  # path -> (size, mtime) last seen
+        self._load_lock = threading.Lock()
+        self.last_error = {kind: None for kind in KINDS}
+        self._thread = None
+
+    # Canonical files: the ones initialize_model() loads at startup
+
+    def canonical_path(self, kind):
+        if kind == DYNAMIC:
+            return ml_utils.DYNAMIC_MODEL_PATH
+        if os.environ.get('ISL_STATIC_MODEL'):
+            return os.environ['ISL_STATIC_MODEL']
+        return next((path for path in ml_utils.STATIC_MODEL_PATHS if os.path.exists(path)), None)
+
+    def adopt_current(self):
+        """Register the models initialize_model() already loaded as primaries"""
+        for kind, current in ((STATIC, ml_utils.model), (DYNAMIC, ml_utils.dynamic_model)):
+            path = self.canonical_path(kind)
+            if current is None or path is None or not os.path.exists(path):
+                continue
+            self._fingerprints[path] = file_fingerprint(path)
+            self._routes[kind] = (ModelVersion(kind, path, current, file_digest(path)), None, 0.0)
+
+    def load(self, kind, path, as_path=None):
+        """Load, warm up and validate a model file; returns its ModelVersion
+
+        `as_path` is where the file will live once it is renamed into place.
+        """
+        fingerprint = file_fingerprint(path)
+        digest = file_digest(path)
+        if kind == STATIC:
+            model = load_backend(path)
+        else:
+            with open(path, 'rb') as f:
+                model = pickle.load(f)
+        warm_up(kind, model)
+        version = ModelVersion(kind, as_path or path, model, digest)
+        self._fingerprints[path] = fingerprint
+        return version
+
+    def _set_route(self, kind, primary, candidate, fraction):
+        self._routes[kind] = (primary, candidate, fraction)
+        mirrored = primary.model if primary is not None else None
+        if kind == STATIC:
+            ml_utils.model = mirrored
+        else:
+            ml_utils.dynamic_model = mirrored
+
+    def promote_file(self, kind, path, as_path=None):
+        """Make the model at `path` the primary for `kind`"""
+        with self._load_lock:
+            primary, candidate, fraction = self._routes[kind]
+            if primary is not None and primary.digest == file_digest(path):
+                # Same content under a new mtime (e.g. a training job renaming its output)
+                self._fingerprints[path] = file_fingerprint(path)
+                return primary
+            try:
+                version = self.load(kind, path, as_path)
+            except Exception as e:
+                self.last_error[kind] = f"{os.path.basename(path)}: {e}"
+                raise
+            self.last_error[kind] = None
+            self._set_route(kind, version, candidate, fraction)
+            print(f"Serving {kind} model {version.version}")
+            return version
+
+    def reload(self):
+        """Load any canonical model file that changed since it was last seen"""
+        changed = {}
+        for kind in KINDS:
+            path = self.canonical_path(kind)
+            if path is None or not os.path.exists(path):
+                continue
+            if self._fingerprints.get(path) == file_fingerprint(path):
+                continue
+            previous = self._routes[kind][0]
+            try:
+                version = self.promote_file(kind, path)
+                if version is not previous:
+                    changed[kind] = version.version
+            except Exception as e:
+                print(f"Rejected {kind} model {path}: {e}")
+                # Remember the broken file so it is not retried until it changes again
+                self._fingerprints[path] = file_fingerprint(path)
+                changed[kind] = None
+        return changed
+
+    def set_candidate(self, kind, filename, fraction):
+        """Route `fraction` of sessions to the model file `filename` in models_dir"""
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        path = os.path.join(self.models_dir, os.path.basename(filename))
+        with self._load_lock:
+            version = self.load(kind, path)
+            primary, _, _ = self._routes[kind]
+            self._set_route(kind, primary, version, fraction)
+        return version
+
+    def clear_candidate(self, kind):
+        with self._load_lock:
+            primary, _, _ = self._routes[kind]
+            self._set_route(kind, primary, None, 0.0)
+
+    def promote_candidate(self, kind):
+        """Make the candidate the primary and end the split"""
+        with self._load_lock:
+            _, candidate, _ = self._routes[kind]
+            if candidate is None:
+                raise ValueError(f"No {kind} candidate to promote")
+            self._set_route(kind, candidate, None, 0.0)
+        return candidate
+
+    def select(self, kind, session_id):
+        """ModelVersion serving `session_id`, or None when no model is loaded"""
+        primary, candidate, fraction = self._routes[kind]
+        if candidate is not None and fraction > 0:
+            bucket = zlib.crc32(str(session_id).encode('utf-8')) % 10000
+            if bucket < fraction * 10000:
+                return candidate
+        return primary
+
+    def describe(self):
+        description = {}
+        for kind in KINDS:
+            primary, candidate, fraction = self._routes[kind]
+            description[kind] = {
+                "primary": primary.stats() if primary is not None else None,
+                "candidate": candidate.stats() if candidate is not None else None,
+                "candidate_fraction": fraction,
+                "last_error": self.last_error[kind]
+            }
+        return description
+
+    def start_watching(self):
+        """Poll the canonical model files from a daemon thread"""
+        def run():
+            while True:
+                time.sleep(self.watch_interval)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"Error reloading models: {e}")
+
+        self._thread = threading.Thread(target=run, name="model-watcher", daemon=True)
+        self._thread.start()
+        return self._thread
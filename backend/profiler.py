@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Bounds for one capture requested over the API
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL = 0.001
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a capture is requested while another one is running"""
+
+
+def _stack(frame):
+    """Collapsed stack for a frame, outermost call first"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the Python stacks of live threads
+
+    The capturing thread wakes every `interval` seconds and records the
+    current stack of every other thread (sys._current_frames), so the
+    profiled code runs unmodified and the cost is paid by the sampler. Output
+    is in collapsed-stack format ("thread;outer;...;inner count" per line),
+    ready for flamegraph.pl or speedscope. Time spent inside native code
+    (MediaPipe, OpenCV) is attributed to the Python call that entered it.
+    Only one capture runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def capture(self, seconds, interval=0.005, thread_prefix=None):
+        """Sample for `seconds`; returns (collapsed stacks text, number of samples)
+
+        `thread_prefix` restricts sampling to threads whose name starts with
+        it, e.g. "frame-worker" for the MediaPipe pool.
+        """
+        seconds = min(max(seconds, 0.0), MAX_PROFILE_SECONDS)
+        interval = max(interval, MIN_SAMPLE_INTERVAL)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile capture is already running")
+        try:
+            return self._sample(seconds, interval, thread_prefix)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds, interval, thread_prefix):
+        stacks = Counter()
+        samples = 0
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id, str(thread_id))
+                if thread_id == own_id or (thread_prefix and not name.startswith(thread_prefix)):
+                    continue
+                stacks[f"{name};{_stack(frame)}"] += 1
+            samples += 1
+            time.sleep(interval)
+        text = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        return text + "\n" if text else "", samples
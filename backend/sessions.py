@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+from ml_utils import RecognizerSession
+
+DEFAULT_SESSION_ID = "default"
+
+
+class SessionRegistry:
+    """Registry of live recognizer sessions keyed by client session id
+
+    Sessions idle for longer than `idle_ttl` seconds are evicted, and at most
+    `max_sessions` are kept alive; when the cap is reached the least recently
+    used session is closed to make room for a new one.
+    """
+
+    def __init__(self, max_sessions=64, idle_ttl=300.0, session_factory=RecognizerSession):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.session_factory = session_factory
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id=None):
+        """Return the session for `session_id`, creating it if needed"""
+        session_id = str(session_id or DEFAULT_SESSION_ID)
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_expired(time.time()))
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            else:
+                while len(self._sessions) >= self.max_sessions:
+                    _, oldest = self._sessions.popitem(last=False)
+                    evicted.append(oldest)
+                session = self.session_factory(session_id)
+                self._sessions[session_id] = session
+            session.touch()
+        # Close trackers outside the registry lock; MediaPipe teardown can be slow
+        for old in evicted:
+            old.close()
+        return session
+
+    def peek(self, session_id=None):
+        """Return an existing session without creating or touching it"""
+        with self._lock:
+            return self._sessions.get(str(session_id or DEFAULT_SESSION_ID))
+
+    def remove(self, session_id):
+        """Close and forget a session; returns True if it existed"""
+        with self._lock:
+            session = self._sessions.pop(str(session_id), None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def evict_expired(self):
+        """Close every session idle for longer than the TTL"""
+        with self._lock:
+            expired = self._pop_expired(time.time())
+        for session in expired:
+            session.close()
+        return len(expired)
+
+    def _pop_expired(self, now):
+        # Sessions are kept in LRU order, so expired ones are at the front
+        expired = []
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen <= self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            expired.append(session)
+        return expired
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,139 @@
+import numpy as np
+
+# Per-frame labels that mean "no sign is being made"
+BLANK_LABELS = {"No hand detected", "unknown"}
+
+# Defaults for SignDecoder
+STAY_PROBABILITY = 0.9   # HMM prior that the next frame shows the same sign
+MIN_CONFIDENCE = 0.6     # Smoothed probability a sign needs before it is emitted
+MIN_DURATION = 0.25      # Seconds a sign must lead before it is emitted
+OBSERVATION_FLOOR = 0.02  # Lower bound on any state's per-frame likelihood
+MAX_SENTENCE_WORDS = 50
+
+
+class SignDecoder:
+    """Streaming smoother and segmenter for one session's per-frame predictions
+
+    Each frame's candidates (sign, confidence) are treated as the
+    observation likelihoods of a "sticky" HMM over every sign seen so far
+    plus a blank state (no hand / unknown). The forward recursion keeps a
+    belief over the states, so a one-frame flicker barely moves it while a
+    sign held for a few frames takes over. A sign is emitted once it has
+    led the belief with at least `min_confidence` for `min_duration`
+    seconds; it then stays current until another state does the same.
+
+    update() reports the current sign, the events this frame produced
+    ({"type": "start" | "end", "sign", "start_time", ...}) and the
+    accumulated sentence, plus whether any of that changed, so callers can
+    forward changes instead of every frame.
+    """
+
+    def __init__(self, stay_probability=STAY_PROBABILITY, min_confidence=MIN_CONFIDENCE,
+                 min_duration=MIN_DURATION, floor=OBSERVATION_FLOOR, max_words=MAX_SENTENCE_WORDS):
+        self.stay_probability = stay_probability
+        self.min_confidence = min_confidence
+        self.min_duration = min_duration
+        self.floor = floor
+        self.max_words = max_words
+        self._labels = [None]  # state 0 is blank
+        self._index = {None: 0}
+        self.reset()
+
+    def reset(self):
+        """Forget the belief, the open segment and the sentence"""
+        self._belief = np.ones(len(self._labels)) / len(self._labels)
+        self._current = 0
+        self._leader = 0
+        self._leader_since = None
+        self._segment = None
+        self.sentence = []
+
+    def _state(self, label):
+        index = self._index.get(label)
+        if index is None:
+            index = self._index[label] = len(self._labels)
+            self._labels.append(label)
+            self._belief = np.append(self._belief, 0.0)
+        return index
+
+    def _observation(self, candidates):
+        """Per-state likelihoods for one frame; None candidates means no hand"""
+        observation = np.zeros(len(self._labels))
+        if not candidates:
+            observation[0] = 1.0
+        else:
+            for candidate in candidates:
+                label = None if candidate["sign"] in BLANK_LABELS else candidate["sign"]
+                index = self._state(label)
+                if index >= len(observation):
+                    observation = np.append(observation, np.zeros(index + 1 - len(observation)))
+                observation[index] += float(candidate["confidence"])
+            # Probability the candidates leave unassigned is shared by the other states
+            unassigned = max(0.0, 1.0 - observation.sum())
+            others = observation == 0
+            if others.any():
+                observation[others] = unassigned / others.sum()
+        return np.maximum(observation, self.floor)
+
+    def update(self, candidates, timestamp):
+        """Feed one frame's candidates (best first; None or [] when no hand) at `timestamp` seconds"""
+        observation = self._observation(candidates)
+        states = len(self._labels)
+        prior = self.stay_probability * self._belief + (1 - self.stay_probability) / states
+        belief = prior * observation
+        self._belief = belief / belief.sum()
+
+        events = []
+        leader = int(self._belief.argmax())
+        if leader != self._leader:
+            self._leader = leader
+            self._leader_since = timestamp
+        if (leader != self._current and self._belief[leader] >= self.min_confidence and
+                timestamp - self._leader_since >= self.min_duration):
+            events.extend(self._switch(leader, self._leader_since))
+        if self._segment is not None:
+            self._segment["frame_count"] += 1
+            self._segment["confidence_sum"] += float(self._belief[self._current])
+            self._segment["end_time"] = timestamp
+
+        return {
+            "sign": self._labels[self._current],
+            "confidence": float(self._belief[self._current]),
+            "events": events,
+            "sentence": " ".join(self.sentence),
+            "changed": bool(events)
+        }
+
+    def flush(self, timestamp):
+        """Close the open segment (e.g. when the stream ends); returns its end event, if any"""
+        events = self._switch(0, timestamp) if self._current != 0 else []
+        self._leader, self._leader_since = 0, timestamp
+        return events
+
+    def _switch(self, state, timestamp):
+        events = []
+        if self._segment is not None:
+            events.append(self._end_event(timestamp))
+            self._segment = None
+        self._current = state
+        if state != 0:
+            sign = self._labels[state]
+            self._segment = {"sign": sign, "start_time": timestamp, "end_time": timestamp,
+                             "frame_count": 0, "confidence_sum": 0.0}
+            self.sentence.append(sign)
+            del self.sentence[:-self.max_words]
+            events.append({"type": "start", "sign": sign, "start_time": timestamp,
+                           "confidence": float(self._belief[state])})
+        return events
+
+    def _end_event(self, timestamp):
+        segment = self._segment
+        count = segment["frame_count"]
+        return {
+            "type": "end",
+            "sign": segment["sign"],
+            "start_time": segment["start_time"],
+            "end_time": timestamp,
+            "frame_count": count,
+            "confidence": segment["confidence_sum"] / count if count else 0.0
+        }
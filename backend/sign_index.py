@@ -0,0 +1,267 @@
+import bisect
+import hashlib
+import json
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Suffixes stripped by stem(), longest first
+SUFFIXES = ("ingly", "edly", "ness", "ment", "ing", "ies", "ied", "ers", "est", "ful", "ly", "ed", "es", "er", "s")
+MIN_STEM_LENGTH = 3
+# Shortest dictionary word that may match as the prefix of a longer input word
+MIN_PARTIAL_LENGTH = 3
+
+_END = "$"  # Trie key marking the end of a sign name
+
+
+def tokenize(text):
+    """Lowercase words of `text`, dropping punctuation"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Cheap suffix-stripping stemmer: helping -> help, thanks -> thank"""
+    if token.endswith("'s"):
+        token = token[:-2]
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            stemmed = token[:-len(suffix)]
+            if suffix in ("ies", "ied"):
+                stemmed += "y"
+            # Undo consonant doubling: stopped -> stopp -> stop
+            elif len(stemmed) > MIN_STEM_LENGTH and stemmed[-1] == stemmed[-2] and stemmed[-1] not in "aeiouls":
+                stemmed = stemmed[:-1]
+            return stemmed
+    return token
+
+
+class SignIndex:
+    """Lookup structure mapping free text to dictionary signs
+
+    Sign names are tokenized into two tries, one over normalized tokens and
+    one over their stems, so multi-word entries like "thank you" match as a
+    unit. Translation walks the text once, taking the longest exact phrase
+    at each position, then the longest stemmed phrase, then a prefix
+    ("partial") match of a single word. Each step is bounded by the longest
+    phrase in the dictionary, so lookup is linear in the input length and
+    independent of dictionary size.
+    """
+
+    def __init__(self, signs=None):
+        self._exact = {}
+        self._stemmed = {}
+        self._paths = {}
+        # Partial matches are single-word entries: count them by their first
+        # MIN_PARTIAL_LENGTH letters so most unknown words are rejected with
+        # one lookup, and never try prefixes longer than the longest word
+        self._stubs = {}
+        self._longest_word = 0
+        self._lock = threading.Lock()
+        for name, image_path in (signs or {}).items():
+            self.add(name, image_path)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def add(self, name, image_path):
+        """Insert or update one sign; cost is proportional to the name length"""
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        with self._lock:
+            if name not in self._paths and len(tokens) == 1:
+                self._count_word(tokens[0], 1)
+            self._paths[name] = image_path
+            self._insert(self._exact, tokens, name)
+            self._insert(self._stemmed, [stem(token) for token in tokens], name)
+
+    def remove(self, name):
+        """Drop one sign from the index"""
+        tokens = tokenize(name)
+        with self._lock:
+            if self._paths.pop(name, None) is not None and len(tokens) == 1:
+                self._count_word(tokens[0], -1)
+            self._delete(self._exact, tokens, name)
+            self._delete(self._stemmed, [stem(token) for token in tokens], name)
+
+    def _count_word(self, word, delta):
+        stub = word[:MIN_PARTIAL_LENGTH]
+        count = self._stubs.get(stub, 0) + delta
+        if count > 0:
+            self._stubs[stub] = count
+        else:
+            self._stubs.pop(stub, None)
+        self._longest_word = max(self._longest_word, len(word))
+
+    @staticmethod
+    def _insert(trie, tokens, name):
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # Keep the first name registered for a key (e.g. "thank-you" vs "thank you")
+        node.setdefault(_END, name)
+
+    @staticmethod
+    def _delete(trie, tokens, name):
+        node = trie
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return
+        if node.get(_END) == name:
+            del node[_END]
+
+    @staticmethod
+    def _longest_match(node, tokens, start):
+        """(sign name, tokens consumed) of the longest phrase through `node`
+
+        `node` is the trie node already reached by tokens[start], so callers
+        only pay for the call when the first word is in the dictionary.
+        """
+        best = (node[_END], 1) if _END in node else (None, 0)
+        for position in range(start + 1, len(tokens)):
+            node = node.get(tokens[position])
+            if node is None:
+                break
+            if _END in node:
+                best = (node[_END], position - start + 1)
+        return best
+
+    def _partial_match(self, token):
+        """Dictionary word that is the longest prefix of `token`, if any"""
+        if token[:MIN_PARTIAL_LENGTH] not in self._stubs:
+            return None
+        exact = self._exact
+        for end in range(min(len(token) - 1, self._longest_word), MIN_PARTIAL_LENGTH - 1, -1):
+            node = exact.get(token[:end])
+            if node is not None and _END in node:
+                return node[_END]
+        return None
+
+    def translate(self, text):
+        """Translate text into signs using greedy longest-match tokenization"""
+        tokens = tokenize(text)
+        stems = [stem(token) for token in tokens]
+        exact, stemmed, paths = self._exact, self._stemmed, self._paths
+        signs = []
+        unmatched = []
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            name, length, match_type = None, 0, "exact"
+            node = exact.get(token)
+            if node is not None:
+                name, length = self._longest_match(node, tokens, position)
+            node = stemmed.get(stems[position])
+            if node is not None:
+                stemmed_name, stemmed_length = self._longest_match(node, stems, position)
+                if stemmed_length > length:
+                    name, length, match_type = stemmed_name, stemmed_length, "stemmed"
+            if name is None:
+                name = self._partial_match(token)
+                length, match_type = 1, "partial"
+
+            if name is None:
+                unmatched.append(token)
+                position += 1
+                continue
+
+            signs.append({
+                "sign": name,
+                "image_path": paths[name],
+                "match_type": match_type,
+                "original": token if length == 1 else " ".join(tokens[position:position + length])
+            })
+            position += length
+
+        return {"signs": signs, "unmatched_words": unmatched}
+
+
+class DictionaryListing:
+    """Sorted, cached view of the sign dictionary for /api/isl-dictionary
+
+    Names are kept in a sorted list so prefix search and pagination are a
+    bisect plus a slice. The full JSON listing is serialized once per
+    dictionary version and reused until the next add() or remove(); its
+    content hash doubles as the ETag base, so every worker serving the same
+    dictionary hands out the same tag.
+    """
+
+    def __init__(self, signs=None):
+        self._paths = dict(signs or {})
+        self._names = sorted(self._paths)
+        self._lock = threading.Lock()
+        self.version = 0
+        self._body = None
+        self._digest = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name, image_path):
+        with self._lock:
+            if name not in self._paths:
+                bisect.insort(self._names, name)
+            self._paths[name] = image_path
+            self._invalidate()
+
+    def add_many(self, signs):
+        """Insert or update many (name, image_path) pairs with a single re-sort"""
+        signs = dict(signs)
+        with self._lock:
+            added = [name for name in signs if name not in self._paths]
+            self._paths.update(signs)
+            if len(added) < 64:
+                for name in added:
+                    bisect.insort(self._names, name)
+            else:
+                self._names = sorted(self._paths)
+            self._invalidate()
+
+    def remove(self, name):
+        with self._lock:
+            if self._paths.pop(name, None) is not None:
+                del self._names[bisect.bisect_left(self._names, name)]
+                self._invalidate()
+
+    def _invalidate(self):
+        self.version += 1
+        self._body = None
+        self._digest = None
+
+    def _entry(self, name):
+        return {"name": name, "image_path": self._paths[name]}
+
+    def full(self):
+        """(JSON bytes, digest) of the complete listing, serialized at most once per version"""
+        with self._lock:
+            if self._body is None:
+                signs = [self._entry(name) for name in self._names]
+                self._body = json.dumps({"signs": signs, "total": len(signs)}).encode('utf-8')
+                self._digest = hashlib.sha1(self._body).hexdigest()[:16]
+            return self._body, self._digest
+
+    def etag(self, query=""):
+        """Entity tag for the listing, or for one page/search of it"""
+        _, digest = self.full()
+        if not query:
+            return digest
+        return f"{digest}-{zlib.crc32(query.encode('utf-8')):08x}"
+
+    def page(self, offset=0, limit=None, prefix=""):
+        """One slice of the names starting with `prefix`, in sorted order"""
+        with self._lock:
+            start = bisect.bisect_left(self._names, prefix)
+            end = bisect.bisect_right(self._names, prefix + "\U0010ffff") if prefix else len(self._names)
+            first = min(start + offset, end)
+            last = end if limit is None else min(first + limit, end)
+            return {
+                "signs": [self._entry(name) for name in self._names[first:last]],
+                "total": end - start,
+                "offset": offset,
+                "limit": limit
+            }
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SignStore:
+    """Durable sign dictionary backed by SQLite
+
+    Each insert is a single-row upsert in its own transaction, so adding a
+    sign costs O(1) instead of rewriting the whole dictionary, and SQLite's
+    journal keeps the file consistent when writers race or the process dies
+    mid-write. The database runs in WAL mode: readers never block writers,
+    and compact() checkpoints the log back into the main file.
+
+    On first use the store imports the legacy JSON dictionary (or the given
+    defaults), so existing installations keep their signs.
+    """
+
+    def __init__(self, path, legacy_json_path=None, defaults=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes_since_compaction = 0
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signs ("
+            " name TEXT PRIMARY KEY,"
+            " image_path TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        if self.count() == 0:
+            self._seed(legacy_json_path, defaults)
+
+    def _seed(self, legacy_json_path, defaults):
+        signs = None
+        if legacy_json_path and os.path.exists(legacy_json_path):
+            try:
+                with open(legacy_json_path, 'r') as file:
+                    signs = json.load(file)
+                print(f"Imported {len(signs)} signs from {legacy_json_path}")
+            except Exception as e:
+                print(f"Error loading signs data: {e}")
+        if signs is None:
+            signs = defaults or {}
+        self.put_many(signs.items())
+
+    def version(self):
+        """Counter that changes whenever another connection (e.g. another worker) commits
+
+        This connection's own writes do not change it (SQLite's data_version).
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signs").fetchone()[0]
+
+    def load(self):
+        """All signs as a {name: image_path} dict"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT name, image_path FROM signs"))
+
+    def put(self, name, image_path):
+        """Insert or replace one sign"""
+        self.put_many([(name, image_path)])
+
+    def put_many(self, items):
+        """Insert or replace many (name, image_path) pairs in one transaction"""
+        now = time.time()
+        rows = [(name, image_path, now) for name, image_path in items]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO signs (name, image_path, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET image_path = excluded.image_path, "
+                    "updated_at = excluded.updated_at",
+                    rows
+                )
+            self._writes_since_compaction += len(rows)
+        return len(rows)
+
+    def remove(self, name):
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute("DELETE FROM signs WHERE name = ?", (name,)).rowcount
+            self._writes_since_compaction += deleted
+        return bool(deleted)
+
+    def compact(self, vacuum=False):
+        """Fold the write-ahead log into the database file and truncate it
+
+        VACUUM additionally rebuilds the file to reclaim space from deleted
+        or replaced rows; it rewrites the whole database, so it is opt-in.
+        Returns False when nothing was written since the last compaction.
+        """
+        with self._lock:
+            if not self._writes_since_compaction and not vacuum:
+                return False
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if vacuum:
+                self._conn.execute("VACUUM")
+            self._writes_since_compaction = 0
+        return True
+
+    def start_compaction(self, interval):
+        """Compact every `interval` seconds from a daemon thread"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.compact()
+                except sqlite3.Error as e:
+                    print(f"Error compacting sign store: {e}")
+
+        thread = threading.Thread(target=run, name="sign-store-compaction", daemon=True)
+        thread.start()
+        return thread
+
+    def export_json(self, path):
+        """Write the dictionary as JSON, atomically replacing `path`"""
+        signs = self.load()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(signs, file, indent=2)
+        os.replace(temp_path, path)
+        return len(signs)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
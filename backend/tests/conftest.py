@@ -0,0 +1,7 @@
+"""Puts the backend on sys.path so tests import modules the way the app does"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,57 @@
+import pickle
+
+import numpy as np
+
+from dynamic_gestures import DTWGestureMatcher, DEFAULT_COMPONENTS, prepare_sequence
+
+
+def training_sequences(seed=0, labels=4, per_label=4, frames=24):
+    rng = np.random.default_rng(seed)
+    sequences, names = [], []
+    for label in range(labels):
+        base = rng.normal(size=(1, 63))
+        for _ in range(per_label):
+            walk = base + np.cumsum(rng.normal(scale=0.05, size=(frames, 63)), axis=0)
+            sequences.append((walk, np.arange(frames) / 30.0))
+            names.append(f"gesture-{label}")
+    return sequences, names
+
+
+def old_format_pickle(sequences, names):
+    """A matcher pickled before PCA projection and calibrated rejection existed"""
+    raw = DTWGestureMatcher.from_sequences(sequences, names, components=None)
+    old = DTWGestureMatcher.__new__(DTWGestureMatcher)
+    old.__dict__.update(templates=raw.templates, labels=raw.labels, length=raw.length, radius=raw.radius)
+    return pickle.dumps(old)
+
+
+def test_unpickles_matcher_without_projection():
+    sequences, names = training_sequences()
+    matcher = pickle.loads(old_format_pickle(sequences, names))
+
+    assert matcher.projection.shape == (63, DEFAULT_COMPONENTS)
+    assert matcher.templates.shape[-1] == DEFAULT_COMPONENTS
+    assert matcher.reject_distance is not None
+    for (frames, timestamps), name in zip(sequences, names):
+        label, confidence = matcher.predict_sequence(frames, timestamps)
+        assert label == name
+        assert 0.0 <= confidence <= 1.0
+
+
+def test_unpickled_old_matcher_matches_raw_templates():
+    sequences, names = training_sequences(seed=1)
+    matcher = pickle.loads(old_format_pickle(sequences, names))
+    raw = DTWGestureMatcher.from_sequences(sequences, names, components=None)
+    query = prepare_sequence(*sequences[0])
+
+    assert matcher.predict_prepared(query)[0] == raw.predict_prepared(query)[0]
+
+
+def test_pickle_round_trip_keeps_projection():
+    sequences, names = training_sequences(seed=2)
+    matcher = DTWGestureMatcher.from_sequences(sequences, names)
+    loaded = pickle.loads(pickle.dumps(matcher))
+
+    np.testing.assert_array_equal(loaded.projection, matcher.projection)
+    np.testing.assert_array_equal(loaded.templates, matcher.templates)
+    assert loaded.reject_distance == matcher.reject_distance
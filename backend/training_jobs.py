@@ -0,0 +1,165 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+# Native thread pools read these when the training process imports numpy
+THREAD_LIMIT_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+# Finished jobs kept for the status endpoint
+MAX_FINISHED_JOBS = 50
+
+
+def _training_process(training_data_path, model_path, cpu_budget, niceness):
+    """Body of the training subprocess; writes one JSON event per line to stdout"""
+    if niceness and hasattr(os, 'nice'):
+        os.nice(niceness)
+    events = sys.stdout
+    # Training logs go to stderr so stdout carries only events
+    sys.stdout = sys.stderr
+
+    def emit(*event):
+        events.write(json.dumps(event) + "\n")
+        events.flush()
+
+    try:
+        from ml_utils import train_dynamic_gesture_model
+        summary = train_dynamic_gesture_model(
+            training_data_path, model_path=model_path, workers=cpu_budget,
+            progress=lambda stage, done, total: emit("progress", stage, done, total)
+        )
+        if summary:
+            emit("done", summary)
+        else:
+            emit("error", "Not enough training data: record at least two gestures")
+    except Exception as e:
+        emit("error", f"{type(e).__name__}: {e}")
+
+
+class TrainingJobManager:
+    """Runs dynamic-model training jobs one at a time in a child process
+
+    submit() returns a job id immediately. Jobs run in order, each in a
+    fresh Python process limited to `cpu_budget` extraction workers and
+    native threads and started at lower priority, so serving keeps its
+    cores. Progress events stream back over the child's stdout. When a job
+    succeeds, `on_model_ready(model_path)` is called in this process with
+    the newly written model, which is where it gets hot-swapped in; only
+    then does the file replace the persisted model.
+    """
+
+    def __init__(self, cpu_budget=1, on_model_ready=None, niceness=10):
+        self.cpu_budget = max(1, cpu_budget)
+        self.on_model_ready = on_model_ready
+        self.niceness = niceness
+        self._jobs = OrderedDict()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._dispatch, name="training-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, training_data_path, model_path):
+        """Queue a training run; returns its job id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "training_data_path": training_data_path,
+                "stage": None,
+                "progress": 0.0,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "metrics": None,
+                "error": None
+            }
+            self._pending.append((job_id, training_data_path, model_path))
+            self._prune()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of one job's state, or None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list(self):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("succeeded", "failed")]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _dispatch(self):
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                if not self._pending:
+                    self._wakeup.clear()
+                    continue
+                job = self._pending.popleft()
+            try:
+                self._run(*job)
+            except Exception as e:
+                print(f"Error running training job {job[0]}: {str(e)}")
+                self._update(job[0], status="failed", error=str(e), finished_at=time.time())
+
+    def _run(self, job_id, training_data_path, model_path):
+        # Train into a job-specific file; it only replaces the live model once loaded successfully
+        job_model_path = f"{model_path}.{job_id}"
+        env = dict(os.environ)
+        env.update({variable: str(self.cpu_budget) for variable in THREAD_LIMIT_VARIABLES})
+        command = [sys.executable, os.path.abspath(__file__), training_data_path, job_model_path, str(self.cpu_budget),
+                   str(self.niceness)]
+        self._update(job_id, status="running", started_at=time.time())
+
+        outcome = None
+        try:
+            # A fresh interpreter: nothing from the serving process (threads, trackers) is inherited
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, env=env, text=True)
+            for line in process.stdout:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event[0] == "progress":
+                    _, stage, done, total = event
+                    self._update(job_id, stage=stage, progress=done / total if total else 0.0)
+                else:
+                    outcome = event
+            process.wait()
+        except OSError as e:
+            outcome = ["error", f"Could not start training process: {e}"]
+        if outcome is None:
+            outcome = ["error", f"Training process exited with code {process.returncode}"]
+
+        if outcome[0] == "done":
+            metrics = outcome[1]
+            try:
+                if self.on_model_ready is not None:
+                    self.on_model_ready(job_model_path)
+                os.replace(job_model_path, model_path)
+                metrics["model_path"] = model_path
+                self._update(job_id, status="succeeded", stage="done", progress=1.0,
+                             metrics=metrics, finished_at=time.time())
+                return
+            except Exception as e:
+                outcome = ["error", f"Loading trained model failed: {e}"]
+        if os.path.exists(job_model_path):
+            os.remove(job_model_path)
+        self._update(job_id, status="failed", error=outcome[1], finished_at=time.time())
+
+if __name__ == '__main__':
+    _training_process(sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
@@ -0,0 +1,254 @@
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from frame_decode import decode_frame, DEFAULT_MAX_WIDTH
+from ml_utils import RecognizerSession, NUM_LANDMARKS, LANDMARK_DIMS
+
+SHARD_EXTENSION = '.islrec'
+SHARD_MAGIC = b'ISLREC1\n'
+# Per-frame record header: timestamp (s), flags, JPEG length
+RECORD_HEADER = struct.Struct('<dBI')
+FLAG_LANDMARKS = 1  # 21 x 3 float32 landmarks follow the header
+FLAG_HAND = 2       # A hand was detected in the frame
+LANDMARK_BYTES = NUM_LANDMARKS * LANDMARK_DIMS * 4
+
+SAFE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class RecorderBusyError(Exception):
+    """Raised when the recorder queue is full and the frame cannot be accepted"""
+
+
+def safe_name(name):
+    """File-system-safe version of a gesture name or session id"""
+    name = SAFE_NAME_PATTERN.sub('_', str(name).strip()).strip('.')
+    return name or '_'
+
+
+def shard_path(root, gesture_name, session_id):
+    return os.path.join(root, safe_name(gesture_name), safe_name(session_id) + SHARD_EXTENSION)
+
+
+def encode_record(timestamp, image_bytes, landmarks=None, hand_detected=False):
+    """Serialize one frame: header, optional float32 landmarks, JPEG bytes"""
+    flags = 0
+    parts = []
+    if landmarks is not None:
+        flags |= FLAG_LANDMARKS
+        parts.append(np.asarray(landmarks, dtype='<f4').reshape(-1).tobytes())
+        if hand_detected:
+            flags |= FLAG_HAND
+    header = RECORD_HEADER.pack(float(timestamp), flags, len(image_bytes))
+    return b''.join([header] + parts + [image_bytes])
+
+
+def iter_shard(path, load_images=True):
+    """Yield (timestamp, landmarks or None, hand_detected, JPEG bytes or None) per frame
+
+    A shard is read front to back in one pass; with load_images=False the
+    JPEG payloads are skipped with a seek. A torn final record (from a crash
+    mid-write) ends the iteration instead of raising.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(SHARD_MAGIC)) != SHARD_MAGIC:
+            raise ValueError(f"Not a training data shard: {path}")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            timestamp, flags, image_length = RECORD_HEADER.unpack(header)
+            landmarks = None
+            if flags & FLAG_LANDMARKS:
+                raw = f.read(LANDMARK_BYTES)
+                if len(raw) < LANDMARK_BYTES:
+                    return
+                landmarks = np.frombuffer(raw, dtype='<f4')
+            if load_images:
+                image = f.read(image_length)
+                if len(image) < image_length:
+                    return
+            else:
+                image = None
+                f.seek(image_length, os.SEEK_CUR)
+            yield timestamp, landmarks, bool(flags & FLAG_HAND), image
+
+
+def read_shard(path, load_images=True):
+    """Load one recorded session
+
+    Returns a dict with timestamps (n,), landmarks (n, 63) float32 with NaN
+    rows where none were stored, hand_detected (n,) and, when requested,
+    the list of JPEG payloads.
+    """
+    timestamps, landmarks, detected, images = [], [], [], []
+    missing = np.full(NUM_LANDMARKS * LANDMARK_DIMS, np.nan, dtype=np.float32)
+    for timestamp, frame_landmarks, hand, image in iter_shard(path, load_images):
+        timestamps.append(timestamp)
+        landmarks.append(missing if frame_landmarks is None else frame_landmarks)
+        detected.append(hand)
+        images.append(image)
+    count = len(timestamps)
+    return {
+        "timestamps": np.array(timestamps, dtype=np.float64),
+        "landmarks": np.array(landmarks, dtype=np.float32).reshape(count, -1),
+        "hand_detected": np.array(detected, dtype=bool),
+        "images": images if load_images else None
+    }
+
+
+def list_shards(root):
+    """[(gesture, session, path)] for every recorded session under `root`"""
+    shards = []
+    if not os.path.isdir(root):
+        return shards
+    for gesture in sorted(os.listdir(root)):
+        gesture_dir = os.path.join(root, gesture)
+        if not os.path.isdir(gesture_dir):
+            continue
+        for filename in sorted(os.listdir(gesture_dir)):
+            if filename.endswith(SHARD_EXTENSION):
+                session = filename[:-len(SHARD_EXTENSION)]
+                shards.append((gesture, session, os.path.join(gesture_dir, filename)))
+    return shards
+
+
+class TrainingRecorder:
+    """Background writer appending recorded frames to one shard per session
+
+    record() only enqueues; a single writer thread drains the queue in
+    batches, appends each frame to `<root>/<gesture>/<session>.islrec` and
+    flushes once per batch, so request latency never depends on the disk.
+    Shard files stay open between batches (at most `max_open_files`, least
+    recently used closed first) and are closed after `idle_timeout` seconds.
+
+    Frames recorded without client-supplied landmarks can optionally have
+    them extracted by the writer (`extract_landmarks`), using one tracker
+    per recording session so temporal tracking matches live recognition.
+    """
+
+    def __init__(self, root, extract_landmarks=False, queue_size=1024, max_batch=256,
+                 max_open_files=32, idle_timeout=30.0):
+        self.root = root
+        self.extract_landmarks = extract_landmarks
+        self.max_batch = max_batch
+        self.max_open_files = max_open_files
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._files = OrderedDict()  # path -> (file, tracker session or None, last write time)
+        self.frames_written = 0
+        self.bytes_written = 0
+        self._thread = threading.Thread(target=self._run, name="training-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, gesture_name, session_id, image_bytes, timestamp=None, landmarks=None, hand_detected=True):
+        """Queue one frame; returns the shard it will be appended to"""
+        path = shard_path(self.root, gesture_name, session_id)
+        item = (path, time.time() if timestamp is None else timestamp, image_bytes, landmarks, hand_detected)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            raise RecorderBusyError("Recorder queue is full")
+        return path
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        """Block until every queued frame has been written"""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self._close_idle()
+                continue
+            if item is None:
+                self._queue.task_done()
+                self._close_all()
+                return
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Put the sentinel back so it is handled after this batch
+                    self._queue.task_done()
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"Error writing training data: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self._close_idle()
+
+    def _write_batch(self, batch):
+        touched = set()
+        for path, timestamp, image_bytes, landmarks, hand_detected in batch:
+            f, tracker = self._open(path)
+            if landmarks is None and tracker is not None:
+                image = decode_frame(image_bytes, DEFAULT_MAX_WIDTH)
+                if image is not None:
+                    landmarks, hand_detected = tracker.extract_hand_landmarks(image)
+            record = encode_record(timestamp, image_bytes, landmarks, hand_detected)
+            f.write(record)
+            touched.add(path)
+            self.frames_written += 1
+            self.bytes_written += len(record)
+        now = time.time()
+        for path in touched:
+            f, tracker, _ = self._files[path]
+            f.flush()
+            self._files[path] = (f, tracker, now)
+
+    def _open(self, path):
+        entry = self._files.get(path)
+        if entry is not None:
+            self._files.move_to_end(path)
+            return entry[0], entry[1]
+        while len(self._files) >= self.max_open_files:
+            _, oldest = self._files.popitem(last=False)
+            self._close_entry(oldest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, 'ab')
+        if f.tell() == 0:
+            f.write(SHARD_MAGIC)
+        tracker = RecognizerSession(f"record:{path}") if self.extract_landmarks else None
+        self._files[path] = (f, tracker, time.time())
+        return f, tracker
+
+    @staticmethod
+    def _close_entry(entry):
+        f, tracker, _ = entry
+        f.close()
+        if tracker is not None:
+            tracker.close()
+
+    def _close_idle(self):
+        cutoff = time.time() - self.idle_timeout
+        for path in [path for path, entry in self._files.items() if entry[2] < cutoff]:
+            self._close_entry(self._files.pop(path))
+
+    def _close_all(self):
+        while self._files:
+            _, entry = self._files.popitem(last=False)
+            self._close_entry(entry)
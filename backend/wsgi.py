@@ -0,0 +1,10 @@
+"""WSGI entry point for production servers
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Other WSGI servers can serve `application` as well; each process then
+starts its services on its first request instead of at fork time.
+"""
+from app import create_app
+
+application = create_app()
@@ -1,6 +1,6 @@
 
 import { useState, useEffect, useRef } from "react";
-import { startWebcam, stopWebcam, captureFrame } from "@/lib/webcamUtils";
+import { startWebcam, stopWebcam, captureFrame, captureFrameBlob } from "@/lib/webcamUtils";
 
 interface UseWebcamOptions {
   autoStart?: boolean;
@@ -14,6 +14,7 @@ interface UseWebcamReturn {
   isLoading: boolean;
   error: string | null;
   captureImage: () => string | null;
+  captureBlob: () => Promise<Blob | null>;
   startCamera: () => Promise<boolean>;
   stopCamera: () => void;
   isCameraSupported: boolean;
@@ -109,6 +110,15 @@ const useWebcam = ({
     return captureFrame(videoRef.current);
   };
 
+  // Function to capture current frame as binary JPEG
+  const captureBlob = async (): Promise<Blob | null> => {
+    if (!isActive || !videoRef.current) {
+      return null;
+    }
+
+    return captureFrameBlob(videoRef.current);
+  };
+
   return {
     videoRef,
     canvasRef,
@@ -116,6 +126,7 @@ const useWebcam = ({
     isLoading,
     error,
     captureImage,
+    captureBlob,
     startCamera,
     stopCamera,
     isCameraSupported,
@@ -2,12 +2,38 @@
 // You can change this URL if your backend runs on a different address
 const API_BASE_URL = "http://localhost:5000/api";
 
+// Identifies this browser tab's recognizer session (tracker + gesture history) on the backend
+const SESSION_ID =
+  typeof crypto !== "undefined" && "randomUUID" in crypto
+    ? crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+export const getSessionId = (): string => SESSION_ID;
+
+export interface SignEvent {
+  type: "start" | "end";
+  sign: string;
+  start_time: number;
+  end_time?: number;
+  frame_count?: number;
+  confidence: number;
+}
+
+export interface DecodedSigns {
+  sign: string | null;
+  confidence: number;
+  events: SignEvent[];
+  sentence: string;
+  changed: boolean;
+}
+
 export interface SignToTextResponse {
   sign: string;
   confidence: number;
   hand_detected?: boolean;
   hand_info?: any;
   gesture_sequence?: any;
+  decoded?: DecodedSigns;
   error?: string;
 }
 
@@ -27,9 +53,18 @@ export interface DictionaryResponse {
     name: string;
     image_path: string;
   }>;
+  total?: number;
+  offset?: number;
+  limit?: number | null;
   error?: string;
 }
 
+export interface DictionaryQuery {
+  prefix?: string;
+  offset?: number;
+  limit?: number;
+}
+
 export interface AddSignResponse {
   status: string;
   message?: string;
@@ -43,7 +78,7 @@ export const translateSignToText = async (base64Image: string): Promise<SignToTe
       headers: {
         "Content-Type": "application/json",
       },
-      body: JSON.stringify({ base64_image: base64Image }),
+      body: JSON.stringify({ base64_image: base64Image, session_id: SESSION_ID }),
     });
 
     if (!response.ok) {
@@ -58,6 +93,95 @@ export const translateSignToText = async (base64Image: string): Promise<SignToTe
   }
 };
 
+/**
+ * Classify hand landmarks computed in the browser (21 points x [x, y, z],
+ * normalized like MediaPipe). Pass null when no hand is visible. The server
+ * skips image decoding and hand detection entirely.
+ */
+export const translateLandmarksToText = async (
+  landmarks: number[][] | number[] | null
+): Promise<SignToTextResponse> => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/sign-to-text`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ landmarks, session_id: SESSION_ID }),
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || "Failed to translate landmarks");
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error("Error translating landmarks to text:", error);
+    return { sign: "error", confidence: 0, error: (error as Error).message };
+  }
+};
+
+export interface SignToTextStream {
+  sendFrame: (frame: Blob) => Promise<void>;
+  sendLandmarks: (landmarks: Float32Array | null) => void;
+  clear: () => void;
+  close: () => void;
+  isOpen: () => boolean;
+}
+
+/**
+ * Open a persistent WebSocket for sign-to-text. Frames are sent as raw JPEG
+ * bytes and predictions arrive as JSON messages, avoiding base64 and
+ * per-frame HTTP request overhead.
+ */
+export const openSignToTextStream = (
+  onResult: (result: SignToTextResponse & { type?: string }) => void,
+  onClose?: () => void
+): SignToTextStream | null => {
+  if (typeof WebSocket === "undefined") return null;
+
+  const wsUrl = `${API_BASE_URL.replace(/^http/, "ws")}/ws/sign-to-text?session_id=${encodeURIComponent(SESSION_ID)}`;
+  let socket: WebSocket;
+  try {
+    socket = new WebSocket(wsUrl);
+  } catch (error) {
+    console.error("Error opening sign-to-text stream:", error);
+    return null;
+  }
+  socket.binaryType = "arraybuffer";
+
+  socket.onmessage = (event) => {
+    try {
+      onResult(JSON.parse(event.data));
+    } catch (error) {
+      console.error("Error parsing stream message:", error);
+    }
+  };
+  socket.onclose = () => onClose?.();
+
+  return {
+    sendFrame: async (frame: Blob) => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(await frame.arrayBuffer());
+      }
+    },
+    // 63 little-endian float32 values (252 bytes); an empty message means "no hand"
+    sendLandmarks: (landmarks: Float32Array | null) => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(landmarks ? landmarks.buffer : new ArrayBuffer(0));
+      }
+    },
+    clear: () => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: "clear" }));
+      }
+    },
+    close: () => socket.close(),
+    isOpen: () => socket.readyState === WebSocket.OPEN,
+  };
+};
+
 export const translateTextToSign = async (text: string): Promise<TextToSignResponse> => {
   try {
     const response = await fetch(`${API_BASE_URL}/text-to-sign`, {
@@ -84,6 +208,10 @@ export const clearSignSequence = async (): Promise<{ status: string }> => {
   try {
     const response = await fetch(`${API_BASE_URL}/clear-sequence`, {
       method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ session_id: SESSION_ID }),
     });
 
     if (!response.ok) {
@@ -146,9 +274,31 @@ export const trainDynamicModel = async (trainingDataPath?: string): Promise<any>
   }
 };
 
-export const getISLDictionary = async (): Promise<DictionaryResponse> => {
+export const getTrainingJob = async (jobId: string): Promise<any> => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/train-dynamic-model/${jobId}`);
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || "Failed to fetch training job");
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error("Error fetching training job:", error);
+    return { status: "error", error: (error as Error).message };
+  }
+};
+
+export const getISLDictionary = async (query: DictionaryQuery = {}): Promise<DictionaryResponse> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/isl-dictionary`);
+    const params = new URLSearchParams();
+    if (query.prefix) params.set("prefix", query.prefix);
+    if (query.offset !== undefined) params.set("offset", String(query.offset));
+    if (query.limit !== undefined) params.set("limit", String(query.limit));
+    const search = params.toString();
+    // The browser revalidates with If-None-Match and reuses its cached copy on a 304
+    const response = await fetch(`${API_BASE_URL}/isl-dictionary${search ? `?${search}` : ""}`);
 
     if (!response.ok) {
       const errorData = await response.json();
@@ -81,6 +81,44 @@ export const captureFrame = (
   }
 };
 
+/**
+ * Capture frame from video element as a JPEG Blob (no base64 encoding)
+ * @param videoElement - HTML Video element to capture from
+ * @returns JPEG image Blob
+ */
+export const captureFrameBlob = (
+  videoElement: HTMLVideoElement | null
+): Promise<Blob | null> => {
+  if (!videoElement || videoElement.paused || videoElement.ended) {
+    return Promise.resolve(null);
+  }
+
+  try {
+    const canvas = document.createElement("canvas");
+    canvas.width = videoElement.videoWidth;
+    canvas.height = videoElement.videoHeight;
+
+    const ctx = canvas.getContext("2d");
+    if (!ctx) return Promise.resolve(null);
+
+    // Draw the video frame to canvas, mirror the image
+    ctx.scale(-1, 1);
+    ctx.drawImage(
+      videoElement,
+      0,
+      0,
+      videoElement.videoWidth * -1,
+      videoElement.videoHeight
+    );
+    ctx.scale(-1, 1); // Reset scale
+
+    return new Promise((resolve) => canvas.toBlob(resolve, "image/jpeg", 0.8));
+  } catch (error) {
+    console.error("Error capturing frame:", error);
+    return Promise.resolve(null);
+  }
+};
+
 /**
  * Draw hand landmarks on canvas
  * @param canvasElement - HTML Canvas element to draw on
@@ -1,15 +1,24 @@
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Button } from "@/components/ui/button";
 import { Separator } from "@/components/ui/separator";
 import { useToast } from "@/components/ui/use-toast";
 import useWebcam from "@/hooks/useWebcam";
-import { translateSignToText } from "@/lib/api";
+import {
+  translateSignToText,
+  openSignToTextStream,
+  SignToTextResponse,
+  SignToTextStream,
+} from "@/lib/api";
 import { HandMetal } from "lucide-react";
 import CameraView from "@/components/sign-to-text/CameraView";
 import RecognitionResults from "@/components/sign-to-text/RecognitionResults";
 import InstructionsCard from "@/components/sign-to-text/InstructionsCard";
 
+// Frame pacing: ~30 fps over the WebSocket stream, 1 fps for the HTTP fallback
+const STREAM_INTERVAL_MS = 33;
+const HTTP_INTERVAL_MS = 1000;
+
 const SignToText = () => {
   const [recognizedText, setRecognizedText] = useState("");
   const [captionHistory, setCaptionHistory] = useState<string[]>([]);
@@ -21,6 +30,9 @@ const SignToText = () => {
   const [detectionMode, setDetectionMode] = useState<"static" | "dynamic">("static");
   const [gestureSequence, setGestureSequence] = useState<any>(null);
   const { toast } = useToast();
+  const streamRef = useRef<SignToTextStream | null>(null);
+  const frameInFlightRef = useRef(false);
+  const lastHttpFrameRef = useRef(0);
 
   const {
     videoRef,
@@ -31,6 +43,7 @@ const SignToText = () => {
     startCamera,
     stopCamera,
     captureImage,
+    captureBlob,
     isCameraSupported,
   } = useWebcam({ autoStart: false });
 
@@ -62,9 +75,31 @@ const SignToText = () => {
     if (!isActive) return;
 
     setIsCapturing(true);
+
+    // Prefer the persistent binary stream; fall back to HTTP polling
+    const stream = openSignToTextStream(
+      (result) => {
+        frameInFlightRef.current = false;
+        if (result.type === "prediction") {
+          handleResult(result);
+        }
+      },
+      () => {
+        streamRef.current = null;
+        frameInFlightRef.current = false;
+      }
+    );
+    streamRef.current = stream;
+
     const interval = window.setInterval(() => {
-      processFrame();
-    }, 1000); // Process every second
+      if (streamRef.current) {
+        streamFrame();
+      } else if (Date.now() - lastHttpFrameRef.current >= HTTP_INTERVAL_MS) {
+        // Stream unavailable or closed: keep polling at the HTTP rate
+        lastHttpFrameRef.current = Date.now();
+        processFrame();
+      }
+    }, stream ? STREAM_INTERVAL_MS : HTTP_INTERVAL_MS);
 
     setCaptureInterval(interval);
   };
@@ -75,9 +110,28 @@ const SignToText = () => {
       clearInterval(captureInterval);
       setCaptureInterval(null);
     }
+    if (streamRef.current) {
+      streamRef.current.close();
+      streamRef.current = null;
+    }
+    frameInFlightRef.current = false;
     setIsCapturing(false);
   };
 
+  // Send a single frame over the stream (one frame in flight at a time)
+  const streamFrame = async () => {
+    const stream = streamRef.current;
+    if (!stream || !stream.isOpen() || frameInFlightRef.current || !isActive) return;
+
+    frameInFlightRef.current = true;
+    const frame = await captureBlob();
+    if (!frame) {
+      frameInFlightRef.current = false;
+      return;
+    }
+    await stream.sendFrame(frame);
+  };
+
   // Toggle capturing
   const toggleCapturing = () => {
     if (isCapturing) {
@@ -103,44 +157,46 @@ const SignToText = () => {
         console.error("Translation error:", result.error);
         return;
       }
-      
-      // Update UI based on hand detection
-      setHandDetected(result.hand_detected || false);
-      setConfidenceLevel(result.confidence * 100 || 0);
-      
-      // Update gesture sequence info if available
-      if (result.gesture_sequence) {
-        setGestureSequence(result.gesture_sequence);
-      }
 
-      // Draw hand landmarks on canvas if available
-      if (result.hand_info && canvasRef.current) {
-        drawHandInfo(canvasRef.current, result.hand_info);
-      }
-
-      // Only add meaningful signs (not "unknown" with low confidence)
-      if (
-        result.sign &&
-        result.sign !== "unknown" &&
-        result.confidence > 0.5
-      ) {
-        // Add to recognized text if it's different from the last added sign
-        if (
-          result.sign !== recognizedText &&
-          !recognizedText.endsWith(result.sign)
-        ) {
-          const newText = recognizedText
-            ? `${recognizedText} ${result.sign}`
-            : result.sign;
-          setRecognizedText(newText);
-        }
-      }
+      handleResult(result);
     } catch (err) {
       console.error("Error processing frame:", err);
     } finally {
       setIsProcessing(false);
     }
   };
+
+  // Update the UI from a recognition result (HTTP or stream)
+  const handleResult = (result: SignToTextResponse) => {
+    // Update UI based on hand detection
+    setHandDetected(result.hand_detected || false);
+    setConfidenceLevel(result.confidence * 100 || 0);
+    
+    // Update gesture sequence info if available
+    if (result.gesture_sequence) {
+      setGestureSequence(result.gesture_sequence);
+    }
+
+    // Draw hand landmarks on canvas if available
+    if (result.hand_info && canvasRef.current) {
+      drawHandInfo(canvasRef.current, result.hand_info);
+    }
+
+    // Only add meaningful signs (not "unknown" with low confidence)
+    if (
+      result.sign &&
+      result.sign !== "unknown" &&
+      result.confidence > 0.5
+    ) {
+      // Add to recognized text if it's different from the last added sign
+      setRecognizedText((prev) => {
+        if (prev === result.sign || prev.endsWith(result.sign)) {
+          return prev;
+        }
+        return prev ? `${prev} ${result.sign}` : result.sign;
+      });
+    }
+  };
   
   // Helper function to draw hand information
   const drawHandInfo = (canvas: HTMLCanvasElement, handInfo: any) => {